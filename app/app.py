@@ -1,14 +1,30 @@
 import logging
 import os
+from contextlib import ExitStack
 
 from flask import Flask
 from flask_cors import CORS
+from sqlalchemy.exc import NoResultFound, SQLAlchemyError
 
 from app import jwt_handlers
+from app.commands import register_commands
 from app.extensions import database, jwt
 from app.routes.application_route import application_submission_bp
+from app.routes.applications_route import applications_bp
 from app.routes.competences_route import competences_bp
 from app.routes.error_handler import handle_all_unhandled_exceptions
+from app.routes.import_route import application_import_bp
+from app.routes.metrics_route import metrics_bp
+from app.services.application_service import application_cache
+from app.services.applied_person_service import applied_persons
+from app.services.availability_service import availability_bitmaps, \
+    availability_index
+from app.services.competences_service import competence_catalog
+from app.services.group_commit_service import group_committer
+from app.services.pool_metrics_service import InstrumentedQueuePool, \
+    pool_metrics
+from app.services.ranking_service import applicant_ranking
+from app.services.spool_service import submission_spool
 
 
 def create_app() -> Flask:
@@ -17,7 +33,8 @@ def create_app() -> Flask:
 
     This function creates a new Flask application, configures it from a
     configuration file, sets up CORS, logging, extensions, and registers
-    blueprints. Also sets up a global error handler for unhandled exceptions.
+    blueprints and command line commands. Also sets up a global error handler
+    for unhandled exceptions.
 
     :returns: The configured Flask application.
     """
@@ -33,6 +50,7 @@ def create_app() -> Flask:
     setup_logging(application_form_api)
     setup_extensions(application_form_api)
     register_blueprints(application_form_api)
+    register_commands(application_form_api)
 
     return application_form_api
 
@@ -75,18 +93,68 @@ def setup_extensions(application_form_api: Flask) -> None:
     Sets up extensions for the Flask application.
 
     This function initializes the database and JWT extensions for the Flask
-    application, and registers JWT error handlers. It also creates all
-    database tables.
+    application, with the instrumented pool class if the database connection
+    pool is configured, registers JWT error handlers and configures the
+    in-memory competence catalog, the application cache, the availability
+    index and bitmaps, the applicant ranking, the group committer and the
+    submission spool. It also creates all database tables and warms the
+    applied person filter.
 
     :param application_form_api: The Flask application.
     """
 
+    engine_options = application_form_api.config.setdefault(
+            'SQLALCHEMY_ENGINE_OPTIONS', {})
+    if 'pool_size' in engine_options:
+        engine_options.setdefault('poolclass', InstrumentedQueuePool)
     database.init_app(application_form_api)
     jwt.init_app(application_form_api)
     jwt_handlers.register_jwt_handlers(jwt)
+    competence_catalog.init_app(application_form_api)
+    application_cache.init_app(application_form_api)
+    availability_index.init_app(application_form_api)
+    availability_bitmaps.init_app(application_form_api)
+    applicant_ranking.init_app(application_form_api)
+    group_committer.init_app(application_form_api)
+    submission_spool.init_app(application_form_api)
 
     with application_form_api.app_context():
         database.create_all()
+    applied_persons.init_app(application_form_api)
+
+
+def setup_worker(application_form_api: Flask) -> None:
+    """
+    Prepares a forked worker process to serve requests.
+
+    This function should be called in every worker process forked from a
+    process that has created the application, such as the gunicorn master
+    with preload_app. It discards the pooled database connections inherited
+    from the parent without closing them, since they are shared with it,
+    along with the pool metrics counted by the parent. Then it opens the
+    connections of the worker's own pool, loads the competence catalog and
+    starts the spool drainer, so the first requests do not pay for any of
+    it. If the database cannot be reached, the worker
+    starts cold and connects on demand.
+
+    :param application_form_api: The Flask application.
+    """
+
+    with application_form_api.app_context():
+        for engine in database.engines.values():
+            engine.dispose(close=False)
+        pool_metrics.reset()
+
+        pool = database.engine.pool
+        try:
+            with ExitStack() as connections:
+                for _ in range(pool.size() if hasattr(pool, 'size') else 1):
+                    connections.enter_context(database.engine.connect())
+            competence_catalog.get()
+        except (NoResultFound, SQLAlchemyError):
+            logging.warning(f'Failed to warm up worker {os.getpid()}')
+
+    submission_spool.start()
 
 
 def register_blueprints(application_form_api: Flask) -> None:
@@ -105,6 +173,15 @@ def register_blueprints(application_form_api: Flask) -> None:
     application_form_api.register_blueprint(
             application_submission_bp,
             url_prefix='/api/application-form/submit')
+    application_form_api.register_blueprint(
+            application_import_bp,
+            url_prefix='/api/application-form/import')
+    application_form_api.register_blueprint(
+            applications_bp,
+            url_prefix='/api/application-form/applications')
+    application_form_api.register_blueprint(
+            metrics_bp,
+            url_prefix='/api/application-form/metrics')
 
 
 if __name__ == "__main__":
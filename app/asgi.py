@@ -0,0 +1,108 @@
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from flask import Config
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from starlette.applications import Starlette
+from starlette.routing import Mount
+
+from app.extensions import database
+from app.routes.async_application_route import application_submission_routes
+from app.routes.async_competences_route import competences_routes
+from app.services.async_competences_service import AsyncCompetenceCatalog
+
+_ASYNC_DRIVERS = {'postgresql': 'postgresql+asyncpg',
+                  'sqlite': 'sqlite+aiosqlite'}
+
+
+def create_asgi_app(config: Optional[dict] = None) -> Starlette:
+    """
+    Creates and configures the ASGI application.
+
+    This function creates an ASGI application serving the application
+    submission and competences endpoints of the Flask application with an
+    asynchronous database driver, asyncpg for PostgreSQL and aiosqlite for
+    SQLite. It is configured from the same configuration file and shares
+    the models, validation and response formats of the Flask application,
+    so both can serve the same database. It can be run with, for example,
+    uvicorn 'app.asgi:create_asgi_app' --factory.
+
+    :param config: Configuration values overriding those of the
+           configuration file.
+    :returns: The configured ASGI application.
+    """
+
+    settings = Config(os.path.dirname(__file__))
+    settings.from_pyfile('config.py')
+    settings.update(config or {})
+
+    engine = create_async_engine(__async_database_url(
+            settings['SQLALCHEMY_DATABASE_URI']), **__engine_options(settings))
+
+    @asynccontextmanager
+    async def lifespan(_: Starlette) -> AsyncIterator[None]:
+        async with engine.begin() as connection:
+            await connection.run_sync(database.metadata.create_all)
+        logging.info('ASGI application started')
+        yield
+        await engine.dispose()
+
+    application_form_api = Starlette(routes=[
+        Mount('/api/application-form/competences',
+              routes=competences_routes),
+        Mount('/api/application-form/submit',
+              routes=application_submission_routes)
+    ], lifespan=lifespan)
+
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    application_form_api.state.config = settings
+    application_form_api.state.engine = engine
+    application_form_api.state.sessions = sessions
+    application_form_api.state.competence_catalog = AsyncCompetenceCatalog(
+            sessions, settings.get('COMPETENCE_CACHE_TTL', 300))
+
+    return application_form_api
+
+
+def __async_database_url(url: str) -> str:
+    """
+    Select the asynchronous driver of a database URL.
+
+    :param url: The database URL of the Flask application.
+    :returns: The database URL with the asynchronous driver of its database.
+    """
+
+    backend, separator, rest = url.partition('://')
+    backend = backend.split('+')[0]
+    return f'{_ASYNC_DRIVERS.get(backend, backend)}{separator}{rest}'
+
+
+def __engine_options(settings: Config) -> dict:
+    """
+    Create the engine options of the asynchronous engine.
+
+    The pool is sized with the same settings as the pool of a Flask worker.
+    An event loop has no threads to size it by, so DATABASE_POOL_SIZE
+    should be set to the number of queries it is meant to run concurrently.
+
+    :param settings: The application configuration.
+    :returns: The keyword arguments for create_async_engine.
+    """
+
+    url = settings['SQLALCHEMY_DATABASE_URI']
+    options: dict = {'pool_pre_ping': settings.get('DATABASE_POOL_PRE_PING',
+                                                   True)}
+    if url not in ('sqlite://', 'sqlite:///:memory:'):
+        options.update({
+            'pool_size': settings.get('DATABASE_POOL_SIZE', 5),
+            'max_overflow': settings.get('DATABASE_MAX_OVERFLOW', 10),
+            'pool_timeout': settings.get('DATABASE_POOL_TIMEOUT', 30),
+            'pool_recycle': settings.get('DATABASE_POOL_RECYCLE', -1)
+        })
+    statement_timeout = settings.get('DATABASE_STATEMENT_TIMEOUT', 0)
+    if url.startswith('postgresql') and statement_timeout:
+        options['connect_args'] = {'server_settings': {
+            'statement_timeout': str(round(statement_timeout * 1000))}}
+    return options
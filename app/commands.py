@@ -0,0 +1,79 @@
+import json
+
+import click
+from flask import Flask, current_app
+from flask.cli import with_appcontext
+
+from app.services.export_service import EXPORT_MIMETYPES, \
+    export_applications
+from app.services.import_service import import_applications
+from app.services.statistics_service import rebuild_application_statistics
+
+
+def register_commands(application_form_api: Flask) -> None:
+    """
+    Registers the command line commands of the Flask application.
+
+    :param application_form_api: The Flask application.
+    """
+
+    application_form_api.cli.add_command(import_applications_command)
+    application_form_api.cli.add_command(export_applications_command)
+    application_form_api.cli.add_command(rebuild_statistics_command)
+
+
+@click.command('import-applications')
+@click.argument('file', type=click.File('rb'))
+@click.option('--chunk-size', type=int, default=None,
+              help='Applications committed per transaction.')
+@click.option('--bulk-load', is_flag=True,
+              help='Load with COPY on PostgreSQL. Fails on persons who '
+                   'have already applied.')
+@with_appcontext
+def import_applications_command(file, chunk_size, bulk_load) -> None:
+    """
+    Import applications from an NDJSON file.
+
+    Each line holds one application with the 'person_id' it belongs to and
+    its 'competences' and 'availabilities'. Use - to read from stdin.
+    """
+
+    report = import_applications(
+            file, chunk_size or current_app.config.get(
+                    'IMPORT_CHUNK_SIZE', 1000), bulk_load)
+    click.echo(json.dumps(report, default=str))
+
+
+@click.command('export-applications')
+@click.argument('file', type=click.File('wb'), default='-')
+@click.option('--format', 'export_format', default='ndjson',
+              type=click.Choice(list(EXPORT_MIMETYPES)),
+              help='The format of the export.')
+@click.option('--gzip', 'compress', is_flag=True,
+              help='Compress the export with gzip.')
+@with_appcontext
+def export_applications_command(file, export_format, compress) -> None:
+    """
+    Export all applications to a file.
+
+    The applications are streamed from the database, so memory use does not
+    grow with their number. Use - or leave out the file to write to stdout.
+    """
+
+    for chunk in export_applications(export_format, compress):
+        file.write(chunk)
+
+
+@click.command('rebuild-statistics')
+@with_appcontext
+def rebuild_statistics_command() -> None:
+    """
+    Rebuild the application statistics from the applications.
+
+    The statistics are maintained as applications are inserted. Run this
+    after applications or their statuses have been changed by other means,
+    or periodically, to correct any drift.
+    """
+
+    report = rebuild_application_statistics()
+    click.echo(json.dumps(report))
@@ -9,8 +9,99 @@ if database_url.startswith('postgres://'):
         'postgres://', 'postgresql://', 1)
 
 SQLALCHEMY_DATABASE_URI = database_url
-SQLALCHEMY_POOL_SIZE = 2
-SQLALCHEMY_MAX_OVERFLOW = 1
+
+WEB_CONCURRENCY = int(os.environ.get('WEB_CONCURRENCY', 1))
+GUNICORN_THREADS = int(os.environ.get('GUNICORN_THREADS', 1))
+
+DATABASE_CONNECTION_LIMIT = int(
+    os.environ.get('DATABASE_CONNECTION_LIMIT', 0))
+DATABASE_POOL_SIZE = int(os.environ.get(
+    'DATABASE_POOL_SIZE', GUNICORN_THREADS + 1))
+DATABASE_MAX_OVERFLOW = int(os.environ.get(
+    'DATABASE_MAX_OVERFLOW', GUNICORN_THREADS // 2 + 1))
+if DATABASE_CONNECTION_LIMIT:
+    worker_connections = max(DATABASE_CONNECTION_LIMIT // WEB_CONCURRENCY, 1)
+    DATABASE_POOL_SIZE = min(DATABASE_POOL_SIZE, worker_connections)
+    DATABASE_MAX_OVERFLOW = min(DATABASE_MAX_OVERFLOW,
+                                worker_connections - DATABASE_POOL_SIZE)
+DATABASE_POOL_TIMEOUT = float(os.environ.get('DATABASE_POOL_TIMEOUT', 10))
+DATABASE_POOL_RECYCLE = int(os.environ.get('DATABASE_POOL_RECYCLE', 1800))
+DATABASE_POOL_PRE_PING = os.environ.get(
+    'DATABASE_POOL_PRE_PING', 'true').lower() == 'true'
+DATABASE_STATEMENT_TIMEOUT = float(
+    os.environ.get('DATABASE_STATEMENT_TIMEOUT', 0))
+
+SQLALCHEMY_ENGINE_OPTIONS: dict = {'pool_pre_ping': DATABASE_POOL_PRE_PING}
+if database_url not in ('sqlite://', 'sqlite:///:memory:'):
+    SQLALCHEMY_ENGINE_OPTIONS.update({
+        'pool_size': DATABASE_POOL_SIZE,
+        'max_overflow': DATABASE_MAX_OVERFLOW,
+        'pool_timeout': DATABASE_POOL_TIMEOUT,
+        'pool_recycle': DATABASE_POOL_RECYCLE
+    })
+if database_url.startswith('postgresql') and DATABASE_STATEMENT_TIMEOUT:
+    SQLALCHEMY_ENGINE_OPTIONS['connect_args'] = {
+        'options': f'-c statement_timeout='
+                   f'{round(DATABASE_STATEMENT_TIMEOUT * 1000)}'}
+
+APPLICATION_BULK_INSERT = os.environ.get(
+    'APPLICATION_BULK_INSERT', 'false').lower() == 'true'
+MAX_AVAILABILITIES = int(os.environ.get('MAX_AVAILABILITIES', 100))
+IMPORT_CHUNK_SIZE = int(os.environ.get('IMPORT_CHUNK_SIZE', 1000))
+
+SUBMISSION_GROUP_COMMIT = os.environ.get(
+    'SUBMISSION_GROUP_COMMIT', 'false').lower() == 'true'
+SUBMISSION_GROUP_COMMIT_WINDOW = float(
+    os.environ.get('SUBMISSION_GROUP_COMMIT_WINDOW', 5))
+SUBMISSION_GROUP_COMMIT_MAX_SIZE = int(
+    os.environ.get('SUBMISSION_GROUP_COMMIT_MAX_SIZE', 100))
+
+SUBMISSION_SPOOL_ENABLED = os.environ.get(
+    'SUBMISSION_SPOOL_ENABLED', 'false').lower() == 'true'
+# Must be an absolute path on persistent storage when the spool is enabled,
+# not the ephemeral filesystem of a dyno or container, since queued
+# submissions exist nowhere else until they are drained.
+SUBMISSION_SPOOL_PATH = os.environ.get('SUBMISSION_SPOOL_PATH')
+SUBMISSION_SPOOL_BATCH_SIZE = int(
+    os.environ.get('SUBMISSION_SPOOL_BATCH_SIZE', 500))
+SUBMISSION_SPOOL_INTERVAL = float(
+    os.environ.get('SUBMISSION_SPOOL_INTERVAL', 0.2))
+SUBMISSION_SPOOL_CLAIM_TIMEOUT = float(
+    os.environ.get('SUBMISSION_SPOOL_CLAIM_TIMEOUT', 60))
+SUBMISSION_SPOOL_RETENTION = float(
+    os.environ.get('SUBMISSION_SPOOL_RETENTION', 86400))
+
+APPLICATION_CACHE_SIZE = int(os.environ.get('APPLICATION_CACHE_SIZE', 10000))
+APPLICATION_CACHE_TTL = float(os.environ.get('APPLICATION_CACHE_TTL', 30))
+
+APPLIED_PERSON_FILTER = os.environ.get(
+    'APPLIED_PERSON_FILTER', 'true').lower() == 'true'
+
+AVAILABILITY_INDEX = os.environ.get(
+    'AVAILABILITY_INDEX', 'false').lower() == 'true'
+AVAILABILITY_INDEX_TTL = float(os.environ.get('AVAILABILITY_INDEX_TTL', 300))
+AVAILABILITY_INDEX_MERGE_THRESHOLD = int(
+    os.environ.get('AVAILABILITY_INDEX_MERGE_THRESHOLD', 10000))
+
+AVAILABILITY_BITMAP_EPOCH = os.environ.get(
+    'AVAILABILITY_BITMAP_EPOCH', '2020-01-01')
+AVAILABILITY_BITMAP_DAYS = int(
+    os.environ.get('AVAILABILITY_BITMAP_DAYS', 4096))
+AVAILABILITY_BITMAP_TTL = float(
+    os.environ.get('AVAILABILITY_BITMAP_TTL', 300))
+
+APPLICANT_RANKING_TTL = float(os.environ.get('APPLICANT_RANKING_TTL', 300))
+
+APPLICATION_STATISTICS_SHARDS = int(
+    os.environ.get('APPLICATION_STATISTICS_SHARDS', 16))
+
+IDEMPOTENCY_KEY_TTL = int(os.environ.get('IDEMPOTENCY_KEY_TTL', 86400))
+IDEMPOTENCY_KEY_PURGE_INTERVAL = int(
+    os.environ.get('IDEMPOTENCY_KEY_PURGE_INTERVAL', 100))
+
+COMPETENCE_CACHE_TTL = int(os.environ.get('COMPETENCE_CACHE_TTL', 300))
+COMPETENCE_CACHE_MAX_AGE = int(
+    os.environ.get('COMPETENCE_CACHE_MAX_AGE', 300))
 
 LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
 LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -0,0 +1,45 @@
+from app.extensions import database
+
+
+class ApplicationStatistic(database.Model):  # type: ignore
+    """
+    Represents a counter of the aggregate statistics of the applications in
+    the database.
+
+    The counters are kept up to date in the transactions that insert
+    applications, so the statistics can be read without scanning the
+    applications. Every counter is split into shards that are incremented
+    by different transactions and summed when read, so concurrent
+    insertions do not all wait for the lock of the same row.
+
+    :ivar statistic: The kind of counter: 'status' counts the applications
+          by status, 'competence' the applicants by competence and 'years'
+          the applicants by competence and years of experience bucket.
+    :ivar key: The status, the competence ID, or the competence ID and the
+          lower bound of the bucket separated by a colon.
+    :ivar shard: The shard of the counter.
+    :ivar count: The value of the shard of the counter.
+    """
+
+    __tablename__ = 'application_statistic'
+
+    statistic = database.Column(database.String(16), primary_key=True)
+    key = database.Column(database.String(64), primary_key=True)
+    shard = database.Column(database.SmallInteger, primary_key=True)
+    count = database.Column(database.BigInteger, nullable=False)
+
+    def __init__(self, statistic: str, key: str, count: int,
+                 shard: int = 0) -> None:
+        """
+        Initializes a new ApplicationStatistic object.
+
+        :param statistic: The kind of counter.
+        :param key: The key of the counter.
+        :param count: The value of the shard of the counter.
+        :param shard: The shard of the counter.
+        """
+
+        self.statistic = statistic
+        self.key = key
+        self.shard = shard
+        self.count = count
@@ -14,9 +14,13 @@ class Availability(database.Model):  # type: ignore
     """
 
     __tablename__ = 'availability'
+    __table_args__ = (
+        database.Index('ix_availability_from_date_to_date',
+                       'from_date', 'to_date', 'person_id'),
+    )
 
     availability_id = database.Column(database.Integer, primary_key=True)
-    person_id = database.Column(database.Integer)
+    person_id = database.Column(database.Integer, index=True)
     from_date = database.Column(database.Date)
     to_date = database.Column(database.Date)
 
@@ -13,9 +13,13 @@ class CompetenceProfile(database.Model):  # type: ignore
     """
 
     __tablename__ = 'competence_profile'
+    __table_args__ = (
+        database.Index('ix_competence_profile_competence_id_years',
+                       'competence_id', 'years_of_experience', 'person_id'),
+    )
 
     competence_profile_id = database.Column(database.Integer, primary_key=True)
-    person_id = database.Column(database.Integer)
+    person_id = database.Column(database.Integer, index=True)
     competence_id = database.Column(database.Integer)
     years_of_experience = database.Column(
             database.Numeric(precision=4, scale=2))
@@ -0,0 +1,40 @@
+from datetime import datetime
+
+from app.extensions import database
+
+
+class IdempotencyKey(database.Model):  # type: ignore
+    """
+    Represents the stored response of a request with an Idempotency-Key.
+
+    :ivar person_id: The ID of the person who sent the request.
+    :ivar key: The idempotency key chosen by the client, unique per person.
+    :ivar status_code: The HTTP status code of the response.
+    :ivar body: The JSON body of the response.
+    :ivar created_at: The UTC time the response was stored.
+    """
+
+    __tablename__ = 'idempotency_key'
+
+    person_id = database.Column(database.Integer, primary_key=True)
+    key = database.Column(database.String(255), primary_key=True)
+    status_code = database.Column(database.Integer)
+    body = database.Column(database.Text)
+    created_at = database.Column(database.DateTime, index=True)
+
+    def __init__(self, person_id: int, key: str, status_code: int,
+                 body: str) -> None:
+        """
+        Initializes a new IdempotencyKey object.
+
+        :param person_id: The ID of the person who sent the request.
+        :param key: The idempotency key chosen by the client.
+        :param status_code: The HTTP status code of the response.
+        :param body: The JSON body of the response.
+        """
+
+        self.person_id = person_id
+        self.key = key
+        self.status_code = status_code
+        self.body = body
+        self.created_at = datetime.utcnow()
@@ -0,0 +1,110 @@
+from datetime import date
+from decimal import Decimal
+from typing import NamedTuple
+
+
+class CompetenceRecord(NamedTuple):
+    """
+    Represents a validated competence of an application.
+
+    Unlike CompetenceProfile, a record is not mapped to the database and is
+    cheap to create. Its fields are in the order of the CompetenceProfile
+    constructor arguments.
+
+    :ivar person_id: The ID of the person submitting the application.
+    :ivar competence_id: The ID of the competence.
+    :ivar years_of_experience: The number of years of experience in the
+          competence, with two decimals.
+    """
+
+    person_id: int
+    competence_id: int
+    years_of_experience: Decimal
+
+    def to_dict(self) -> dict:
+        """
+        Convert the record to a dictionary.
+
+        The years of experience stay a Decimal with two decimals, which the
+        JSON responses serialize as a string such as "5.00", the same as the
+        values read back from the Numeric column of CompetenceProfile.
+
+        :return: A dictionary representation of the record.
+        """
+        return {
+            'competence_id': self.competence_id,
+            'years_of_experience': self.years_of_experience
+        }
+
+
+class AvailabilityRecord(NamedTuple):
+    """
+    Represents a validated availability of an application.
+
+    Unlike Availability, a record is not mapped to the database and is cheap
+    to create. Its fields are in the order of the Availability constructor
+    arguments.
+
+    :ivar person_id: The ID of the person submitting the application.
+    :ivar from_date: The start date of the availability.
+    :ivar to_date: The end date of the availability.
+    """
+
+    person_id: int
+    from_date: date
+    to_date: date
+
+    def to_dict(self) -> dict:
+        """
+        Convert the record to a dictionary.
+
+        :returns: A dictionary representation of the record.
+        """
+        return {
+            'from_date': self.from_date.strftime('%Y-%m-%d'),
+            'to_date': self.to_date.strftime('%Y-%m-%d')
+        }
+
+
+class ApplicationRecord(NamedTuple):
+    """
+    Represents a validated application.
+
+    :ivar person_id: The ID of the person the application belongs to.
+    :ivar competences: The validated competences of the application.
+    :ivar availabilities: The validated availabilities of the application.
+    """
+
+    person_id: int
+    competences: list[CompetenceRecord]
+    availabilities: list[AvailabilityRecord]
+
+
+class JobRequirement(NamedTuple):
+    """
+    Represents a validated competence requirement of a job profile.
+
+    :ivar competence_id: The ID of the required competence.
+    :ivar min_years: The minimum number of years of experience in the
+          competence, with two decimals.
+    :ivar weight: The weight of the years of experience in the competence
+          in the score of an applicant.
+    """
+
+    competence_id: int
+    min_years: Decimal
+    weight: float
+
+
+class JobProfile(NamedTuple):
+    """
+    Represents a validated job profile applicants are ranked against.
+
+    :ivar requirements: The competence requirements of the job.
+    :ivar from_date: The first date of the job.
+    :ivar to_date: The last date of the job.
+    """
+
+    requirements: list[JobRequirement]
+    from_date: date
+    to_date: date
@@ -0,0 +1,215 @@
+import io
+import itertools
+import logging
+import time
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from sqlalchemy import Table, insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.extensions import database
+from app.models.application import ApplicationStatus
+from app.models.availability import Availability
+from app.models.competence_profile import CompetenceProfile
+from app.models.records import ApplicationRecord
+from app.repositories.statistics_repository import \
+    add_application_statistics_in_db
+
+
+class CopyBuffer(io.RawIOBase):
+    """
+    A read-only file whose content is produced by an iterator of lines.
+
+    The buffer only holds the lines needed to answer the current read, so
+    COPY FROM STDIN can be fed from a generator with constant memory.
+    """
+
+    def __init__(self, lines: Iterator[str]) -> None:
+        """
+        Initializes a new CopyBuffer object.
+
+        :param lines: The lines to read, each ending with a newline.
+        """
+
+        super().__init__()
+        self._lines = lines
+        self._pending = b''
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        """
+        Read the next chunk of lines into a buffer.
+
+        :param buffer: The buffer to fill.
+        :returns: The number of bytes read, 0 at the end of the lines.
+        """
+
+        size = len(buffer)
+        chunks = [self._pending]
+        length = len(self._pending)
+        for line in self._lines:
+            data = line.encode()
+            chunks.append(data)
+            length += len(data)
+            if length >= size:
+                break
+
+        data = b''.join(chunks)
+        buffer[:min(size, len(data))] = data[:size]
+        self._pending = data[size:]
+        return min(size, len(data))
+
+
+def load_applications_in_db(
+        applications: Iterable[ApplicationRecord], batch_size: int = 10000,
+        on_commit: Optional[Callable[[list[ApplicationRecord]], None]] = None
+) -> dict:
+    """
+    Load applications into the database as fast as possible.
+
+    This function streams the applications into the application_status,
+    competence_profile and availability tables in batches, committing each
+    batch along with the increments of the application statistics. On
+    PostgreSQL the rows are sent with COPY FROM STDIN from a generator, on
+    other databases with one multi-row insert per table. Unlike
+    insert_applications_in_db, conflicts are not skipped: loading an
+    application for a person who already has one fails the batch.
+
+    :param applications: The applications to load, for example a generator.
+    :param batch_size: The number of applications per batch.
+    :param on_commit: An optional function called with every batch of
+           applications after it has been committed.
+    :returns: A dictionary with the number of loaded 'applications' and
+              'rows', the elapsed 'seconds' and the 'rows_per_second'.
+    :raises SQLAlchemyError: If there is an issue with the database
+            operation. Batches committed before the failing one are kept.
+    """
+
+    copy = database.session.get_bind().dialect.name == 'postgresql'
+    application_count = row_count = 0
+    start = time.perf_counter()
+
+    iterator = iter(applications)
+    while True:
+        batch = list(itertools.islice(iterator, batch_size))
+        if not batch:
+            break
+
+        try:
+            if copy:
+                row_count += __copy_batch_in_db(batch)
+            else:
+                row_count += __insert_batch_in_db(batch)
+            add_application_statistics_in_db(
+                    ['Pending'] * len(batch),
+                    [(competence.competence_id,
+                      competence.years_of_experience)
+                     for application in batch
+                     for competence in application.competences],
+                    batch[0].person_id)
+            database.session.commit()
+        except SQLAlchemyError as exception:
+            database.session.rollback()
+            logging.debug(str(exception), exc_info=True)
+            raise SQLAlchemyError
+
+        application_count += len(batch)
+        if on_commit is not None:
+            on_commit(batch)
+
+    seconds = time.perf_counter() - start
+    statistics = {
+        'applications': application_count,
+        'rows': row_count,
+        'seconds': round(seconds, 3),
+        'rows_per_second': round(row_count / seconds) if seconds else 0
+    }
+    logging.info(f'Loaded {row_count} rows in {seconds:.3f}s '
+                 f'({statistics["rows_per_second"]} rows/s)')
+    return statistics
+
+
+def __copy_batch_in_db(batch: list[ApplicationRecord]) -> int:
+    """
+    Copy a batch of applications into the database with COPY FROM STDIN.
+
+    :param batch: The applications to copy.
+    :returns: The number of copied rows.
+    :raises SQLAlchemyError: If the database rejects the copied rows.
+    """
+
+    connection = database.session.connection()
+    driver_connection = connection.connection.driver_connection
+    row_count = 0
+
+    try:
+        with driver_connection.cursor() as cursor:  # type: ignore
+            for table, columns, lines in __copy_lines(batch):
+                cursor.copy_expert(
+                        f'COPY {table.name} ({", ".join(columns)}) '
+                        f'FROM STDIN', CopyBuffer(lines))
+                row_count += cursor.rowcount
+    except connection.dialect.loaded_dbapi.Error as exception:
+        raise SQLAlchemyError(str(exception))
+
+    return row_count
+
+
+def __copy_lines(batch: list[ApplicationRecord]) -> Iterator[
+        tuple[Table, tuple[str, ...], Iterator[str]]]:
+    """
+    Create the COPY text format lines of a batch, one generator per table.
+
+    The values never contain tabs, newlines or backslashes, so they need no
+    escaping.
+
+    :param batch: The applications to create lines for.
+    :returns: An iterator of the table, its columns and its lines.
+    """
+
+    yield (ApplicationStatus.__table__, ('person_id', 'status'),
+           (f'{application.person_id}\tPending\n'
+            for application in batch))
+    yield (CompetenceProfile.__table__,
+           ('person_id', 'competence_id', 'years_of_experience'),
+           (f'{competence.person_id}\t{competence.competence_id}\t'
+            f'{competence.years_of_experience}\n'
+            for application in batch
+            for competence in application.competences))
+    yield (Availability.__table__, ('person_id', 'from_date', 'to_date'),
+           (f'{availability.person_id}\t{availability.from_date:%Y-%m-%d}\t'
+            f'{availability.to_date:%Y-%m-%d}\n'
+            for application in batch
+            for availability in application.availabilities))
+
+
+def __insert_batch_in_db(batch: list[ApplicationRecord]) -> int:
+    """
+    Insert a batch of applications with one multi-row insert per table.
+
+    :param batch: The applications to insert.
+    :returns: The number of inserted rows.
+    """
+
+    statuses = [{'person_id': application.person_id, 'status': 'Pending'}
+                for application in batch]
+    competences = [{'person_id': competence.person_id,
+                    'competence_id': competence.competence_id,
+                    'years_of_experience': competence.years_of_experience}
+                   for application in batch
+                   for competence in application.competences]
+    availabilities = [{'person_id': availability.person_id,
+                       'from_date': availability.from_date,
+                       'to_date': availability.to_date}
+                      for application in batch
+                      for availability in application.availabilities]
+
+    for table, rows in ((ApplicationStatus.__table__, statuses),
+                        (CompetenceProfile.__table__, competences),
+                        (Availability.__table__, availabilities)):
+        if rows:
+            database.session.execute(insert(table), rows)
+
+    return len(statuses) + len(competences) + len(availabilities)
@@ -1,39 +1,144 @@
 import logging
+from datetime import date
+from decimal import Decimal
+from itertools import groupby
+from operator import itemgetter
+from typing import Iterator, Optional, Sequence, cast
 
-from sqlalchemy.exc import SQLAlchemyError
+from flask import current_app
+from sqlalchemy import CompoundSelect, CursorResult, Date, Insert, Integer, \
+    Numeric, Row, String, Table, and_, cast as sql_cast, func, insert, \
+    literal, null, or_, select, union_all
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
 from app.extensions import database
 from app.models.application import ApplicationStatus
 from app.models.availability import Availability
 from app.models.competence_profile import CompetenceProfile
+from app.models.idempotency_key import IdempotencyKey
+from app.models.records import ApplicationRecord, AvailabilityRecord, \
+    CompetenceRecord
+from app.repositories.statistics_repository import \
+    add_application_statistics_in_db
 
 
 def insert_application_in_db(
-        competences: list[CompetenceProfile],
-        availabilities: list[Availability],
-        application_status: ApplicationStatus) -> None:
+        competences: list[CompetenceRecord],
+        availabilities: list[AvailabilityRecord],
+        application_status: ApplicationStatus,
+        idempotency_key: Optional[IdempotencyKey] = None) -> bool:
     """
         Insert an application into the database.
 
-        This function inserts an application's competences, availabilities,
-        and status into the database. If any of the insert operations fail,
-        the database session is rolled back to maintain data integrity.
+        This function claims the application for the person by inserting
+        its status with a conflict-aware insert, and inserts the
+        application's competences and availabilities in the same
+        transaction. If APPLICATION_BULK_INSERT is enabled, the competences
+        and availabilities are written with one multi-row insert per table
+        instead of through the ORM unit of work. If the person already has
+        an application, or any of the insert operations fail, the database
+        session is rolled back to maintain data integrity. The response to
+        replay for retries of the request is stored in the same transaction,
+        if given, and so are the increments of the application statistics.
 
-        :param competences: List of CompetenceProfile objects representing
-        the competences of the application.
-        :param availabilities: A list of Availability objects representing
-        the availabilities of the application.
+        :param competences: List of CompetenceRecord or CompetenceProfile
+        objects representing the competences of the application.
+        :param availabilities: A list of AvailabilityRecord or Availability
+        objects representing the availabilities of the application.
         :param application_status: An ApplicationStatus object representing
         the status of the application.
-        :returns: None
+        :param idempotency_key: An optional IdempotencyKey object holding
+        the response to the request.
+        :returns: True if the application was inserted, False if the person
+        has already applied.
         :raises SQLAlchemyError: If there is an issue with any of the database
         operations, an SQLAlchemyError is raised.
     """
 
+    if not __claim_application_in_db(application_status):
+        return False
+
     __insert_competences_in_db(competences)
     __insert_availabilities_in_db(availabilities)
-    __insert_application_status_in_db(application_status)
-    database.session.commit()
+    try:
+        if idempotency_key is not None:
+            database.session.add(idempotency_key)
+        add_application_statistics_in_db(
+                [application_status.status],
+                [(competence.competence_id, competence.years_of_experience)
+                 for competence in competences],
+                application_status.person_id)
+        database.session.commit()
+    except SQLAlchemyError as exception:
+        database.session.rollback()
+        logging.debug(str(exception), exc_info=True)
+        raise SQLAlchemyError
+    return True
+
+
+def insert_applications_in_db(
+        applications: list[ApplicationRecord],
+        idempotency_keys: Optional[list[IdempotencyKey]] = None) -> set[int]:
+    """
+    Insert a batch of applications into the database.
+
+    This function inserts the applications of several persons in a single
+    transaction, with one multi-row insert per table. Persons who have
+    already applied are skipped. The person IDs in the batch must be unique.
+    The application statistics are incremented in the same transaction, and
+    so are the responses to replay for the inserted applications, if given.
+    If any of the insert operations fail, the database session is rolled
+    back and none of the applications are inserted.
+
+    :param applications: A list of ApplicationRecord objects to insert.
+    :param idempotency_keys: Optional IdempotencyKey objects holding the
+           responses to the requests of the applications. Those of persons
+           whose application is skipped are not stored.
+    :returns: The IDs of the persons whose applications were inserted.
+    :raises SQLAlchemyError: If there is an issue with any of the database
+            operations, an SQLAlchemyError is raised.
+    """
+
+    if not applications:
+        return set()
+
+    try:
+        claimed = __claim_applications_in_db(
+                [application.person_id for application in applications])
+
+        __bulk_insert_in_db(CompetenceProfile.__table__, [
+            {'person_id': competence.person_id,
+             'competence_id': competence.competence_id,
+             'years_of_experience': competence.years_of_experience}
+            for application in applications
+            if application.person_id in claimed
+            for competence in application.competences])
+        __bulk_insert_in_db(Availability.__table__, [
+            {'person_id': availability.person_id,
+             'from_date': availability.from_date,
+             'to_date': availability.to_date}
+            for application in applications
+            if application.person_id in claimed
+            for availability in application.availabilities])
+        add_application_statistics_in_db(
+                ['Pending'] * len(claimed),
+                [(competence.competence_id, competence.years_of_experience)
+                 for application in applications
+                 if application.person_id in claimed
+                 for competence in application.competences],
+                applications[0].person_id)
+        database.session.add_all([
+            idempotency_key for idempotency_key in idempotency_keys or []
+            if idempotency_key.person_id in claimed])
+
+        database.session.commit()
+    except SQLAlchemyError as exception:
+        database.session.rollback()
+        logging.debug(str(exception), exc_info=True)
+        raise SQLAlchemyError
+
+    return claimed
 
 
 def get_application_status_from_db(person_id: int) -> ApplicationStatus:
@@ -58,22 +163,395 @@ def get_application_status_from_db(person_id: int) -> ApplicationStatus:
         raise SQLAlchemyError
 
 
-def __insert_availabilities_in_db(availabilities: list[Availability]) -> None:
+def get_application_from_db(
+        person_id: int) -> Optional[tuple[str, ApplicationRecord]]:
+    """
+    Get the full application of a person from the database.
+
+    This function fetches the status, competences and availabilities of the
+    application with the single query of build_application_query.
+
+    :param person_id: The ID of the person to retrieve the application for.
+    :returns: The status of the application and an ApplicationRecord with
+              its competences and availabilities in the order they were
+              stored, or None if the person has not applied.
+    :raises SQLAlchemyError: If there is an issue with the database operation,
+            an SQLAlchemyError is raised.
+    """
+
+    try:
+        rows = database.session.execute(
+                build_application_query(person_id)).all()
+    except SQLAlchemyError as exception:
+        logging.debug(str(exception), exc_info=True)
+        raise SQLAlchemyError
+
+    return read_application_rows(person_id, rows)
+
+
+def build_application_query(person_id: int) -> CompoundSelect:
+    """
+    Build the query of the full application of a person.
+
+    The query reads the status, competences and availabilities of the
+    application with a single UNION ALL, so the whole application is read
+    in one round trip. Each row is tagged with the table it comes from.
+
+    :param person_id: The ID of the person to build the query for.
+    :returns: The query, to be read with read_application_rows.
+    """
+
+    status_rows = select(
+            literal(0).label('kind'), literal(0).label('row_id'),
+            ApplicationStatus.status, sql_cast(null(), Integer),
+            sql_cast(null(), Numeric(4, 2)), sql_cast(null(), Date),
+            sql_cast(null(), Date)).where(
+            ApplicationStatus.person_id == person_id)
+    competence_rows = select(
+            literal(1), CompetenceProfile.competence_profile_id,
+            sql_cast(null(), String), CompetenceProfile.competence_id,
+            CompetenceProfile.years_of_experience, sql_cast(null(), Date),
+            sql_cast(null(), Date)).where(
+            CompetenceProfile.person_id == person_id)
+    availability_rows = select(
+            literal(2), Availability.availability_id,
+            sql_cast(null(), String), sql_cast(null(), Integer),
+            sql_cast(null(), Numeric(4, 2)), Availability.from_date,
+            Availability.to_date).where(Availability.person_id == person_id)
+
+    return union_all(status_rows, competence_rows,
+                     availability_rows).order_by('kind', 'row_id')
+
+
+def read_application_rows(
+        person_id: int,
+        rows: Sequence[Row]) -> Optional[tuple[str, ApplicationRecord]]:
+    """
+    Read the full application of a person from the rows of its query.
+
+    :param person_id: The ID of the person the rows belong to.
+    :param rows: The rows returned by the query of build_application_query.
+    :returns: The status of the application and an ApplicationRecord with
+              its competences and availabilities in the order they were
+              stored, or None if the person has not applied.
+    """
+
+    if not rows or rows[0][0] != 0:
+        return None
+
+    application = ApplicationRecord(person_id, [], [])
+    for kind, _, _, competence_id, years, from_date, to_date in rows[1:]:
+        if kind == 1:
+            application.competences.append(
+                    CompetenceRecord(person_id, competence_id, years))
+        else:
+            application.availabilities.append(
+                    AvailabilityRecord(person_id, from_date, to_date))
+
+    return rows[0][2], application
+
+
+def get_applications_page_from_db(
+        after: int, limit: int) -> list[tuple[str, ApplicationRecord]]:
+    """
+    Get a page of applications from the database.
+
+    This function uses keyset pagination on the person ID: the page holds
+    the first limit applications of persons with an ID greater than after,
+    found through the primary key index without scanning the skipped rows.
+    The competences and availabilities of the whole page are then fetched
+    with one IN query per table, using the person_id indexes.
+
+    :param after: The person ID after which the page starts, 0 for the
+           first page.
+    :param limit: The maximum number of applications in the page.
+    :returns: A list of the status and ApplicationRecord of every
+              application in the page, ordered by person ID.
+    :raises SQLAlchemyError: If there is an issue with the database operation,
+            an SQLAlchemyError is raised.
+    """
+
+    try:
+        statuses = database.session.execute(
+                select(ApplicationStatus.person_id, ApplicationStatus.status)
+                .where(ApplicationStatus.person_id > after)
+                .order_by(ApplicationStatus.person_id)
+                .limit(limit)).all()
+        if not statuses:
+            return []
+
+        person_ids = [person_id for person_id, _ in statuses]
+        applications = {person_id: ApplicationRecord(person_id, [], [])
+                        for person_id in person_ids}
+
+        for person_id, competence_id, years in database.session.execute(
+                select(CompetenceProfile.person_id,
+                       CompetenceProfile.competence_id,
+                       CompetenceProfile.years_of_experience)
+                .where(CompetenceProfile.person_id.in_(person_ids))
+                .order_by(CompetenceProfile.competence_profile_id)):
+            applications[person_id].competences.append(
+                    CompetenceRecord(person_id, competence_id, years))
+
+        for person_id, from_date, to_date in database.session.execute(
+                select(Availability.person_id, Availability.from_date,
+                       Availability.to_date)
+                .where(Availability.person_id.in_(person_ids))
+                .order_by(Availability.availability_id)):
+            applications[person_id].availabilities.append(
+                    AvailabilityRecord(person_id, from_date, to_date))
+    except SQLAlchemyError as exception:
+        logging.debug(str(exception), exc_info=True)
+        raise SQLAlchemyError
+
+    return [(status, applications[person_id])
+            for person_id, status in statuses]
+
+
+def get_available_person_ids_from_db(
+        from_date: date, to_date: date, after: int, limit: int) -> list[int]:
+    """
+    Get the persons who are available at some time within a date range.
+
+    This function finds the availabilities overlapping the date range, that
+    is starting on or before its end and ending on or after its start. The
+    ix_availability_from_date_to_date index covers the query, so only the
+    index entries starting before the end of the range are read.
+
+    :param from_date: The first date of the range.
+    :param to_date: The last date of the range.
+    :param after: The person ID after which the page starts, 0 for the
+           first page.
+    :param limit: The maximum number of person IDs in the page.
+    :returns: The IDs of the available persons in the page, in ascending
+              order.
+    :raises SQLAlchemyError: If there is an issue with the database operation,
+            an SQLAlchemyError is raised.
+    """
+
+    try:
+        return list(database.session.scalars(
+                select(Availability.person_id).distinct()
+                .where(Availability.from_date <= to_date,
+                       Availability.to_date >= from_date,
+                       Availability.person_id > after)
+                .order_by(Availability.person_id)
+                .limit(limit)))
+    except SQLAlchemyError as exception:
+        logging.debug(str(exception), exc_info=True)
+        raise SQLAlchemyError
+
+
+def get_qualified_person_ids_from_db(
+        requirements: dict[int, Decimal], after: int,
+        limit: int) -> list[int]:
+    """
+    Get the persons who have every required competence with at least the
+    required years of experience.
+
+    This function answers the search with a single query, which selects the
+    competence profiles meeting any of the requirements and keeps the
+    persons with a profile for every one of them. Every requirement is a
+    range scan of the ix_competence_profile_competence_id_years index, which
+    covers the query. The minimum years are bound as Decimals with the type
+    of the column, so they are compared as exact numerics on PostgreSQL.
+
+    :param requirements: The minimum years of experience keyed by the
+           required competence IDs.
+    :param after: The person ID after which the page starts, 0 for the
+           first page.
+    :param limit: The maximum number of person IDs in the page.
+    :returns: The IDs of the qualified persons in the page, in ascending
+              order.
+    :raises SQLAlchemyError: If there is an issue with the database operation,
+            an SQLAlchemyError is raised.
+    """
+
+    try:
+        return list(database.session.scalars(
+                select(CompetenceProfile.person_id)
+                .where(or_(*(and_(CompetenceProfile.competence_id
+                                  == competence_id,
+                                  CompetenceProfile.years_of_experience
+                                  >= years)
+                             for competence_id, years
+                             in requirements.items())),
+                       CompetenceProfile.person_id > after)
+                .group_by(CompetenceProfile.person_id)
+                .having(func.count(CompetenceProfile.competence_id.distinct())
+                        == len(requirements))
+                .order_by(CompetenceProfile.person_id)
+                .limit(limit)))
+    except SQLAlchemyError as exception:
+        logging.debug(str(exception), exc_info=True)
+        raise SQLAlchemyError
+
+
+def get_availabilities_from_db(
+        batch_size: int = 10000) -> Iterator[tuple[date, date, int]]:
+    """
+    Get all availabilities from the database.
+
+    This function streams the availabilities in order of their start date,
+    fetching batch_size rows at a time.
+
+    :param batch_size: The number of rows fetched per round trip.
+    :returns: An iterator of the from date, to date and person ID of every
+              availability, ordered by from date.
+    :raises SQLAlchemyError: If there is an issue with the database operation,
+            an SQLAlchemyError is raised.
+    """
+
+    try:
+        for from_date, to_date, person_id in database.session.execute(
+                select(Availability.from_date, Availability.to_date,
+                       Availability.person_id)
+                .order_by(Availability.from_date, Availability.to_date)
+                .execution_options(yield_per=batch_size)):
+            yield from_date, to_date, person_id
+    except SQLAlchemyError as exception:
+        logging.debug(str(exception), exc_info=True)
+        raise SQLAlchemyError
+
+
+def get_competence_profiles_from_db(
+        batch_size: int = 10000) -> Iterator[tuple[int, int, Decimal]]:
+    """
+    Get all competence profiles from the database.
+
+    This function streams the competence profiles, fetching batch_size rows
+    at a time.
+
+    :param batch_size: The number of rows fetched per round trip.
+    :returns: An iterator of the person ID, competence ID and years of
+              experience of every competence profile.
+    :raises SQLAlchemyError: If there is an issue with the database operation,
+            an SQLAlchemyError is raised.
+    """
+
+    try:
+        for person_id, competence_id, years in database.session.execute(
+                select(CompetenceProfile.person_id,
+                       CompetenceProfile.competence_id,
+                       CompetenceProfile.years_of_experience)
+                .execution_options(yield_per=batch_size)):
+            yield person_id, competence_id, years
+    except SQLAlchemyError as exception:
+        logging.debug(str(exception), exc_info=True)
+        raise SQLAlchemyError
+
+
+def stream_applications_from_db(
+        batch_size: int = 10000) -> Iterator[tuple[str, ApplicationRecord]]:
+    """
+    Stream all applications from the database.
+
+    This function reads the application statuses, competence profiles and
+    availabilities with three streaming queries ordered by person ID, which
+    use server-side cursors on PostgreSQL, fetching batch_size rows at a
+    time. The rows are merged per person as they arrive, so memory use does
+    not grow with the number of applications.
+
+    :param batch_size: The number of rows fetched per round trip.
+    :returns: An iterator of the status and record of every application,
+              ordered by person ID.
+    :raises SQLAlchemyError: If there is an issue with the database operation,
+            an SQLAlchemyError is raised.
+    """
+
+    try:
+        statuses = database.session.execute(
+                select(ApplicationStatus.person_id, ApplicationStatus.status)
+                .order_by(ApplicationStatus.person_id)
+                .execution_options(yield_per=batch_size))
+        competence_groups = groupby(database.session.execute(
+                select(CompetenceProfile.person_id,
+                       CompetenceProfile.competence_id,
+                       CompetenceProfile.years_of_experience)
+                .order_by(CompetenceProfile.person_id,
+                          CompetenceProfile.competence_id)
+                .execution_options(yield_per=batch_size)), itemgetter(0))
+        availability_groups = groupby(database.session.execute(
+                select(Availability.person_id, Availability.from_date,
+                       Availability.to_date)
+                .order_by(Availability.person_id, Availability.from_date)
+                .execution_options(yield_per=batch_size)), itemgetter(0))
+
+        next_competences = next(competence_groups, None)
+        next_availabilities = next(availability_groups, None)
+        for person_id, status in statuses:
+            competences = []
+            while (next_competences is not None
+                   and next_competences[0] <= person_id):
+                if next_competences[0] == person_id:
+                    competences = [CompetenceRecord(*row)
+                                   for row in next_competences[1]]
+                next_competences = next(competence_groups, None)
+
+            availabilities = []
+            while (next_availabilities is not None
+                   and next_availabilities[0] <= person_id):
+                if next_availabilities[0] == person_id:
+                    availabilities = [AvailabilityRecord(*row)
+                                      for row in next_availabilities[1]]
+                next_availabilities = next(availability_groups, None)
+
+            yield status, ApplicationRecord(person_id, competences,
+                                            availabilities)
+    except SQLAlchemyError as exception:
+        logging.debug(str(exception), exc_info=True)
+        raise SQLAlchemyError
+
+
+def get_applied_person_ids_from_db(
+        batch_size: int = 10000) -> Iterator[int]:
+    """
+    Get the IDs of all persons who have applied.
+
+    This function streams the person IDs from the application_status table
+    in ascending order, fetching batch_size rows at a time.
+
+    :param batch_size: The number of rows fetched per round trip.
+    :returns: An iterator of the person IDs in ascending order.
+    :raises SQLAlchemyError: If there is an issue with the database operation,
+            an SQLAlchemyError is raised.
+    """
+
+    try:
+        yield from database.session.scalars(
+                select(ApplicationStatus.person_id)
+                .order_by(ApplicationStatus.person_id)
+                .execution_options(yield_per=batch_size))
+    except SQLAlchemyError as exception:
+        logging.debug(str(exception), exc_info=True)
+        raise SQLAlchemyError
+
+
+def __insert_availabilities_in_db(
+        availabilities: list[AvailabilityRecord]) -> None:
     """
     Insert applicant availability into the database.
 
     This function inserts an applicant's availability into the database using
-    the provided Availability object.
+    the provided AvailabilityRecord or Availability objects.
 
-    :param availabilities: List of Availability objects to insert into the
-             database.
+    :param availabilities: List of AvailabilityRecord or Availability objects
+             to insert into the database.
     :returns: None
     :raises SQLAlchemyError: If there is an issue with the database operation,
             an SQLAlchemyError is raised.
     """
 
     try:
-        database.session.add_all(availabilities)
+        if current_app.config.get('APPLICATION_BULK_INSERT'):
+            __bulk_insert_in_db(Availability.__table__, [
+                {'person_id': availability.person_id,
+                 'from_date': availability.from_date,
+                 'to_date': availability.to_date}
+                for availability in availabilities])
+        else:
+            database.session.add_all(
+                    __to_models(Availability, availabilities))
     except SQLAlchemyError as exception:
         database.session.rollback()
         logging.debug(str(exception), exc_info=True)
@@ -81,44 +559,161 @@ def __insert_availabilities_in_db(availabilities: list[Availability]) -> None:
 
 
 def __insert_competences_in_db(
-        competences: list[CompetenceProfile]) -> None:
+        competences: list[CompetenceRecord]) -> None:
     """
     Insert applicant competences into the database.
 
     This function inserts an applicant's competences into the database using
-    the provided CompetenceProfile object.
+    the provided CompetenceRecord or CompetenceProfile objects.
 
-    :param competences: List of CompetenceProfile object to insert
-           into the database.
+    :param competences: List of CompetenceRecord or CompetenceProfile objects
+           to insert into the database.
     :raises SQLAlchemyError: If there is an issue with the database operation,
             an SQLAlchemyError is raised.
     """
 
     try:
-        database.session.add_all(competences)
+        if current_app.config.get('APPLICATION_BULK_INSERT'):
+            __bulk_insert_in_db(CompetenceProfile.__table__, [
+                {'person_id': competence.person_id,
+                 'competence_id': competence.competence_id,
+                 'years_of_experience': competence.years_of_experience}
+                for competence in competences])
+        else:
+            database.session.add_all(
+                    __to_models(CompetenceProfile, competences))
     except SQLAlchemyError as exception:
         database.session.rollback()
         logging.debug(str(exception), exc_info=True)
         raise SQLAlchemyError
 
 
-def __insert_application_status_in_db(
-        application_status: ApplicationStatus) -> None:
+def __to_models(model: type, records: list) -> list:
+    """
+    Convert records to model objects.
+
+    Records are created by passing their fields to the model constructor,
+    while objects that already are model objects are kept as they are.
+
+    :param model: The model class.
+    :param records: The records or model objects.
+    :returns: A list of model objects.
+    """
+
+    return [record if isinstance(record, model) else model(*record)
+            for record in records]
+
+
+def __bulk_insert_in_db(table: Table, rows: list[dict]) -> None:
+    """
+    Insert rows into a table with a single multi-row insert.
+
+    This function bypasses the ORM, so the rows are not tracked by the
+    session and no objects are created for them.
+
+    :param table: The table to insert into.
+    :param rows: The rows to insert, as dictionaries keyed by column name.
+    :raises SQLAlchemyError: If there is an issue with the database operation.
+    """
+
+    if rows:
+        database.session.execute(insert(table), rows)
+
+
+def __claim_application_in_db(application_status: ApplicationStatus) -> bool:
     """
-    Insert application into the database.
+    Claim an application in the database.
 
-    This function inserts an application into the database using the
-    provided Application object.
+    This function inserts the application status of a person unless the
+    person already has one. The check and the insert are a single statement,
+    so concurrent submissions for the same person cannot both succeed.
 
-    :param application_status: The Application object to insert into the
-           database.
+    :param application_status: The ApplicationStatus object to insert into
+           the database.
+    :returns: True if the application status was inserted, False if the
+              person already has an application.
     :raises SQLAlchemyError: If there is an issue with the database operation,
             an SQLAlchemyError is raised.
     """
 
+    statement = __insert_ignoring_conflicts(
+            ApplicationStatus.__table__, ['person_id']).values(
+            person_id=application_status.person_id,
+            status=application_status.status)
+
     try:
-        database.session.add(application_status)
+        result = cast(CursorResult, database.session.execute(statement))
+    except IntegrityError:
+        database.session.rollback()
+        return False
     except SQLAlchemyError as exception:
         database.session.rollback()
         logging.debug(str(exception), exc_info=True)
         raise SQLAlchemyError
+
+    if result.rowcount != 1:
+        database.session.rollback()
+        return False
+
+    return True
+
+
+def __claim_applications_in_db(person_ids: list[int]) -> set[int]:
+    """
+    Claim the applications of several persons in the database.
+
+    This function inserts a pending application status for every person
+    who does not already have one, with a single conflict-aware insert on
+    PostgreSQL and SQLite. On other databases the persons who already have
+    an application are looked up first.
+
+    :param person_ids: The IDs of the persons.
+    :returns: The IDs of the persons whose application status was inserted.
+    :raises SQLAlchemyError: If there is an issue with the database operation.
+    """
+
+    table = ApplicationStatus.__table__
+
+    if database.session.get_bind().dialect.name not in ('postgresql',
+                                                        'sqlite'):
+        existing = set(database.session.scalars(
+                select(ApplicationStatus.person_id).where(
+                        ApplicationStatus.person_id.in_(person_ids))))
+        person_ids = [person_id for person_id in person_ids
+                      if person_id not in existing]
+        __bulk_insert_in_db(table, [{'person_id': person_id,
+                                     'status': 'Pending'}
+                                    for person_id in person_ids])
+        return set(person_ids)
+
+    result = database.session.execute(
+            __insert_ignoring_conflicts(table, ['person_id']).returning(
+                    table.c.person_id),
+            [{'person_id': person_id, 'status': 'Pending'}
+             for person_id in person_ids])
+    return set(result.scalars())
+
+
+def __insert_ignoring_conflicts(
+        table: Table, index_elements: list[str]) -> Insert:
+    """
+    Create an insert statement that skips rows violating a unique constraint.
+
+    This function uses INSERT ... ON CONFLICT DO NOTHING on PostgreSQL and
+    SQLite. On other databases a plain insert is returned, and a conflict
+    surfaces as an IntegrityError.
+
+    :param table: The table to insert into.
+    :param index_elements: The columns of the unique constraint.
+    :returns: The insert statement.
+    """
+
+    dialect = database.session.get_bind().dialect.name
+
+    if dialect == 'postgresql':
+        return postgresql.insert(table).on_conflict_do_nothing(
+                index_elements=index_elements)
+    if dialect == 'sqlite':
+        return sqlite.insert(table).on_conflict_do_nothing(
+                index_elements=index_elements)
+    return insert(table)
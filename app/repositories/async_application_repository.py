@@ -0,0 +1,137 @@
+import logging
+from typing import Optional, cast
+
+from sqlalchemy import CursorResult, Insert, Table, insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.application import ApplicationStatus
+from app.models.availability import Availability
+from app.models.competence_profile import CompetenceProfile
+from app.models.idempotency_key import IdempotencyKey
+from app.models.records import ApplicationRecord, AvailabilityRecord, \
+    CompetenceRecord
+from app.repositories.application_repository import \
+    build_application_query, read_application_rows
+from app.repositories.statistics_repository import \
+    count_application_statistics, upsert_application_statistics
+
+
+async def insert_application_in_db_async(
+        session: AsyncSession, person_id: int,
+        competences: list[CompetenceRecord],
+        availabilities: list[AvailabilityRecord],
+        idempotency_key: Optional[IdempotencyKey] = None,
+        statistics_shards: int = 1) -> bool:
+    """
+    Insert an application into the database without blocking.
+
+    This function is the asynchronous counterpart of
+    insert_application_in_db. It claims the application for the person with
+    a conflict-aware insert of its status, and inserts its competences and
+    availabilities with one multi-row insert per table, the response to
+    replay for retries of the request, if given, and the increments of the
+    application statistics in the same transaction.
+
+    :param session: The asynchronous session of the request.
+    :param person_id: The ID of the person submitting the application.
+    :param competences: The validated competences of the application.
+    :param availabilities: The validated availabilities of the application.
+    :param idempotency_key: An optional IdempotencyKey object holding the
+           response to the request.
+    :param statistics_shards: The number of shards of the statistics
+           counters, see add_application_statistics_in_db.
+    :returns: True if the application was inserted, False if the person has
+              already applied.
+    :raises SQLAlchemyError: If there is an issue with any of the database
+            operations.
+    """
+
+    dialect = session.get_bind().dialect.name
+
+    try:
+        result = cast(CursorResult, await session.execute(
+                __insert_ignoring_conflicts(
+                        dialect, ApplicationStatus.__table__,
+                        ['person_id']).values(person_id=person_id,
+                                              status='Pending')))
+        if result.rowcount != 1:
+            await session.rollback()
+            return False
+
+        if competences:
+            await session.execute(insert(CompetenceProfile.__table__), [
+                {'person_id': competence.person_id,
+                 'competence_id': competence.competence_id,
+                 'years_of_experience': competence.years_of_experience}
+                for competence in competences])
+        if availabilities:
+            await session.execute(insert(Availability.__table__), [
+                {'person_id': availability.person_id,
+                 'from_date': availability.from_date,
+                 'to_date': availability.to_date}
+                for availability in availabilities])
+        if idempotency_key is not None:
+            session.add(idempotency_key)
+        await session.execute(
+                upsert_application_statistics(dialect),  # type: ignore
+                count_application_statistics(
+                        ['Pending'],
+                        [(competence.competence_id,
+                          competence.years_of_experience)
+                         for competence in competences],
+                        person_id % statistics_shards))
+        await session.commit()
+    except SQLAlchemyError as exception:
+        await session.rollback()
+        logging.debug(str(exception), exc_info=True)
+        raise SQLAlchemyError
+
+    return True
+
+
+async def get_application_from_db_async(
+        session: AsyncSession,
+        person_id: int) -> Optional[tuple[str, ApplicationRecord]]:
+    """
+    Get the full application of a person from the database without
+    blocking.
+
+    :param session: The asynchronous session of the request.
+    :param person_id: The ID of the person to retrieve the application for.
+    :returns: The status of the application and an ApplicationRecord with
+              its competences and availabilities, or None if the person has
+              not applied, see get_application_from_db.
+    :raises SQLAlchemyError: If there is an issue with the database operation.
+    """
+
+    try:
+        result = await session.execute(build_application_query(person_id))
+        rows = result.all()
+    except SQLAlchemyError as exception:
+        logging.debug(str(exception), exc_info=True)
+        raise SQLAlchemyError
+
+    return read_application_rows(person_id, rows)
+
+
+def __insert_ignoring_conflicts(dialect: str, table: Table,
+                                index_elements: list[str]) -> Insert:
+    """
+    Create an insert statement that skips rows violating a unique constraint.
+
+    The asynchronous drivers are those of PostgreSQL and SQLite, which both
+    support INSERT ... ON CONFLICT DO NOTHING.
+
+    :param dialect: The name of the database dialect.
+    :param table: The table to insert into.
+    :param index_elements: The columns of the unique constraint.
+    :returns: The insert statement.
+    """
+
+    if dialect == 'postgresql':
+        return postgresql.insert(table).on_conflict_do_nothing(
+                index_elements=index_elements)
+    return sqlite.insert(table).on_conflict_do_nothing(
+            index_elements=index_elements)
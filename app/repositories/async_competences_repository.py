@@ -0,0 +1,30 @@
+import logging
+
+from sqlalchemy import select
+from sqlalchemy.exc import NoResultFound, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.competence import Competence
+
+
+async def get_competences_from_db_async(
+        session: AsyncSession) -> list[Competence]:
+    """
+    Retrieve a list of competences from the database without blocking.
+
+    :param session: The asynchronous session of the request.
+    :returns: A list of Competence objects.
+    :raises SQLAlchemyError: If there is an issue with the database operation.
+    :raises NoResultFound: If no competences are found in the database.
+    """
+
+    try:
+        competences = list(await session.scalars(select(Competence)))
+    except SQLAlchemyError as exception:
+        logging.debug(str(exception), exc_info=True)
+        raise SQLAlchemyError
+
+    if not competences:
+        logging.debug(NoResultFound('NO COMPETENCES FOUND'))
+        raise NoResultFound
+    return competences
@@ -0,0 +1,60 @@
+import logging
+from datetime import datetime
+from typing import Optional, cast
+
+from sqlalchemy import CursorResult, delete, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.idempotency_key import IdempotencyKey
+
+
+async def get_idempotency_key_from_db_async(
+        session: AsyncSession, person_id: int, key: str,
+        created_after: datetime) -> Optional[IdempotencyKey]:
+    """
+    Get a stored response by its idempotency key without blocking.
+
+    :param session: The asynchronous session of the request.
+    :param person_id: The ID of the person who sent the request.
+    :param key: The idempotency key.
+    :param created_after: The time before which stored responses have
+           expired.
+    :returns: The IdempotencyKey object, or None if there is no unexpired
+              response stored with the key.
+    :raises SQLAlchemyError: If there is an issue with the database operation.
+    """
+
+    try:
+        return await session.scalar(select(IdempotencyKey).where(
+                IdempotencyKey.person_id == person_id,
+                IdempotencyKey.key == key,
+                IdempotencyKey.created_at > created_after))
+    except SQLAlchemyError as exception:
+        logging.debug(str(exception), exc_info=True)
+        raise SQLAlchemyError
+
+
+async def delete_idempotency_keys_from_db_async(
+        session: AsyncSession, created_before: datetime) -> int:
+    """
+    Delete the stored responses that have expired without blocking.
+
+    :param session: The asynchronous session of the request.
+    :param created_before: The time before which stored responses have
+           expired.
+    :returns: The number of deleted responses.
+    :raises SQLAlchemyError: If there is an issue with the database operation.
+    """
+
+    try:
+        result = cast(CursorResult, await session.execute(
+                delete(IdempotencyKey).where(
+                        IdempotencyKey.created_at <= created_before)))
+        await session.commit()
+    except SQLAlchemyError as exception:
+        await session.rollback()
+        logging.debug(str(exception), exc_info=True)
+        raise SQLAlchemyError
+
+    return result.rowcount
@@ -0,0 +1,81 @@
+import logging
+from datetime import datetime
+from typing import Optional, cast
+
+from sqlalchemy import CursorResult, delete
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from app.extensions import database
+from app.models.idempotency_key import IdempotencyKey
+
+
+def get_idempotency_key_from_db(
+        person_id: int, key: str,
+        created_after: datetime) -> Optional[IdempotencyKey]:
+    """
+    Get a stored response by its idempotency key.
+
+    :param person_id: The ID of the person who sent the request.
+    :param key: The idempotency key.
+    :param created_after: The time before which stored responses have
+           expired.
+    :returns: The IdempotencyKey object, or None if there is no unexpired
+              response stored with the key.
+    :raises SQLAlchemyError: If there is an issue with the database operation.
+    """
+
+    try:
+        return IdempotencyKey.query.filter(
+                IdempotencyKey.person_id == person_id,
+                IdempotencyKey.key == key,
+                IdempotencyKey.created_at > created_after).first()
+    except SQLAlchemyError as exception:
+        logging.debug(str(exception), exc_info=True)
+        raise SQLAlchemyError
+
+
+def insert_idempotency_key_in_db(idempotency_key: IdempotencyKey) -> bool:
+    """
+    Insert a stored response into the database.
+
+    :param idempotency_key: The IdempotencyKey object to insert.
+    :returns: True if the response was stored, False if a response is
+              already stored with the key.
+    :raises SQLAlchemyError: If there is an issue with the database operation.
+    """
+
+    try:
+        database.session.add(idempotency_key)
+        database.session.commit()
+    except IntegrityError:
+        database.session.rollback()
+        return False
+    except SQLAlchemyError as exception:
+        database.session.rollback()
+        logging.debug(str(exception), exc_info=True)
+        raise SQLAlchemyError
+
+    return True
+
+
+def delete_idempotency_keys_from_db(created_before: datetime) -> int:
+    """
+    Delete the stored responses that have expired.
+
+    :param created_before: The time before which stored responses have
+           expired.
+    :returns: The number of deleted responses.
+    :raises SQLAlchemyError: If there is an issue with the database operation.
+    """
+
+    try:
+        result = cast(CursorResult, database.session.execute(
+                delete(IdempotencyKey).where(
+                        IdempotencyKey.created_at <= created_before)))
+        database.session.commit()
+    except SQLAlchemyError as exception:
+        database.session.rollback()
+        logging.debug(str(exception), exc_info=True)
+        raise SQLAlchemyError
+
+    return result.rowcount
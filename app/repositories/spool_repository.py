@@ -0,0 +1,216 @@
+import json
+import os
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import date
+from decimal import Decimal
+from typing import Iterator, Optional
+
+from app.models.records import ApplicationRecord, AvailabilityRecord, \
+    CompetenceRecord
+
+
+class SubmissionSpool:
+    """
+    A durable on-disk queue of submitted applications.
+
+    The spool is a SQLite database in WAL mode with synchronous commits, so
+    an appended application survives a crash or restart of the worker. It
+    may be shared by all workers on the same machine. Every person can have
+    at most one application in the spool.
+
+    Spooled applications are 'Queued' until a drainer claims them, which
+    makes them 'Draining', and are then either 'Stored' or 'Rejected' if the
+    person had already applied. Claims that are not completed in time are
+    released again. Completed applications are kept until they are pruned.
+
+    The spool must be on storage that outlives the worker, since queued
+    applications exist nowhere else.
+
+    :ivar path: The path of the spool database.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Initializes a new SubmissionSpool object and creates its database.
+
+        :param path: The path of the spool database.
+        """
+
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self.__connect() as connection:
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute(
+                    'CREATE TABLE IF NOT EXISTS spooled_application ('
+                    'tracking_id TEXT PRIMARY KEY, '
+                    'person_id INTEGER NOT NULL UNIQUE, '
+                    'application TEXT NOT NULL, '
+                    'state TEXT NOT NULL, '
+                    'updated_at REAL NOT NULL)')
+            connection.execute(
+                    'CREATE INDEX IF NOT EXISTS spooled_application_state '
+                    'ON spooled_application (state, updated_at)')
+
+    def append(self, application: ApplicationRecord) -> Optional[str]:
+        """
+        Append an application to the spool.
+
+        :param application: The validated application.
+        :returns: The tracking ID of the spooled application, or None if the
+                  person already has an application in the spool.
+        """
+
+        tracking_id = uuid.uuid4().hex
+        try:
+            with self.__connect() as connection:
+                connection.execute(
+                        'INSERT INTO spooled_application VALUES '
+                        '(?, ?, ?, ?, ?)',
+                        (tracking_id, application.person_id,
+                         self.__serialize(application), 'Queued',
+                         time.time()))
+        except sqlite3.IntegrityError:
+            return None
+        return tracking_id
+
+    def claim(self, batch_size: int,
+              claim_timeout: float) -> list[tuple[str, ApplicationRecord]]:
+        """
+        Claim a batch of queued applications for draining.
+
+        Applications claimed longer than claim_timeout seconds ago, for
+        example by a worker that has since been stopped, are claimable again.
+
+        :param batch_size: The maximum number of applications to claim.
+        :param claim_timeout: The number of seconds after which a claim
+               expires.
+        :returns: A list of the tracking IDs and applications claimed.
+        """
+
+        now = time.time()
+        with self.__connect() as connection:
+            connection.execute('BEGIN IMMEDIATE')
+            rows = connection.execute(
+                    'SELECT tracking_id, application FROM '
+                    'spooled_application WHERE state = ? OR '
+                    '(state = ? AND updated_at < ?) '
+                    'ORDER BY updated_at LIMIT ?',
+                    ('Queued', 'Draining', now - claim_timeout,
+                     batch_size)).fetchall()
+            connection.executemany(
+                    'UPDATE spooled_application SET state = ?, '
+                    'updated_at = ? WHERE tracking_id = ?',
+                    [('Draining', now, tracking_id)
+                     for tracking_id, _ in rows])
+
+        return [(tracking_id, self.__deserialize(application))
+                for tracking_id, application in rows]
+
+    def complete(self, states: dict[str, str]) -> None:
+        """
+        Set the state of drained applications.
+
+        :param states: The new state keyed by tracking ID. 'Queued' releases
+               the application to be drained again.
+        """
+
+        now = time.time()
+        with self.__connect() as connection:
+            connection.executemany(
+                    'UPDATE spooled_application SET state = ?, '
+                    'updated_at = ? WHERE tracking_id = ?',
+                    [(state, now, tracking_id)
+                     for tracking_id, state in states.items()])
+
+    def prune(self, completed_before: float) -> int:
+        """
+        Delete applications completed before a point in time.
+
+        :param completed_before: The UNIX time before which 'Stored' and
+               'Rejected' applications are deleted.
+        :returns: The number of applications deleted.
+        """
+
+        with self.__connect() as connection:
+            return connection.execute(
+                    'DELETE FROM spooled_application WHERE state IN (?, ?) '
+                    'AND updated_at < ?',
+                    ('Stored', 'Rejected', completed_before)).rowcount
+
+    def get(self, tracking_id: str) -> Optional[tuple[int, str]]:
+        """
+        Get a spooled application.
+
+        :param tracking_id: The tracking ID of the application.
+        :returns: The person ID and state of the application, or None if
+                  there is no such application.
+        """
+
+        with self.__connect() as connection:
+            return connection.execute(
+                    'SELECT person_id, state FROM spooled_application '
+                    'WHERE tracking_id = ?', (tracking_id,)).fetchone()
+
+    @contextmanager
+    def __connect(self) -> Iterator[sqlite3.Connection]:
+        """
+        Open a connection to the spool database for one transaction.
+
+        A connection is opened per operation, since connections cannot be
+        shared between the request threads and the drainer. The transaction
+        is committed when the block exits and rolled back if it raises.
+
+        :returns: An iterator yielding the connection.
+        """
+
+        connection = sqlite3.connect(self.path, timeout=30)
+        try:
+            connection.execute('PRAGMA synchronous=FULL')
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    @staticmethod
+    def __serialize(application: ApplicationRecord) -> str:
+        """
+        Serialize an application to JSON.
+
+        :param application: The application.
+        :returns: The JSON representation of the application.
+        """
+
+        return json.dumps({
+            'person_id': application.person_id,
+            'competences': [[competence.competence_id,
+                             str(competence.years_of_experience)]
+                            for competence in application.competences],
+            'availabilities': [[availability.from_date.isoformat(),
+                                availability.to_date.isoformat()]
+                               for availability in application.availabilities]
+        })
+
+    @staticmethod
+    def __deserialize(data: str) -> ApplicationRecord:
+        """
+        Deserialize an application from JSON.
+
+        :param data: The JSON representation of the application.
+        :returns: The application.
+        """
+
+        application = json.loads(data)
+        person_id = application['person_id']
+        return ApplicationRecord(
+                person_id,
+                [CompetenceRecord(person_id, competence_id, Decimal(years))
+                 for competence_id, years in application['competences']],
+                [AvailabilityRecord(person_id, date.fromisoformat(from_date),
+                                    date.fromisoformat(to_date))
+                 for from_date, to_date in application['availabilities']])
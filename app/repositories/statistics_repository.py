@@ -0,0 +1,223 @@
+import logging
+from bisect import bisect_right
+from collections import Counter
+from decimal import Decimal
+from typing import Iterable, Optional, Union
+
+from flask import current_app
+from sqlalchemy import Insert, case, delete, func, insert, select, text, \
+    update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.extensions import database
+from app.models.application import ApplicationStatus
+from app.models.application_statistic import ApplicationStatistic
+from app.models.competence_profile import CompetenceProfile
+
+YEARS_OF_EXPERIENCE_BUCKETS = (0, 1, 2, 3, 5, 10, 20)
+
+
+def add_application_statistics_in_db(
+        statuses: Iterable[str],
+        competences: Iterable[tuple[int, Decimal]],
+        person_id: int) -> None:
+    """
+    Add inserted applications to the statistics.
+
+    This function increments the counters of the statuses, competences and
+    years of experience buckets of the applications in the current
+    transaction, without committing it, so the statistics are exactly as
+    durable as the applications. The transaction increments the shard of
+    the counters selected by a person ID modulo
+    APPLICATION_STATISTICS_SHARDS, so concurrent transactions of different
+    persons rarely wait for each other's locks. The counters are upserted
+    with a single statement on PostgreSQL and SQLite, in key order so that
+    concurrent transactions lock them in the same order and cannot
+    deadlock. It should be called right before the commit, since the
+    counters stay locked until then.
+
+    :param statuses: The status of every inserted application.
+    :param competences: The competence ID and years of experience of every
+           competence of the inserted applications.
+    :param person_id: The ID of one of the persons whose applications were
+           inserted, which selects the shard.
+    :raises SQLAlchemyError: If there is an issue with the database operation.
+    """
+
+    rows = count_application_statistics(
+            statuses, competences,
+            person_id % current_app.config.get(
+                    'APPLICATION_STATISTICS_SHARDS', 16))
+    if not rows:
+        return
+
+    statement = upsert_application_statistics(
+            database.session.get_bind().dialect.name)
+    if statement is not None:
+        database.session.execute(statement, rows)
+        return
+
+    for row in rows:
+        result = database.session.execute(
+                update(ApplicationStatistic).where(
+                        ApplicationStatistic.statistic == row['statistic'],
+                        ApplicationStatistic.key == row['key'],
+                        ApplicationStatistic.shard == row['shard']).values(
+                        count=ApplicationStatistic.count + row['count']))
+        if not result.rowcount:  # type: ignore[attr-defined]
+            database.session.execute(
+                    insert(ApplicationStatistic.__table__), [row])
+
+
+def count_application_statistics(
+        statuses: Iterable[str],
+        competences: Iterable[tuple[int, Decimal]],
+        shard: int = 0) -> list[dict]:
+    """
+    Count the increments of the statistics counters for inserted
+    applications.
+
+    :param statuses: The status of every inserted application.
+    :param competences: The competence ID and years of experience of every
+           competence of the inserted applications.
+    :param shard: The shard of the counters to increment.
+    :returns: The 'statistic', 'key', 'shard' and 'count' increment of every
+              counter, ordered by key.
+    """
+
+    counts: Counter = Counter(
+            ('status', status) for status in statuses)
+    for competence_id, years_of_experience in competences:
+        counts['competence', str(competence_id)] += 1
+        counts['years', f'{competence_id}:'
+                        f'{__years_bucket(years_of_experience)}'] += 1
+
+    return [{'statistic': statistic, 'key': key, 'shard': shard,
+             'count': count}
+            for (statistic, key), count in sorted(counts.items())]
+
+
+def upsert_application_statistics(dialect: str) -> Optional[Insert]:
+    """
+    Create an insert statement that adds to the counters that already exist.
+
+    This function uses INSERT ... ON CONFLICT DO UPDATE on PostgreSQL and
+    SQLite.
+
+    :param dialect: The name of the database dialect.
+    :returns: The insert statement, or None on other databases.
+    """
+
+    statement: Union[postgresql.Insert, sqlite.Insert]
+
+    if dialect == 'postgresql':
+        statement = postgresql.insert(ApplicationStatistic.__table__)
+    elif dialect == 'sqlite':
+        statement = sqlite.insert(ApplicationStatistic.__table__)
+    else:
+        return None
+
+    return statement.on_conflict_do_update(
+            index_elements=['statistic', 'key', 'shard'],
+            set_={'count': ApplicationStatistic.count
+                  + statement.excluded['count']})
+
+
+def get_application_statistics_from_db() -> list[tuple[str, str, int]]:
+    """
+    Get the counters of the application statistics.
+
+    There are a few counters per competence, so this reads a small table
+    no matter how many applications there are. The shards of every counter
+    are summed.
+
+    :returns: The kind, key and value of every counter.
+    :raises SQLAlchemyError: If there is an issue with the database operation.
+    """
+
+    try:
+        return [(statistic, key, int(count)) for statistic, key, count
+                in database.session.execute(select(
+                        ApplicationStatistic.statistic,
+                        ApplicationStatistic.key,
+                        func.sum(ApplicationStatistic.count))
+                        .group_by(ApplicationStatistic.statistic,
+                                  ApplicationStatistic.key))]
+    except SQLAlchemyError as exception:
+        logging.debug(str(exception), exc_info=True)
+        raise SQLAlchemyError
+
+
+def rebuild_application_statistics_in_db() -> int:
+    """
+    Rebuild the application statistics from the applications.
+
+    This function replaces the counters with ones computed by grouping the
+    application_status and competence_profile tables, correcting any drift,
+    for example from statuses changed by other services. The statistics
+    table is locked first, on PostgreSQL explicitly and on SQLite by the
+    delete, so applications inserted concurrently are counted exactly once:
+    either by the rebuild or by their own increments after it commits. The
+    rebuilt counters are written to the first shard.
+
+    :returns: The number of counters.
+    :raises SQLAlchemyError: If there is an issue with the database operation.
+    """
+
+    years_bucket = case(
+            *((CompetenceProfile.years_of_experience < upper, lower)
+              for lower, upper in zip(YEARS_OF_EXPERIENCE_BUCKETS,
+                                      YEARS_OF_EXPERIENCE_BUCKETS[1:])),
+            else_=YEARS_OF_EXPERIENCE_BUCKETS[-1])
+
+    try:
+        if database.session.get_bind().dialect.name == 'postgresql':
+            database.session.execute(text(
+                    'LOCK TABLE application_statistic IN EXCLUSIVE MODE'))
+        database.session.execute(delete(ApplicationStatistic))
+
+        rows = [{'statistic': 'status', 'key': status, 'count': count}
+                for status, count in database.session.execute(
+                        select(ApplicationStatus.status, func.count())
+                        .group_by(ApplicationStatus.status))]
+        rows.extend({'statistic': 'competence', 'key': str(competence_id),
+                     'count': count}
+                    for competence_id, count in database.session.execute(
+                            select(CompetenceProfile.competence_id,
+                                   func.count())
+                            .group_by(CompetenceProfile.competence_id)))
+        rows.extend({'statistic': 'years', 'key': f'{competence_id}:{bucket}',
+                     'count': count}
+                    for competence_id, bucket, count
+                    in database.session.execute(
+                            select(CompetenceProfile.competence_id,
+                                   years_bucket, func.count())
+                            .group_by(CompetenceProfile.competence_id,
+                                      years_bucket)))
+
+        for row in rows:
+            row['shard'] = 0
+        if rows:
+            database.session.execute(
+                    insert(ApplicationStatistic.__table__), rows)
+        database.session.commit()
+    except SQLAlchemyError as exception:
+        database.session.rollback()
+        logging.debug(str(exception), exc_info=True)
+        raise SQLAlchemyError
+
+    return len(rows)
+
+
+def __years_bucket(years_of_experience: Decimal) -> int:
+    """
+    Get the years of experience bucket of a competence.
+
+    :param years_of_experience: The years of experience.
+    :returns: The lower bound of the bucket.
+    """
+
+    return YEARS_OF_EXPERIENCE_BUCKETS[
+        max(bisect_right(YEARS_OF_EXPERIENCE_BUCKETS, years_of_experience)
+            - 1, 0)]
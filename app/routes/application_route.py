@@ -1,14 +1,19 @@
 import logging
-from datetime import datetime
+from typing import Callable, Optional
 
-from flask import Blueprint, Response, jsonify, request
+from flask import Blueprint, Response, current_app, jsonify, request
 from flask_jwt_extended import get_jwt, jwt_required
 from sqlalchemy.exc import SQLAlchemyError
 
-from app.models.availability import Availability
-from app.models.competence_profile import CompetenceProfile
-from app.services.application_service import already_applied, store_application
-from app.services.competences_service import fetch_competences
+from app.models.records import AvailabilityRecord, CompetenceRecord
+from app.services.application_service import fetch_application, \
+    fetch_application_status, store_application
+from app.services.applied_person_service import applied_persons
+from app.services.idempotency_service import find_idempotent_response, \
+    save_idempotent_response, valid_idempotency_key
+from app.services.spool_service import get_spooled_application_status, \
+    spool_application
+from app.services.validation_service import validate_application
 from app.utilities.status_codes import StatusCodes
 
 application_submission_bp = Blueprint('application_submission', __name__)
@@ -22,7 +27,22 @@ def add_submitted_application() -> tuple[Response, int]:
 
     This function adds a submitted application to the database. It first
     validates request and the data, and if all validations pass, it stores
-    the application in the database.
+    the application in the database unless the person has already applied.
+    An invalid application is answered with the first error under 'error'
+    and all errors under 'errors'. The years of experience of the stored
+    competences are answered as strings with two decimals, such as "5.00",
+    whether they were submitted as numbers or strings.
+
+    If SUBMISSION_SPOOL_ENABLED is set, the valid application is instead
+    appended to the submission spool and answered with 202 and a
+    'tracking_id', with which its status can be fetched once it has been
+    stored in the background.
+
+    A request with an Idempotency-Key header that has already been answered
+    with 201 or 202 is answered with the stored response instead, without
+    validating the application again. This also holds for a retry that
+    conflicts with the request it retries. Persons in the applied person
+    filter are answered with 409 before their application is validated.
 
     :returns: A tuple containing a Response object and an HTTP status code.
     """
@@ -36,182 +56,220 @@ def add_submitted_application() -> tuple[Response, int]:
         return (jsonify({'error': 'UNAUTHORIZED_ROLE'}),
                 StatusCodes.UNAUTHORIZED)
 
+    idempotency_key = request.headers.get('Idempotency-Key')
+    if idempotency_key is not None:
+        if not valid_idempotency_key(idempotency_key):
+            logging.warning(f'{requester_ip} - Invalid idempotency key')
+            return (jsonify({'error': 'INVALID_IDEMPOTENCY_KEY'}),
+                    StatusCodes.BAD_REQUEST)
+        try:
+            stored_response = find_idempotent_response(
+                    person_id, idempotency_key)
+        except SQLAlchemyError as exception:
+            logging.error(f'{requester_ip} - {exception.args[0]}')
+            return (jsonify(exception.args[0]),
+                    StatusCodes.INTERNAL_SERVER_ERROR)
+        if stored_response is not None:
+            logging.info(f'{requester_ip} - Replayed response for person: '
+                         f'{person_id}')
+            return __replay_response(*stored_response)
+
     if (not request or request.content_type != 'application/json'
             or not request.json):
         logging.warning(f'{requester_ip} - Invalid JSON payload')
         return (jsonify({'error': 'INVALID_JSON_PAYLOAD'}),
                 StatusCodes.BAD_REQUEST)
 
-    if already_applied(person_id):
+    if person_id in applied_persons:
         logging.warning(f'{requester_ip} - Person already applied: '
                         f'{person_id}')
         return (jsonify({'error': 'ALREADY_APPLIED_BEFORE'}),
                 StatusCodes.CONFLICT)
 
-    application = request.json
-
     try:
-        competences = application[
-            'competences'] if 'competences' in application else []
-
-        availabilities = application[
-            'availabilities'] if 'availabilities' in application else []
-
-        valid_competences = __validate_competences(person_id, competences)
-        valid_availabilities = __validate_availabilities(
-                person_id, availabilities)
+        validation = validate_application(person_id, request.json)
+        if validation.errors:
+            logging.warning(f'{requester_ip} - {validation.errors}')
+            return (jsonify({'error': validation.errors[0]['error'],
+                             'errors': validation.errors}),
+                    StatusCodes.BAD_REQUEST)
+
+        if current_app.config.get('SUBMISSION_SPOOL_ENABLED'):
+            return __spool_submitted_application(
+                    person_id, validation.competences,
+                    validation.availabilities, idempotency_key)
 
         application = store_application(
-                person_id, valid_competences, valid_availabilities)
+                person_id, validation.competences, validation.availabilities,
+                idempotency_key)
+
+        stored_response = None
+        if application is None and idempotency_key is not None:
+            stored_response = find_idempotent_response(
+                    person_id, idempotency_key)
 
-    except (TypeError, KeyError, ValueError) as exception:
-        logging.warning(f'{requester_ip} - {exception.args[0]}')
-        return jsonify(exception.args[0]), StatusCodes.BAD_REQUEST
     except SQLAlchemyError as exception:
         logging.error(f'{requester_ip} - {exception.args[0]}')
         return jsonify(exception.args[0]), StatusCodes.INTERNAL_SERVER_ERROR
 
+    if stored_response is not None:
+        logging.info(f'{requester_ip} - Replayed response for person: '
+                     f'{person_id}')
+        return __replay_response(*stored_response)
+
+    if application is None:
+        logging.warning(f'{requester_ip} - Person already applied: '
+                        f'{person_id}')
+        return (jsonify({'error': 'ALREADY_APPLIED_BEFORE'}),
+                StatusCodes.CONFLICT)
+
     logging.info(f'{requester_ip} - Application submitted for person: '
                  f'{person_id}')
     return jsonify(application), StatusCodes.CREATED
 
 
-def __validate_competences(
-        person_id: int, competences: list[dict]) -> list[CompetenceProfile]:
+@application_submission_bp.route('/', methods=['GET'])
+@jwt_required()
+def get_submitted_application() -> tuple[Response, int]:
     """
-    Validate competences.
+    Get the submitted application of the requesting person.
 
-    This function validates the competences of an application. It checks if the
-    competences are a list and if they are valid competences.
+    This function returns the status, competences and availabilities of the
+    application in the same format as when it was submitted.
 
-    :param person_id: The ID of the person submitting the application.
-    :param competences: A list of dictionaries representing the competences of
-                        the application.
-    :returns: A list of CompetenceProfile objects representing the validated
-              competences.
-    :raises TypeError: If the competences are not a list.
+    :returns: A tuple containing a Response object and an HTTP status code.
     """
 
-    if not isinstance(competences, list):
-        raise TypeError({'error': 'INVALID_PAYLOAD_STRUCTURE'})
-
-    if competences:
-        valid_competences = fetch_competences()
-        return [__validate_competence(person_id, competence, valid_competences)
-                for competence in competences]
+    return __get_own_application(fetch_application)
 
-    return []
 
+@application_submission_bp.route('/status', methods=['GET'])
+@jwt_required()
+def get_submitted_application_status() -> tuple[Response, int]:
+    """
+    Get the status of the submitted application of the requesting person.
 
-def __validate_competence(
-        person_id: int, competence: dict,
-        valid_competences: list[dict]) -> CompetenceProfile:
+    :returns: A tuple containing a Response object and an HTTP status code.
     """
-    Validate a competence.
 
-    This function validates a single competence of an application. It checks if
-    the competence is a dictionary and if it contains the required keys. It
-    also checks if the competence ID is valid and if the years of experience is
-    a valid float.
+    return __get_own_application(fetch_application_status)
 
-    :param person_id: The ID of the person submitting the application.
-    :param competence: A dictionary representing a competence of the
-                       application.
-    :param valid_competences: A dictionary of valid competences.
-    :returns: A CompetenceProfile object representing the validated competence.
-    :raises TypeError: If the competence is not a dictionary.
-    :raises KeyError: If a required key is missing from the competence.
-    :raises ValueError: If a value in the competence is invalid.
-    """
 
-    if not isinstance(competence, dict):
-        raise TypeError({'error': 'INVALID_COMPETENCE'})
+@application_submission_bp.route('/spool/<tracking_id>', methods=['GET'])
+@jwt_required()
+def get_spooled_application(tracking_id: str) -> tuple[Response, int]:
+    """
+    Get the status of a spooled application.
 
-    if 'competence_id' not in competence:
-        raise KeyError({'error': 'MISSING_COMPETENCE_ID'})
+    This function looks up an application submitted while spooling was
+    enabled. Only the person who submitted it can see its status, which is
+    'Queued' or 'Draining' until it has been stored, then 'Stored', or
+    'Rejected' if the person had already applied.
 
-    if 'years_of_experience' not in competence:
-        raise KeyError({'error': 'MISSING_YEARS_OF_EXPERIENCE'})
+    :param tracking_id: The tracking ID returned when it was submitted.
+    :returns: A tuple containing a Response object and an HTTP status code.
+    """
 
-    valid_competence_ids = [comp['competence_id'] for comp in
-                            valid_competences]
-    if competence['competence_id'] not in valid_competence_ids:
-        raise ValueError({'error': 'INVALID_COMPETENCE_ID'})
+    person_id = get_jwt()['id']
+    requester_ip = request.remote_addr
 
     try:
-        years_of_experience = float(competence['years_of_experience'])
-    except ValueError:
-        raise ValueError({'error': 'INVALID_YEARS_OF_EXPERIENCE'})
+        status = get_spooled_application_status(person_id, tracking_id)
+    except SQLAlchemyError as exception:
+        logging.error(f'{requester_ip} - {exception.args[0]}')
+        return jsonify(exception.args[0]), StatusCodes.INTERNAL_SERVER_ERROR
 
-    if years_of_experience < 0:
-        raise ValueError({'error': 'INVALID_YEARS_OF_EXPERIENCE'})
+    if status is None:
+        logging.warning(f'{requester_ip} - Spooled application not found: '
+                        f'{tracking_id}')
+        return (jsonify({'error': 'APPLICATION_NOT_FOUND'}),
+                StatusCodes.NOT_FOUND)
 
-    return CompetenceProfile(
-            person_id, competence['competence_id'], years_of_experience)
+    return (jsonify({'tracking_id': tracking_id, 'status': status}),
+            StatusCodes.OK)
 
 
-def __validate_availabilities(
-        person_id: int, availabilities: list[dict]) -> list[Availability]:
+def __get_own_application(
+        fetch: Callable[[int], Optional[dict]]) -> tuple[Response, int]:
     """
-    Validate availabilities.
-
-    This function validates the availabilities of an application. It checks if
-    the availabilities are a list and if they are valid availabilities.
+    Get the application of the requesting applicant.
 
-    :param person_id: The ID of the person submitting the application.
-    :param availabilities: A list of dictionaries representing the
-                           availabilities of the application.
-    :returns: A list of Availability objects representing the validated
-              availabilities.
-    :raises TypeError: If the availabilities are not a list.
-    :raises ValueError: If there are no availabilities.
+    :param fetch: The function fetching the application by person ID.
+    :returns: A tuple containing a Response object and an HTTP status code.
     """
-    if not isinstance(availabilities, list):
-        raise TypeError({'error': 'INVALID_PAYLOAD_STRUCTURE'})
 
-    if not availabilities:
-        raise ValueError({'error': 'MISSING_AVAILABILITIES'})
+    person_id = get_jwt()['id']
+    requester_ip = request.remote_addr
 
-    return [__validate_availability(person_id, availability)
-            for availability in availabilities]
+    role = get_jwt()['role']
+    if role != 2:
+        logging.warning(f'{requester_ip} - Unauthorized person: {person_id}')
+        return (jsonify({'error': 'UNAUTHORIZED_ROLE'}),
+                StatusCodes.UNAUTHORIZED)
 
+    try:
+        application = fetch(person_id)
+    except SQLAlchemyError as exception:
+        logging.error(f'{requester_ip} - {exception.args[0]}')
+        return jsonify(exception.args[0]), StatusCodes.INTERNAL_SERVER_ERROR
 
-def __validate_availability(person_id: int,
-                            availability: dict) -> Availability:
-    """
-    Validate an availability.
+    if application is None:
+        logging.info(f'{requester_ip} - No application for person: '
+                     f'{person_id}')
+        return (jsonify({'error': 'APPLICATION_NOT_FOUND'}),
+                StatusCodes.NOT_FOUND)
+
+    return jsonify(application), StatusCodes.OK
 
-    This function validates a single availability of an application. It checks
-    if the availability is a dictionary and if it contains the required keys.
-    It also checks if the dates are valid and if the date range is valid.
+
+def __spool_submitted_application(
+        person_id: int, competences: list[CompetenceRecord],
+        availabilities: list[AvailabilityRecord],
+        idempotency_key: Optional[str]) -> tuple[Response, int]:
+    """
+    Spool a validated application to be stored in the background.
 
     :param person_id: The ID of the person submitting the application.
-    :param availability: A dictionary representing an availability of the
-                         application.
-    :returns: An Availability object representing the validated availability.
-    :raises TypeError: If the availability is not a dictionary.
-    :raises KeyError: If a required key is missing from the availability.
-    :raises ValueError: If a value in the availability is invalid.
+    :param competences: The validated competences.
+    :param availabilities: The validated availabilities.
+    :param idempotency_key: The Idempotency-Key of the request, if any.
+    :returns: A tuple containing a Response object and an HTTP status code.
+    :raises SQLAlchemyError: If the application could not be spooled.
     """
 
-    if not isinstance(availability, dict):
-        raise TypeError({'error': 'INVALID_AVAILABILITY'})
+    requester_ip = request.remote_addr
 
-    if 'from_date' not in availability:
-        raise KeyError({'error': 'MISSING_FROM_DATE'})
+    tracking_id = spool_application(person_id, competences, availabilities)
+    if tracking_id is None:
+        stored_response = (None if idempotency_key is None else
+                           find_idempotent_response(person_id,
+                                                    idempotency_key))
+        if stored_response is not None:
+            return __replay_response(*stored_response)
+        logging.warning(f'{requester_ip} - Person already applied: '
+                        f'{person_id}')
+        return (jsonify({'error': 'ALREADY_APPLIED_BEFORE'}),
+                StatusCodes.CONFLICT)
 
-    if 'to_date' not in availability:
-        raise KeyError({'error': 'MISSING_TO_DATE'})
+    body = {'tracking_id': tracking_id, 'status': 'Queued'}
+    if idempotency_key is not None:
+        save_idempotent_response(person_id, idempotency_key,
+                                 StatusCodes.ACCEPTED, body)
 
-    try:
-        from_date = datetime.strptime(
-                availability['from_date'], '%Y-%m-%d')
-        to_date = datetime.strptime(
-                availability['to_date'], '%Y-%m-%d')
-    except ValueError:
-        raise ValueError({'error': 'INVALID_DATE_FORMAT'})
+    logging.info(f'{requester_ip} - Application spooled for person: '
+                 f'{person_id}')
+    return jsonify(body), StatusCodes.ACCEPTED
 
-    if from_date > to_date:
-        raise ValueError({'error': 'INVALID_DATE_RANGE'})
 
-    return Availability(person_id, from_date, to_date)
+def __replay_response(body: str, status_code: int) -> tuple[Response, int]:
+    """
+    Create a response from a stored response.
+
+    :param body: The stored JSON body.
+    :param status_code: The stored HTTP status code.
+    :returns: A tuple containing a Response object and an HTTP status code.
+    """
+
+    response = current_app.response_class(body, mimetype='application/json')
+    response.headers['Idempotent-Replayed'] = 'true'
+    return response, status_code
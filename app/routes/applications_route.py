@@ -0,0 +1,398 @@
+import logging
+import re
+from datetime import date
+from decimal import Decimal
+from itertools import chain
+from typing import Optional
+
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from flask_jwt_extended import get_jwt, jwt_required
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.services.application_service import fetch_applications, \
+    search_qualified_persons
+from app.services.availability_service import availability_bitmaps, \
+    search_available_persons
+from app.services.export_service import EXPORT_MIMETYPES, \
+    export_applications
+from app.services.ranking_service import rank_applicants
+from app.services.statistics_service import fetch_application_statistics
+from app.services.validation_service import validate_job_profile
+from app.utilities.status_codes import StatusCodes
+
+applications_bp = Blueprint('applications', __name__)
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+MAX_COMPETENCE_REQUIREMENTS = 20
+MAX_ID = 2 ** 63 - 1
+
+_COMPETENCE_REQUIREMENT_PATTERN = re.compile(r'(\d+):(\d{1,2}(\.\d{1,2})?)')
+
+
+@applications_bp.route('/', methods=['GET'])
+@jwt_required()
+def list_applications() -> tuple[Response, int]:
+    """
+    List the submitted applications.
+
+    This function returns one page of applications ordered by person ID.
+    The page starts after the person ID given by the 'after' query
+    parameter, which is the 'next_after' of the previous page, and holds at
+    most 'limit' applications. Only recruiters may list applications.
+
+    :returns: A tuple containing a Response object and an HTTP status code.
+    """
+
+    person_id = get_jwt()['id']
+    requester_ip = request.remote_addr
+
+    role = get_jwt()['role']
+    if role != 1:
+        logging.warning(f'{requester_ip} - Unauthorized person: {person_id}')
+        return (jsonify({'error': 'UNAUTHORIZED_ROLE'}),
+                StatusCodes.UNAUTHORIZED)
+
+    page_arguments = __parse_page_arguments()
+    if page_arguments is None:
+        logging.warning(f'{requester_ip} - Invalid pagination: '
+                        f'{request.query_string.decode()}')
+        return (jsonify({'error': 'INVALID_PAGINATION'}),
+                StatusCodes.BAD_REQUEST)
+
+    try:
+        page = fetch_applications(*page_arguments)
+    except SQLAlchemyError as exception:
+        logging.error(f'{requester_ip} - {exception.args[0]}')
+        return jsonify(exception.args[0]), StatusCodes.INTERNAL_SERVER_ERROR
+
+    logging.info(f'{requester_ip} - Listed {len(page["applications"])} '
+                 f'applications for person: {person_id}')
+    return jsonify(page), StatusCodes.OK
+
+
+@applications_bp.route('/export', methods=['GET'])
+@jwt_required()
+def export_all_applications() -> tuple[Response, int]:
+    """
+    Export all applications.
+
+    This function streams every application in the format given by the
+    'format' query parameter, 'ndjson' by default or 'csv', see
+    export_applications. The export is compressed with gzip if the client
+    accepts it. The first chunk is produced before responding, so that a
+    failure to read the applications is answered with an error. Only
+    recruiters may export applications.
+
+    :returns: A tuple containing a Response object and an HTTP status code.
+    """
+
+    person_id = get_jwt()['id']
+    requester_ip = request.remote_addr
+
+    role = get_jwt()['role']
+    if role != 1:
+        logging.warning(f'{requester_ip} - Unauthorized person: {person_id}')
+        return (jsonify({'error': 'UNAUTHORIZED_ROLE'}),
+                StatusCodes.UNAUTHORIZED)
+
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in EXPORT_MIMETYPES:
+        logging.warning(f'{requester_ip} - Invalid export format: '
+                        f'{export_format}')
+        return (jsonify({'error': 'INVALID_EXPORT_FORMAT'}),
+                StatusCodes.BAD_REQUEST)
+
+    compress = request.accept_encodings.best_match(
+            ('gzip', 'identity'), default='identity') == 'gzip'
+    chunks = export_applications(export_format, compress)
+    try:
+        first_chunk = next(chunks, b'')
+    except SQLAlchemyError as exception:
+        logging.error(f'{requester_ip} - {exception.args[0]}')
+        return jsonify(exception.args[0]), StatusCodes.INTERNAL_SERVER_ERROR
+
+    response = Response(stream_with_context(chain((first_chunk,), chunks)),
+                        mimetype=EXPORT_MIMETYPES[export_format])
+    if compress:
+        response.content_encoding = 'gzip'
+    response.vary.add('Accept-Encoding')
+
+    logging.info(f'{requester_ip} - Exporting applications as '
+                 f'{export_format} for person: {person_id}')
+    return response, StatusCodes.OK
+
+
+@applications_bp.route('/available', methods=['GET'])
+@jwt_required()
+def search_available_applicants() -> tuple[Response, int]:
+    """
+    Search for the applicants who are available within a date range.
+
+    This function returns one page of the IDs of the persons with an
+    availability overlapping the range from the 'from_date' to the
+    'to_date' query parameters, both in the format YYYY-MM-DD. If the
+    'min_days' query parameter is given, only the persons available on at
+    least that many days of the range are returned, and with min_days equal
+    to the length of the range only those available on every day. The
+    pages are requested like those of list_applications. Only recruiters
+    may search applicants.
+
+    :returns: A tuple containing a Response object and an HTTP status code.
+    """
+
+    person_id = get_jwt()['id']
+    requester_ip = request.remote_addr
+
+    role = get_jwt()['role']
+    if role != 1:
+        logging.warning(f'{requester_ip} - Unauthorized person: {person_id}')
+        return (jsonify({'error': 'UNAUTHORIZED_ROLE'}),
+                StatusCodes.UNAUTHORIZED)
+
+    from_date = __parse_date_argument('from_date')
+    to_date = __parse_date_argument('to_date')
+    if from_date is None or to_date is None:
+        logging.warning(f'{requester_ip} - Invalid date format')
+        return (jsonify({'error': 'INVALID_DATE_FORMAT'}),
+                StatusCodes.BAD_REQUEST)
+    if from_date > to_date:
+        logging.warning(f'{requester_ip} - Invalid date range')
+        return (jsonify({'error': 'INVALID_DATE_RANGE'}),
+                StatusCodes.BAD_REQUEST)
+
+    min_days = request.args.get('min_days', '1')
+    if (not (min_days.isascii() and min_days.isdigit())
+            or not 1 <= int(min_days) <= (to_date - from_date).days + 1):
+        logging.warning(f'{requester_ip} - Invalid minimum days: '
+                        f'{min_days}')
+        return (jsonify({'error': 'INVALID_MIN_DAYS'}),
+                StatusCodes.BAD_REQUEST)
+    if int(min_days) > 1 and not (availability_bitmaps.epoch <= from_date
+                                  and to_date <= availability_bitmaps
+                                  .last_day):
+        logging.warning(f'{requester_ip} - Date range outside of bitmaps')
+        return (jsonify({'error': 'INVALID_DATE_RANGE'}),
+                StatusCodes.BAD_REQUEST)
+
+    page_arguments = __parse_page_arguments()
+    if page_arguments is None:
+        logging.warning(f'{requester_ip} - Invalid pagination: '
+                        f'{request.query_string.decode()}')
+        return (jsonify({'error': 'INVALID_PAGINATION'}),
+                StatusCodes.BAD_REQUEST)
+
+    try:
+        page = search_available_persons(from_date, to_date, *page_arguments,
+                                        int(min_days))
+    except SQLAlchemyError as exception:
+        logging.error(f'{requester_ip} - {exception.args[0]}')
+        return jsonify(exception.args[0]), StatusCodes.INTERNAL_SERVER_ERROR
+
+    logging.info(f'{requester_ip} - Found {len(page["person_ids"])} '
+                 f'available applicants for person: {person_id}')
+    return jsonify(page), StatusCodes.OK
+
+
+@applications_bp.route('/qualified', methods=['GET'])
+@jwt_required()
+def search_qualified_applicants() -> tuple[Response, int]:
+    """
+    Search for the applicants who have a set of competences.
+
+    This function returns one page of the IDs of the persons who have every
+    competence given by a 'competence' query parameter with at least the
+    years of experience given with it, in the format
+    competence=<competence_id>:<years_of_experience>. The parameter may be
+    repeated up to MAX_COMPETENCE_REQUIREMENTS times. The pages are
+    requested like those of list_applications. Only recruiters may search
+    applicants.
+
+    :returns: A tuple containing a Response object and an HTTP status code.
+    """
+
+    person_id = get_jwt()['id']
+    requester_ip = request.remote_addr
+
+    role = get_jwt()['role']
+    if role != 1:
+        logging.warning(f'{requester_ip} - Unauthorized person: {person_id}')
+        return (jsonify({'error': 'UNAUTHORIZED_ROLE'}),
+                StatusCodes.UNAUTHORIZED)
+
+    requirements = __parse_competence_arguments()
+    if requirements is None:
+        logging.warning(f'{requester_ip} - Invalid competence requirements: '
+                        f'{request.query_string.decode()}')
+        return (jsonify({'error': 'INVALID_COMPETENCE_REQUIREMENT'}),
+                StatusCodes.BAD_REQUEST)
+
+    page_arguments = __parse_page_arguments()
+    if page_arguments is None:
+        logging.warning(f'{requester_ip} - Invalid pagination: '
+                        f'{request.query_string.decode()}')
+        return (jsonify({'error': 'INVALID_PAGINATION'}),
+                StatusCodes.BAD_REQUEST)
+
+    try:
+        page = search_qualified_persons(requirements, *page_arguments)
+    except SQLAlchemyError as exception:
+        logging.error(f'{requester_ip} - {exception.args[0]}')
+        return jsonify(exception.args[0]), StatusCodes.INTERNAL_SERVER_ERROR
+
+    logging.info(f'{requester_ip} - Found {len(page["person_ids"])} '
+                 f'qualified applicants for person: {person_id}')
+    return jsonify(page), StatusCodes.OK
+
+
+@applications_bp.route('/rank', methods=['POST'])
+@jwt_required()
+def rank_applicants_for_job() -> tuple[Response, int]:
+    """
+    Rank the applicants against a job profile.
+
+    This function returns the best applicants for the job profile in the
+    JSON payload, see validate_job_profile, as ranked by rank_applicants.
+    The number of applicants is given by the 'limit' query parameter,
+    between 1 and MAX_PAGE_SIZE and DEFAULT_PAGE_SIZE if absent. Only
+    recruiters may rank applicants.
+
+    :returns: A tuple containing a Response object and an HTTP status code.
+    """
+
+    person_id = get_jwt()['id']
+    requester_ip = request.remote_addr
+
+    role = get_jwt()['role']
+    if role != 1:
+        logging.warning(f'{requester_ip} - Unauthorized person: {person_id}')
+        return (jsonify({'error': 'UNAUTHORIZED_ROLE'}),
+                StatusCodes.UNAUTHORIZED)
+
+    if (not request or request.content_type != 'application/json'
+            or not request.json):
+        logging.warning(f'{requester_ip} - Invalid JSON payload')
+        return (jsonify({'error': 'INVALID_JSON_PAYLOAD'}),
+                StatusCodes.BAD_REQUEST)
+
+    page_arguments = __parse_page_arguments()
+    if page_arguments is None or 'after' in request.args:
+        logging.warning(f'{requester_ip} - Invalid pagination: '
+                        f'{request.query_string.decode()}')
+        return (jsonify({'error': 'INVALID_PAGINATION'}),
+                StatusCodes.BAD_REQUEST)
+
+    try:
+        profile, errors = validate_job_profile(person_id, request.json)
+        if profile is None:
+            logging.warning(f'{requester_ip} - {errors}')
+            return (jsonify({'error': errors[0]['error'], 'errors': errors}),
+                    StatusCodes.BAD_REQUEST)
+
+        ranking = rank_applicants(profile, page_arguments[1])
+    except SQLAlchemyError as exception:
+        logging.error(f'{requester_ip} - {exception.args[0]}')
+        return jsonify(exception.args[0]), StatusCodes.INTERNAL_SERVER_ERROR
+
+    logging.info(f'{requester_ip} - Ranked {len(ranking["applicants"])} '
+                 f'applicants for person: {person_id}')
+    return jsonify(ranking), StatusCodes.OK
+
+
+@applications_bp.route('/statistics', methods=['GET'])
+@jwt_required()
+def get_application_statistics() -> tuple[Response, int]:
+    """
+    Get the aggregate statistics of the applications.
+
+    This function returns the number of applications by status and the
+    number of applicants by competence and years of experience, see
+    fetch_application_statistics. Only recruiters may get the statistics.
+
+    :returns: A tuple containing a Response object and an HTTP status code.
+    """
+
+    person_id = get_jwt()['id']
+    requester_ip = request.remote_addr
+
+    role = get_jwt()['role']
+    if role != 1:
+        logging.warning(f'{requester_ip} - Unauthorized person: {person_id}')
+        return (jsonify({'error': 'UNAUTHORIZED_ROLE'}),
+                StatusCodes.UNAUTHORIZED)
+
+    try:
+        statistics = fetch_application_statistics()
+    except SQLAlchemyError as exception:
+        logging.error(f'{requester_ip} - {exception.args[0]}')
+        return jsonify(exception.args[0]), StatusCodes.INTERNAL_SERVER_ERROR
+
+    logging.info(f'{requester_ip} - Application statistics fetched for '
+                 f'person: {person_id}')
+    return jsonify(statistics), StatusCodes.OK
+
+
+def __parse_competence_arguments() -> Optional[dict[int, Decimal]]:
+    """
+    Parse the competence requirement query parameters.
+
+    The years of experience are parsed as Decimals, since the column they
+    are compared with holds two decimals.
+
+    :returns: The minimum years of experience keyed by competence ID, or None
+              if no requirement is given, too many are given, a competence is
+              repeated or any is invalid or has an ID above MAX_ID.
+    """
+
+    values = request.args.getlist('competence')
+    if not 1 <= len(values) <= MAX_COMPETENCE_REQUIREMENTS:
+        return None
+
+    requirements = {}
+    for value in values:
+        match = _COMPETENCE_REQUIREMENT_PATTERN.fullmatch(value)
+        if match is None or not value.isascii():
+            return None
+        competence_id = int(match.group(1))
+        if competence_id > MAX_ID or competence_id in requirements:
+            return None
+        requirements[competence_id] = Decimal(match.group(2))
+    return requirements
+
+
+def __parse_date_argument(name: str) -> Optional[date]:
+    """
+    Parse a date query parameter in the format YYYY-MM-DD.
+
+    :param name: The name of the query parameter.
+    :returns: The date, or None if the parameter is missing or invalid.
+    """
+
+    value = request.args.get(name, '')
+    if (len(value) != 10 or not value.isascii()
+            or value[4] != '-' or value[7] != '-'):
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def __parse_page_arguments() -> Optional[tuple[int, int]]:
+    """
+    Parse the pagination query parameters.
+
+    :returns: The 'after' person ID, between 0 and MAX_ID and 0 if absent,
+              and the 'limit', between 1 and MAX_PAGE_SIZE and
+              DEFAULT_PAGE_SIZE if absent, or None if either is invalid.
+    """
+
+    after = request.args.get('after', '0')
+    limit = request.args.get('limit', str(DEFAULT_PAGE_SIZE))
+    if not (after.isascii() and after.isdigit()
+            and limit.isascii() and limit.isdigit()):
+        return None
+
+    if int(after) > MAX_ID or not 1 <= int(limit) <= MAX_PAGE_SIZE:
+        return None
+    return int(after), int(limit)
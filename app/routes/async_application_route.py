@@ -0,0 +1,233 @@
+import logging
+from typing import Any, Awaitable, Callable, Optional
+
+from sqlalchemy.exc import NoResultFound, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+from app.services.async_application_service import \
+    fetch_application_async, fetch_application_status_async, \
+    find_idempotent_response_async, store_application_async
+from app.services.idempotency_service import valid_idempotency_key
+from app.services.validation_service import validate_application
+from app.utilities.asgi import DefaultJSONResponse, jwt_required_async
+from app.utilities.status_codes import StatusCodes
+
+
+@jwt_required_async
+async def add_submitted_application(request: Request) -> Response:
+    """
+    Add a submitted application.
+
+    This function is the asynchronous counterpart of the POST endpoint of
+    the Flask application and answers with the same responses, including
+    replayed responses for requests with an Idempotency-Key header. The
+    application is always stored before it is answered, since the
+    submission spool and the applied person filter belong to the Flask
+    workers.
+
+    :param request: The incoming request.
+    :returns: The response.
+    """
+
+    person_id = request.state.jwt['id']
+    requester_ip = request.client.host if request.client else None
+
+    role = request.state.jwt['role']
+    if role != 2:
+        logging.warning(f'{requester_ip} - Unauthorized person: {person_id}')
+        return DefaultJSONResponse({'error': 'UNAUTHORIZED_ROLE'},
+                                   StatusCodes.UNAUTHORIZED)
+
+    config = request.app.state.config
+    idempotency_key = request.headers.get('Idempotency-Key')
+
+    async with request.app.state.sessions() as session:
+        if idempotency_key is not None:
+            if not valid_idempotency_key(idempotency_key):
+                logging.warning(f'{requester_ip} - Invalid idempotency key')
+                return DefaultJSONResponse(
+                        {'error': 'INVALID_IDEMPOTENCY_KEY'},
+                        StatusCodes.BAD_REQUEST)
+            try:
+                stored_response = await find_idempotent_response_async(
+                        session, config, person_id, idempotency_key)
+            except SQLAlchemyError as exception:
+                logging.error(f'{requester_ip} - {exception.args[0]}')
+                return DefaultJSONResponse(
+                        exception.args[0], StatusCodes.INTERNAL_SERVER_ERROR)
+            if stored_response is not None:
+                logging.info(f'{requester_ip} - Replayed response for '
+                             f'person: {person_id}')
+                return __replay_response(*stored_response)
+
+        payload = await __read_json(request)
+        if not payload:
+            logging.warning(f'{requester_ip} - Invalid JSON payload')
+            return DefaultJSONResponse({'error': 'INVALID_JSON_PAYLOAD'},
+                                       StatusCodes.BAD_REQUEST)
+
+        try:
+            validation = validate_application(
+                    person_id, payload,
+                    await __fetch_valid_competences(request, payload),
+                    config.get('MAX_AVAILABILITIES', 100))
+            if validation.errors:
+                logging.warning(f'{requester_ip} - {validation.errors}')
+                return DefaultJSONResponse(
+                        {'error': validation.errors[0]['error'],
+                         'errors': validation.errors},
+                        StatusCodes.BAD_REQUEST)
+
+            application = await store_application_async(
+                    session, config, person_id, validation.competences,
+                    validation.availabilities, idempotency_key)
+
+            stored_response = None
+            if application is None and idempotency_key is not None:
+                stored_response = await find_idempotent_response_async(
+                        session, config, person_id, idempotency_key)
+
+        except SQLAlchemyError as exception:
+            logging.error(f'{requester_ip} - {exception.args[0]}')
+            return DefaultJSONResponse(exception.args[0],
+                                       StatusCodes.INTERNAL_SERVER_ERROR)
+
+    if stored_response is not None:
+        logging.info(f'{requester_ip} - Replayed response for person: '
+                     f'{person_id}')
+        return __replay_response(*stored_response)
+
+    if application is None:
+        logging.warning(f'{requester_ip} - Person already applied: '
+                        f'{person_id}')
+        return DefaultJSONResponse({'error': 'ALREADY_APPLIED_BEFORE'},
+                                   StatusCodes.CONFLICT)
+
+    logging.info(f'{requester_ip} - Application submitted for person: '
+                 f'{person_id}')
+    return DefaultJSONResponse(application, StatusCodes.CREATED)
+
+
+@jwt_required_async
+async def get_submitted_application(request: Request) -> Response:
+    """
+    Get the submitted application of the requesting person.
+
+    :param request: The incoming request.
+    :returns: The response.
+    """
+
+    return await __get_own_application(request, fetch_application_async)
+
+
+@jwt_required_async
+async def get_submitted_application_status(request: Request) -> Response:
+    """
+    Get the status of the submitted application of the requesting person.
+
+    :param request: The incoming request.
+    :returns: The response.
+    """
+
+    return await __get_own_application(request,
+                                       fetch_application_status_async)
+
+
+async def __get_own_application(
+        request: Request,
+        fetch: Callable[[AsyncSession, int], Awaitable[Optional[dict]]]
+) -> Response:
+    """
+    Get the application of the requesting applicant.
+
+    :param request: The incoming request.
+    :param fetch: The coroutine function fetching the application by
+           person ID.
+    :returns: The response.
+    """
+
+    person_id = request.state.jwt['id']
+    requester_ip = request.client.host if request.client else None
+
+    role = request.state.jwt['role']
+    if role != 2:
+        logging.warning(f'{requester_ip} - Unauthorized person: {person_id}')
+        return DefaultJSONResponse({'error': 'UNAUTHORIZED_ROLE'},
+                                   StatusCodes.UNAUTHORIZED)
+
+    try:
+        async with request.app.state.sessions() as session:
+            application = await fetch(session, person_id)
+    except SQLAlchemyError as exception:
+        logging.error(f'{requester_ip} - {exception.args[0]}')
+        return DefaultJSONResponse(exception.args[0],
+                                   StatusCodes.INTERNAL_SERVER_ERROR)
+
+    if application is None:
+        logging.info(f'{requester_ip} - No application for person: '
+                     f'{person_id}')
+        return DefaultJSONResponse({'error': 'APPLICATION_NOT_FOUND'},
+                                   StatusCodes.NOT_FOUND)
+
+    return DefaultJSONResponse(application, StatusCodes.OK)
+
+
+async def __read_json(request: Request) -> Any:
+    """
+    Read the JSON payload of a request.
+
+    :param request: The incoming request.
+    :returns: The decoded payload, or None if the request has no valid JSON
+              payload.
+    """
+
+    if request.headers.get('Content-Type') != 'application/json':
+        return None
+    try:
+        return await request.json()
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+async def __fetch_valid_competences(request: Request, payload: Any) -> dict:
+    """
+    Fetch the valid competences if the payload contains competences.
+
+    :param request: The incoming request.
+    :param payload: The submitted application.
+    :returns: The valid competences keyed by competence ID.
+    :raises SQLAlchemyError: If the competence catalog could not be fetched.
+    """
+
+    if not isinstance(payload, dict) or not payload.get('competences'):
+        return {}
+    try:
+        catalog = await request.app.state.competence_catalog.get()
+    except NoResultFound:
+        return {}
+    except SQLAlchemyError:
+        raise SQLAlchemyError({'error': 'DATABASE_ERROR'})
+    return catalog.index
+
+
+def __replay_response(body: str, status_code: int) -> Response:
+    """
+    Create a response from a stored response.
+
+    :param body: The stored JSON body.
+    :param status_code: The stored HTTP status code.
+    :returns: The response.
+    """
+
+    return Response(body, status_code, {'Idempotent-Replayed': 'true'},
+                    media_type='application/json')
+
+
+application_submission_routes = [
+    Route('/', add_submitted_application, methods=['POST']),
+    Route('/', get_submitted_application, methods=['GET']),
+    Route('/status', get_submitted_application_status, methods=['GET'])
+]
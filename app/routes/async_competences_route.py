@@ -0,0 +1,64 @@
+import logging
+
+from sqlalchemy.exc import NoResultFound, SQLAlchemyError
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+from werkzeug.http import parse_accept_header, parse_etags
+
+from app.utilities.asgi import DefaultJSONResponse, jwt_required_async
+from app.utilities.status_codes import StatusCodes
+
+
+@jwt_required_async
+async def get_competences(request: Request) -> Response:
+    """
+    Gets the selectable competences.
+
+    This function is the asynchronous counterpart of the competences
+    endpoint of the Flask application. It responds with the pre-rendered
+    body of the competence catalog of the event loop, negotiated and
+    revalidated in the same way.
+
+    :param request: The incoming request.
+    :returns: The response.
+    """
+
+    requester_ip = request.client.host if request.client else None
+
+    try:
+        catalog = await request.app.state.competence_catalog.get()
+    except NoResultFound:
+        logging.error(f'{requester_ip} - No competences found.')
+        return DefaultJSONResponse({'error': 'COMPETENCES_NOT_FOUND'},
+                                   StatusCodes.NOT_FOUND)
+    except SQLAlchemyError:
+        logging.error(f'{requester_ip} - Could not fetch competences.')
+        return DefaultJSONResponse({'error': 'COULD_NOT_FETCH_COMPETENCES'},
+                                   StatusCodes.INTERNAL_SERVER_ERROR)
+
+    encoding = parse_accept_header(
+            request.headers.get('Accept-Encoding')).best_match(
+            catalog.bodies, default='identity')
+    etag = (catalog.etag if encoding == 'identity'
+            else f'{catalog.etag}-{encoding}')
+
+    max_age = request.app.state.config.get('COMPETENCE_CACHE_MAX_AGE', 300)
+    headers = {'ETag': f'"{etag}"',
+               'Cache-Control': f'private, max-age={max_age}',
+               'Vary': 'Accept-Encoding'}
+
+    if parse_etags(request.headers.get('If-None-Match')).contains(etag):
+        logging.info(f'{requester_ip} - Competences not modified.')
+        return Response(status_code=StatusCodes.NOT_MODIFIED,
+                        headers=headers)
+
+    if encoding != 'identity':
+        headers['Content-Encoding'] = encoding
+
+    logging.info(f'{requester_ip} - Responded with competences.')
+    return Response(catalog.bodies[encoding], StatusCodes.OK, headers,
+                    media_type='application/json')
+
+
+competences_routes = [Route('/', get_competences, methods=['GET'])]
@@ -1,10 +1,10 @@
 import logging
 
-from flask import Blueprint, Response, request, jsonify
+from flask import Blueprint, Response, current_app, request, jsonify
 from flask_jwt_extended import jwt_required
 from sqlalchemy.exc import NoResultFound, SQLAlchemyError
 
-from app.services.competences_service import fetch_competences
+from app.services.competences_service import fetch_competence_catalog
 from app.utilities.status_codes import StatusCodes
 
 competences_bp = Blueprint('competences', __name__)
@@ -16,9 +16,13 @@ def get_competences() -> tuple[Response, int]:
     """
     Gets the selectable competences.
 
-    This function retrieves the selectable competences from the database. If
-    the competences are not found, it returns a 404 error. If there is an issue
-    with the database operation, it returns a 500 error.
+    This function retrieves the selectable competences from the in-memory
+    catalog and responds with its pre-rendered body, compressed with the best
+    content coding the client accepts. The response carries an entity tag of
+    the catalog, and a request whose If-None-Match header matches it is
+    answered with a 304 without a body. If the competences are not found, it
+    returns a 404 error. If there is an issue with the database operation, it
+    returns a 500 error.
 
     :returns: A tuple containing the response and the status code.
     :raises NoResultFound: If no competences are found in the database.
@@ -28,9 +32,7 @@ def get_competences() -> tuple[Response, int]:
     requester_ip = request.remote_addr
 
     try:
-        competences = fetch_competences()
-        logging.info(f'{requester_ip} - Responded with competences.')
-        return jsonify(competences), StatusCodes.OK
+        catalog = fetch_competence_catalog()
     except NoResultFound:
         logging.error(f'{requester_ip} - No competences found.')
         return jsonify(
@@ -39,3 +41,37 @@ def get_competences() -> tuple[Response, int]:
         logging.error(f'{requester_ip} - Could not fetch competences.')
         return (jsonify({'error': 'COULD_NOT_FETCH_COMPETENCES'}),
                 StatusCodes.INTERNAL_SERVER_ERROR)
+
+    encoding = request.accept_encodings.best_match(
+            catalog.bodies, default='identity')
+    etag = (catalog.etag if encoding == 'identity'
+            else f'{catalog.etag}-{encoding}')
+
+    if request.if_none_match.contains(etag):
+        logging.info(f'{requester_ip} - Competences not modified.')
+        return (__with_cache_headers(Response(), etag),
+                StatusCodes.NOT_MODIFIED)
+
+    response = Response(catalog.bodies[encoding], mimetype='application/json')
+    if encoding != 'identity':
+        response.content_encoding = encoding
+
+    logging.info(f'{requester_ip} - Responded with competences.')
+    return __with_cache_headers(response, etag), StatusCodes.OK
+
+
+def __with_cache_headers(response: Response, etag: str) -> Response:
+    """
+    Add caching headers to a competences response.
+
+    :param response: The response to add the headers to.
+    :param etag: The entity tag of the served representation.
+    :returns: The response with ETag, Cache-Control and Vary headers set.
+    """
+
+    response.set_etag(etag)
+    response.cache_control.private = True
+    response.cache_control.max_age = current_app.config.get(
+            'COMPETENCE_CACHE_MAX_AGE', 300)
+    response.vary.add('Accept-Encoding')
+    return response
@@ -0,0 +1,47 @@
+import logging
+
+from flask import Blueprint, Response, current_app, jsonify, request
+from flask_jwt_extended import get_jwt, jwt_required
+
+from app.services.import_service import import_applications
+from app.utilities.status_codes import StatusCodes
+
+application_import_bp = Blueprint('application_import', __name__)
+
+
+@application_import_bp.route('/', methods=['POST'])
+@jwt_required()
+def import_submitted_applications() -> tuple[Response, int]:
+    """
+    Import applications in bulk.
+
+    This function imports applications sent as NDJSON, one application per
+    line with the ID of the person it belongs to. The request body is read
+    line by line as it arrives, and the applications are committed in chunks
+    of IMPORT_CHUNK_SIZE. Only recruiters may import applications.
+
+    :returns: A tuple containing a Response object with the import report
+              and an HTTP status code.
+    """
+
+    person_id = get_jwt()['id']
+    requester_ip = request.remote_addr
+
+    role = get_jwt()['role']
+    if role != 1:
+        logging.warning(f'{requester_ip} - Unauthorized person: {person_id}')
+        return (jsonify({'error': 'UNAUTHORIZED_ROLE'}),
+                StatusCodes.UNAUTHORIZED)
+
+    if request.mimetype != 'application/x-ndjson':
+        logging.warning(f'{requester_ip} - Invalid NDJSON payload')
+        return (jsonify({'error': 'INVALID_NDJSON_PAYLOAD'}),
+                StatusCodes.BAD_REQUEST)
+
+    report = import_applications(
+            request.stream, current_app.config.get('IMPORT_CHUNK_SIZE', 1000))
+
+    logging.info(f'{requester_ip} - Imported {report["imported"]} '
+                 f'applications, {report["failed"]} failed, by person: '
+                 f'{person_id}')
+    return jsonify(report), StatusCodes.OK
@@ -0,0 +1,35 @@
+import logging
+
+from flask import Blueprint, Response, jsonify, request
+from flask_jwt_extended import get_jwt, jwt_required
+
+from app.services.pool_metrics_service import fetch_pool_metrics
+from app.utilities.status_codes import StatusCodes
+
+metrics_bp = Blueprint('metrics', __name__)
+
+
+@metrics_bp.route('/pool', methods=['GET'])
+@jwt_required()
+def get_pool_metrics() -> tuple[Response, int]:
+    """
+    Get the metrics of the database connection pool of this worker.
+
+    This function returns the live state of the pool and the counters of
+    its events, including the histogram of the time checkouts waited for a
+    connection, see fetch_pool_metrics. Only recruiters may get the
+    metrics.
+
+    :returns: A tuple containing a Response object and an HTTP status code.
+    """
+
+    person_id = get_jwt()['id']
+    requester_ip = request.remote_addr
+
+    role = get_jwt()['role']
+    if role != 1:
+        logging.warning(f'{requester_ip} - Unauthorized person: {person_id}')
+        return (jsonify({'error': 'UNAUTHORIZED_ROLE'}),
+                StatusCodes.UNAUTHORIZED)
+
+    return jsonify(fetch_pool_metrics()), StatusCodes.OK
@@ -1,40 +1,276 @@
+import threading
+import time
+from collections import OrderedDict
+from decimal import Decimal
+from typing import Optional
+
+from flask import Flask, current_app
 from sqlalchemy.exc import SQLAlchemyError
 
 from app.models.application import ApplicationStatus
-from app.models.availability import Availability
-from app.models.competence_profile import CompetenceProfile
+from app.models.records import ApplicationRecord, AvailabilityRecord, \
+    CompetenceRecord
 from app.repositories.application_repository import \
-    get_application_status_from_db, insert_application_in_db
+    get_application_from_db, get_application_status_from_db, \
+    get_applications_page_from_db, get_qualified_person_ids_from_db, \
+    insert_application_in_db
+from app.services.applied_person_service import applied_persons
+from app.services.availability_service import availability_bitmaps, \
+    availability_index
+from app.services.group_commit_service import group_committer
+from app.services.idempotency_service import create_idempotency_key
+from app.services.ranking_service import applicant_ranking
+from app.utilities.status_codes import StatusCodes
+
+
+class ApplicationCache:
+    """
+    Holds recently stored or read applications in memory for the current
+    worker.
+
+    The cache is written through by store_application and filled on reads,
+    and evicts the least recently used application once it holds max_size
+    applications. Since the status of an application may be changed by
+    other services, an application is only served from the cache for ttl
+    seconds after it was cached.
+
+    :ivar max_size: The maximum number of cached applications.
+    :ivar ttl: The number of seconds a cached application is served.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: float = 30) -> None:
+        """
+        Initializes a new ApplicationCache object.
+
+        :param max_size: The maximum number of cached applications.
+        :param ttl: The number of seconds a cached application is served.
+        """
+
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._applications: OrderedDict[int, tuple[float, dict]] = \
+            OrderedDict()
+
+    def init_app(self, app: Flask) -> None:
+        """
+        Configures the cache for a Flask application.
+
+        This function reads the size and time to live from the application
+        configuration and empties the cache.
+
+        :param app: The Flask application.
+        """
+
+        self.max_size = app.config.get('APPLICATION_CACHE_SIZE', 10000)
+        self.ttl = app.config.get('APPLICATION_CACHE_TTL', 30)
+        with self._lock:
+            self._applications.clear()
+        app.extensions['application_cache'] = self
+
+    def get(self, person_id: int) -> Optional[dict]:
+        """
+        Get a cached application.
+
+        :param person_id: The ID of the person the application belongs to.
+        :returns: The formatted application, or None if it is not cached or
+                  has expired.
+        """
+
+        with self._lock:
+            entry = self._applications.get(person_id)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._applications[person_id]
+                return None
+            self._applications.move_to_end(person_id)
+            return entry[1]
+
+    def put(self, person_id: int, application: dict) -> None:
+        """
+        Cache an application.
+
+        :param person_id: The ID of the person the application belongs to.
+        :param application: The formatted application.
+        """
+
+        if self.max_size <= 0:
+            return
+
+        with self._lock:
+            self._applications[person_id] = (time.monotonic() + self.ttl,
+                                             application)
+            self._applications.move_to_end(person_id)
+            while len(self._applications) > self.max_size:
+                self._applications.popitem(last=False)
+
+
+application_cache = ApplicationCache()
 
 
 def store_application(
-        person_id: int, competences: list[CompetenceProfile],
-        availabilities: list[Availability]) -> dict:
+        person_id: int, competences: list[CompetenceRecord],
+        availabilities: list[AvailabilityRecord],
+        idempotency_key: Optional[str] = None) -> Optional[dict]:
     """
     Store an application.
 
     This function stores an application in the database. It first creates an
     ApplicationStatus object, then tries to insert the application into the
-    database. If the insertion fails, it raises an SQLAlchemyError.
+    database. If the person has already applied, nothing is stored. If the
+    insertion fails, it raises an SQLAlchemyError. If SUBMISSION_GROUP_COMMIT
+    is enabled, the application is inserted in a transaction shared with
+    concurrent submissions instead of its own. If an idempotency key is given,
+    the formatted application is stored with it as the response to replay
+    for retries of the request, in the same transaction as the application.
+    The person is added to the applied person filter either way, and a
+    stored application to the application cache, the availability index and
+    bitmaps and the applicant ranking.
 
     :param person_id: The ID of the person submitting the application.
-    :param competences: A list of CompetenceProfile objects representing the
+    :param competences: A list of CompetenceRecord objects representing the
                         competences of the application.
-    :param availabilities: A list of Availability objects representing the
-                           availabilities of the application.
-    :returns: A dictionary representing the stored application.
+    :param availabilities: A list of AvailabilityRecord objects representing
+                           the availabilities of the application.
+    :param idempotency_key: The Idempotency-Key of the request, if any.
+    :returns: A dictionary representing the stored application, or None if
+              the person has already applied.
     :raises SQLAlchemyError: If there is an issue with the database operation.
     """
 
     application_status = ApplicationStatus(person_id)
+    application = __format_application(application_status, competences,
+                                       availabilities)
+    try:
+        stored_response = (None if idempotency_key is None else
+                           create_idempotency_key(
+                                   person_id, idempotency_key,
+                                   StatusCodes.CREATED, application))
+        if current_app.config.get('SUBMISSION_GROUP_COMMIT'):
+            inserted = group_committer.submit(
+                    ApplicationRecord(person_id, competences,
+                                      availabilities), stored_response)
+        else:
+            inserted = insert_application_in_db(
+                    competences, availabilities, application_status,
+                    stored_response)
+    except SQLAlchemyError:
+        raise SQLAlchemyError({'error': 'DATABASE_ERROR'})
+
+    applied_persons.add(person_id)
+    if not inserted:
+        return None
+
+    application_cache.put(person_id, application)
+    availability_index.add(availabilities)
+    availability_bitmaps.add(availabilities)
+    applicant_ranking.add(
+            [ApplicationRecord(person_id, competences, availabilities)])
+    return application
+
+
+def fetch_application(person_id: int) -> Optional[dict]:
+    """
+    Fetch the application of a person.
+
+    This function serves the application from the application cache, or
+    reads it from the database with a single query and caches it.
+
+    :param person_id: The ID of the person the application belongs to.
+    :returns: A dictionary representing the application, in the same format
+              as returned by store_application, or None if the person has not
+              applied.
+    :raises SQLAlchemyError: If there is an issue with the database operation.
+    """
+
+    application = application_cache.get(person_id)
+    if application is not None:
+        return application
+
     try:
-        insert_application_in_db(
-                competences, availabilities, application_status)
+        stored = get_application_from_db(person_id)
     except SQLAlchemyError:
         raise SQLAlchemyError({'error': 'DATABASE_ERROR'})
+    if stored is None:
+        return None
 
-    return __format_application(application_status, competences,
-                                availabilities)
+    application = __format_stored_application(*stored)
+    application_cache.put(person_id, application)
+    return application
+
+
+def fetch_application_status(person_id: int) -> Optional[dict]:
+    """
+    Fetch the status of the application of a person.
+
+    :param person_id: The ID of the person the application belongs to.
+    :returns: A dictionary representing the application status, in the
+              format of ApplicationStatus.to_dict, or None if the person has
+              not applied.
+    :raises SQLAlchemyError: If there is an issue with the database operation.
+    """
+
+    application = fetch_application(person_id)
+    if application is None:
+        return None
+    return {'status': application['status']}
+
+
+def fetch_applications(after: int, limit: int) -> dict:
+    """
+    Fetch a page of applications.
+
+    :param after: The person ID after which the page starts, 0 for the
+           first page.
+    :param limit: The maximum number of applications in the page.
+    :returns: A dictionary with the 'applications' of the page, each in the
+              format returned by store_application with the 'person_id' it
+              belongs to, and 'next_after', the person ID to pass as after
+              for the next page, or None if this is the last page.
+    :raises SQLAlchemyError: If there is an issue with the database operation.
+    """
+
+    try:
+        page = get_applications_page_from_db(after, limit)
+    except SQLAlchemyError:
+        raise SQLAlchemyError({'error': 'DATABASE_ERROR'})
+
+    return {
+        'applications': [{'person_id': record.person_id,
+                          **__format_stored_application(status, record)}
+                         for status, record in page],
+        'next_after': page[-1][1].person_id if len(page) == limit else None
+    }
+
+
+def search_qualified_persons(requirements: dict[int, Decimal], after: int,
+                             limit: int) -> dict:
+    """
+    Search for the persons who have every required competence with at least
+    the required years of experience.
+
+    :param requirements: The minimum years of experience keyed by the
+           required competence IDs.
+    :param after: The person ID after which the page starts, 0 for the
+           first page.
+    :param limit: The maximum number of person IDs in the page.
+    :returns: A dictionary with the 'person_ids' of the page in ascending
+              order and 'next_after', the person ID to pass as after for the
+              next page, or None if this is the last page.
+    :raises SQLAlchemyError: If there is an issue with the database operation.
+    """
+
+    try:
+        person_ids = get_qualified_person_ids_from_db(
+                requirements, after, limit)
+    except SQLAlchemyError:
+        raise SQLAlchemyError({'error': 'DATABASE_ERROR'})
+
+    return {
+        'person_ids': person_ids,
+        'next_after': person_ids[-1] if len(person_ids) == limit else None
+    }
 
 
 def already_applied(person_id: int):
@@ -43,22 +279,28 @@ def already_applied(person_id: int):
 
     This function checks if a person has already applied for a job by checking
     if there is an application status with the person's ID in the database.
+    Persons in the applied person filter have definitely applied, so the
+    database is only queried for the others.
 
     :param person_id: The ID of the person to check.
     :returns: True if the person has already applied, False otherwise.
     """
 
+    if person_id in applied_persons:
+        return True
+
     application_status = get_application_status_from_db(person_id)
 
     if application_status:
+        applied_persons.add(person_id)
         return True
 
     return False
 
 
 def __format_application(application_status: ApplicationStatus,
-                         competences: list[CompetenceProfile],
-                         availabilities: list[Availability]) -> dict:
+                         competences: list[CompetenceRecord],
+                         availabilities: list[AvailabilityRecord]) -> dict:
     """
     Format an application.
 
@@ -67,10 +309,10 @@ def __format_application(application_status: ApplicationStatus,
 
     :param application_status: An ApplicationStatus object representing the
                                status of the application.
-    :param competences: A list of CompetenceProfile objects representing the
+    :param competences: A list of CompetenceRecord objects representing the
                         competences of the application.
-    :param availabilities: A list of Availability objects representing the
-                           availabilities of the application.
+    :param availabilities: A list of AvailabilityRecord objects representing
+                           the availabilities of the application.
     :returns: A dictionary representing the formatted application.
     """
 
@@ -80,3 +322,20 @@ def __format_application(application_status: ApplicationStatus,
         'availabilities': [availability.to_dict() for availability in
                            availabilities]
     }
+
+
+def __format_stored_application(status: str,
+                                application: ApplicationRecord) -> dict:
+    """
+    Format an application read from the database.
+
+    :param status: The status of the application.
+    :param application: An ApplicationRecord holding the competences and
+                        availabilities of the application.
+    :returns: A dictionary representing the formatted application.
+    """
+
+    application_status = ApplicationStatus(application.person_id)
+    application_status.status = status
+    return __format_application(application_status, application.competences,
+                                application.availabilities)
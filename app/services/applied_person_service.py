@@ -0,0 +1,159 @@
+import heapq
+import logging
+import threading
+from array import array
+from bisect import bisect_left
+from typing import Iterable
+
+from flask import Flask
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.repositories.application_repository import \
+    get_applied_person_ids_from_db
+
+
+class AppliedPersonFilter:
+    """
+    Holds the IDs of the persons known to have applied in the current worker.
+
+    The IDs loaded when the worker starts are kept in a sorted array of
+    64-bit integers, searched with a binary search, which takes 8 bytes per
+    person instead of the roughly 60 bytes per entry of a set of ints. Persons
+    who apply afterwards are added to a small set, which is merged into the
+    array once it holds merge_threshold IDs.
+
+    Since applications are never removed, a person in the filter has
+    definitely applied. A person not in the filter may still have applied
+    through another worker, so a negative answer must be confirmed by the
+    database.
+
+    :ivar merge_threshold: The number of recently added IDs that triggers a
+          merge into the sorted array.
+    """
+
+    def __init__(self, merge_threshold: int = 4096) -> None:
+        """
+        Initializes a new AppliedPersonFilter object.
+
+        :param merge_threshold: The number of recently added IDs that
+               triggers a merge into the sorted array.
+        """
+
+        self.merge_threshold = merge_threshold
+        self._person_ids = array('q')
+        self._recent: set[int] = set()
+        self._lock = threading.Lock()
+
+    def init_app(self, app: Flask) -> None:
+        """
+        Configures the filter for a Flask application.
+
+        This function empties the filter and, if APPLIED_PERSON_FILTER is
+        enabled in the application configuration, warms it with the persons
+        who have applied. If the database cannot be read, the filter is left
+        empty, which only means that every lookup falls back to the database.
+
+        :param app: The Flask application.
+        """
+
+        self.load(())
+        app.extensions['applied_person_filter'] = self
+        if not app.config.get('APPLIED_PERSON_FILTER'):
+            return
+
+        with app.app_context():
+            try:
+                self.load(get_applied_person_ids_from_db())
+            except SQLAlchemyError:
+                logging.warning('Failed to warm the applied person filter')
+                return
+        logging.info(f'Warmed the applied person filter with {len(self)} '
+                     f'persons')
+
+    def load(self, person_ids: Iterable[int]) -> None:
+        """
+        Replace the content of the filter.
+
+        :param person_ids: The IDs of the persons who have applied, in
+               ascending order.
+        """
+
+        person_ids = array('q', person_ids)
+        with self._lock:
+            self._person_ids = person_ids
+            self._recent = set()
+
+    def add(self, person_id: int) -> None:
+        """
+        Add a person who has applied.
+
+        :param person_id: The ID of the person.
+        """
+
+        with self._lock:
+            self._recent.add(person_id)
+            if len(self._recent) >= self.merge_threshold:
+                self.__merge()
+
+    def __contains__(self, person_id: object) -> bool:
+        """
+        Check whether a person is known to have applied.
+
+        :param person_id: The ID of the person.
+        :returns: True if the person has definitely applied, False if it is
+                  unknown.
+        """
+
+        if person_id in self._recent:
+            return True
+        return type(person_id) is int and self.__search(
+                self._person_ids, person_id)
+
+    def __len__(self) -> int:
+        """
+        Get the number of persons in the filter.
+
+        :returns: The number of persons.
+        """
+
+        return len(self._person_ids) + len(self._recent)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        The approximate number of bytes used by the person IDs.
+        """
+
+        return (self._person_ids.itemsize * len(self._person_ids)
+                + 64 * len(self._recent))
+
+    def __merge(self) -> None:
+        """
+        Merge the recently added IDs into the sorted array.
+
+        The merged array replaces the previous one in a single assignment, so
+        concurrent lookups see either array in full. Must be called with the
+        lock held.
+        """
+
+        recent = sorted(person_id for person_id in self._recent
+                        if not self.__search(self._person_ids, person_id))
+        self._person_ids = array(
+                'q', heapq.merge(self._person_ids, recent))
+        self._recent = set()
+
+    @staticmethod
+    def __search(person_ids: array, person_id: int) -> bool:
+        """
+        Check whether a person is in a sorted array with a binary search.
+
+        :param person_ids: The sorted array of person IDs.
+        :param person_id: The ID of the person.
+        :returns: True if the person is in the array.
+        """
+
+        index = bisect_left(person_ids, person_id)
+        return index < len(person_ids) and person_ids[index] == person_id
+
+
+applied_persons = AppliedPersonFilter()
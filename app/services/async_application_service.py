@@ -0,0 +1,186 @@
+import itertools
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Mapping, Optional
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.idempotency_key import IdempotencyKey
+from app.models.records import AvailabilityRecord, CompetenceRecord
+from app.repositories.async_application_repository import \
+    get_application_from_db_async, insert_application_in_db_async
+from app.repositories.async_idempotency_repository import \
+    delete_idempotency_keys_from_db_async, get_idempotency_key_from_db_async
+from app.utilities.status_codes import StatusCodes
+
+_saved_responses = itertools.count(1)
+
+
+async def store_application_async(
+        session: AsyncSession, config: Mapping, person_id: int,
+        competences: list[CompetenceRecord],
+        availabilities: list[AvailabilityRecord],
+        idempotency_key: Optional[str] = None) -> Optional[dict]:
+    """
+    Store an application without blocking.
+
+    This function is the asynchronous counterpart of store_application. The
+    application is always inserted in its own transaction: concurrent
+    submissions wait on the database rather than on a worker thread, so the
+    group committer and the submission spool are not used. If an
+    idempotency key is given, the formatted application is stored with it
+    as the response to replay for retries of the request.
+
+    :param session: The asynchronous session of the request.
+    :param config: The application configuration.
+    :param person_id: The ID of the person submitting the application.
+    :param competences: The validated competences of the application.
+    :param availabilities: The validated availabilities of the application.
+    :param idempotency_key: The Idempotency-Key of the request, if any.
+    :returns: A dictionary representing the stored application, or None if
+              the person has already applied.
+    :raises SQLAlchemyError: If there is an issue with the database operation.
+    """
+
+    application = __format_application('Pending', competences,
+                                       availabilities)
+    stored_response = None
+    if idempotency_key is not None:
+        await __purge_expired_responses(session, config)
+        stored_response = IdempotencyKey(
+                person_id, idempotency_key, StatusCodes.CREATED,
+                json.dumps(application, default=str, sort_keys=True))
+
+    try:
+        inserted = await insert_application_in_db_async(
+                session, person_id, competences, availabilities,
+                stored_response,
+                config.get('APPLICATION_STATISTICS_SHARDS', 16))
+    except SQLAlchemyError:
+        raise SQLAlchemyError({'error': 'DATABASE_ERROR'})
+
+    return application if inserted else None
+
+
+async def fetch_application_async(session: AsyncSession,
+                                  person_id: int) -> Optional[dict]:
+    """
+    Fetch the application of a person without blocking.
+
+    :param session: The asynchronous session of the request.
+    :param person_id: The ID of the person the application belongs to.
+    :returns: A dictionary representing the application, in the same format
+              as returned by store_application_async, or None if the person
+              has not applied.
+    :raises SQLAlchemyError: If there is an issue with the database operation.
+    """
+
+    try:
+        stored = await get_application_from_db_async(session, person_id)
+    except SQLAlchemyError:
+        raise SQLAlchemyError({'error': 'DATABASE_ERROR'})
+    if stored is None:
+        return None
+
+    status, application = stored
+    return __format_application(status, application.competences,
+                                application.availabilities)
+
+
+async def fetch_application_status_async(session: AsyncSession,
+                                         person_id: int) -> Optional[dict]:
+    """
+    Fetch the status of the application of a person without blocking.
+
+    :param session: The asynchronous session of the request.
+    :param person_id: The ID of the person the application belongs to.
+    :returns: A dictionary with the 'status' of the application, or None if
+              the person has not applied.
+    :raises SQLAlchemyError: If there is an issue with the database operation.
+    """
+
+    application = await fetch_application_async(session, person_id)
+    if application is None:
+        return None
+    return {'status': application['status']}
+
+
+async def find_idempotent_response_async(
+        session: AsyncSession, config: Mapping, person_id: int,
+        key: str) -> Optional[tuple[str, int]]:
+    """
+    Find the response stored for an idempotency key without blocking.
+
+    :param session: The asynchronous session of the request.
+    :param config: The application configuration.
+    :param person_id: The ID of the person who sent the request.
+    :param key: The idempotency key.
+    :returns: The JSON body and the HTTP status code of the stored response,
+              or None if there is none.
+    :raises SQLAlchemyError: If there is an issue with the database operation.
+    """
+
+    try:
+        idempotency_key = await get_idempotency_key_from_db_async(
+                session, person_id, key, __expiry_time(config))
+    except SQLAlchemyError:
+        raise SQLAlchemyError({'error': 'DATABASE_ERROR'})
+
+    if idempotency_key is None:
+        return None
+    return idempotency_key.body, idempotency_key.status_code
+
+
+def __format_application(status: str, competences: list[CompetenceRecord],
+                         availabilities: list[AvailabilityRecord]) -> dict:
+    """
+    Format an application in the format of store_application.
+
+    :param status: The status of the application.
+    :param competences: The competences of the application.
+    :param availabilities: The availabilities of the application.
+    :returns: A dictionary representing the formatted application.
+    """
+
+    return {
+        'status': status,
+        'competences': [competence.to_dict() for competence in competences],
+        'availabilities': [availability.to_dict() for availability in
+                           availabilities]
+    }
+
+
+async def __purge_expired_responses(session: AsyncSession,
+                                    config: Mapping) -> None:
+    """
+    Delete the expired responses once every IDEMPOTENCY_KEY_PURGE_INTERVAL
+    stored responses.
+
+    :param session: The asynchronous session of the request.
+    :param config: The application configuration.
+    """
+
+    if next(_saved_responses) % config.get('IDEMPOTENCY_KEY_PURGE_INTERVAL',
+                                           100):
+        return
+    try:
+        deleted = await delete_idempotency_keys_from_db_async(
+                session, __expiry_time(config))
+    except SQLAlchemyError:
+        logging.warning('Failed to purge expired idempotency keys')
+        return
+    logging.info(f'Purged {deleted} expired idempotency keys')
+
+
+def __expiry_time(config: Mapping) -> datetime:
+    """
+    Get the time before which stored responses have expired.
+
+    :param config: The application configuration.
+    :returns: The UTC expiry time.
+    """
+
+    return datetime.utcnow() - timedelta(
+            seconds=config.get('IDEMPOTENCY_KEY_TTL', 86400))
@@ -0,0 +1,89 @@
+import asyncio
+import time
+from typing import Callable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.repositories.async_competences_repository import \
+    get_competences_from_db_async
+from app.services.competences_service import CatalogSnapshot
+
+
+class AsyncCompetenceCatalog:
+    """
+    Holds the selectable competences in memory for the event loop of the
+    ASGI application.
+
+    This is the asynchronous counterpart of CompetenceCatalog, sharing its
+    CatalogSnapshot. Reloads are single-flight: while one request queries
+    the database, other requests keep being served the previous snapshot,
+    or wait for the reload if there is none.
+
+    :ivar ttl: The number of seconds a loaded catalog is considered fresh.
+    """
+
+    def __init__(self, session_factory: Callable[[], AsyncSession],
+                 ttl: float = 300) -> None:
+        """
+        Initializes a new AsyncCompetenceCatalog object.
+
+        :param session_factory: Creates the sessions the catalog is loaded
+               with.
+        :param ttl: The number of seconds a loaded catalog is considered
+               fresh.
+        """
+
+        self.ttl = ttl
+        self._session_factory = session_factory
+        self._lock: Optional[asyncio.Lock] = None
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._expires_at = 0.0
+        self._version = 0
+
+    async def get(self) -> CatalogSnapshot:
+        """
+        Get the current catalog snapshot.
+
+        :returns: The current CatalogSnapshot.
+        :raises SQLAlchemyError: If there is an issue with the database
+                operation.
+        :raises NoResultFound: If no competences are found in the database.
+        """
+
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() < self._expires_at:
+            return snapshot
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        if snapshot is not None and self._lock.locked():
+            return snapshot
+
+        async with self._lock:
+            if (self._snapshot is not None
+                    and time.monotonic() < self._expires_at):
+                return self._snapshot
+            return await self.__refresh()
+
+    async def __refresh(self) -> CatalogSnapshot:
+        """
+        Reload the catalog from the database.
+
+        The previous snapshot is kept, including its version, if the
+        competences in the database have not changed.
+
+        :returns: The reloaded CatalogSnapshot.
+        """
+
+        async with self._session_factory() as session:
+            competences = [competence.to_dict() for competence
+                           in await get_competences_from_db_async(session)]
+
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.competences != competences:
+            self._version += 1
+            snapshot = CatalogSnapshot(self._version, competences)
+
+        self._expires_at = time.monotonic() + self.ttl
+        self._snapshot = snapshot
+        return snapshot
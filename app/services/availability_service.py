@@ -0,0 +1,600 @@
+import heapq
+import logging
+import threading
+import time
+from array import array
+from bisect import bisect_right
+from datetime import date
+from typing import Callable, Iterable, Iterator, Optional
+
+import numpy as np
+from flask import Flask, current_app
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.models.records import AvailabilityRecord
+from app.repositories.application_repository import \
+    get_availabilities_from_db, get_available_person_ids_from_db
+
+
+class IntervalTree:
+    """
+    An immutable index of date intervals answering overlap queries.
+
+    The intervals are kept in arrays sorted by start day, next to segment
+    trees holding the latest and earliest end day of every range of them.
+    An interval overlaps a query range if it starts on or before the range
+    ends, which is a prefix of the arrays found by binary search, and ends
+    on or after the range starts. The segment trees skip the subtrees that
+    all end too early and copy the subtrees that all end late enough as
+    array slices, so a query takes O(log n) steps per run of matches rather
+    than per match.
+
+    Days are stored as proleptic Gregorian ordinals.
+    """
+
+    def __init__(self, intervals: Iterable[tuple[int, int, int]]) -> None:
+        """
+        Initializes a new IntervalTree object.
+
+        :param intervals: The start day, end day and person ID of every
+               interval, ordered by start day.
+        """
+
+        self.starts = array('i')
+        self.ends = array('i')
+        self.person_ids = array('q')
+        for start, end, person_id in intervals:
+            self.starts.append(start)
+            self.ends.append(end)
+            self.person_ids.append(person_id)
+
+        self._size = 1
+        while self._size < len(self.starts):
+            self._size *= 2
+        self._max_ends = self.__build(self.ends, -1, max)
+        self._min_ends = self.__build(self.ends, 2 ** 31 - 1, min)
+
+    def __len__(self) -> int:
+        """
+        Get the number of intervals in the tree.
+
+        :returns: The number of intervals.
+        """
+
+        return len(self.starts)
+
+    def __iter__(self) -> Iterator[tuple[int, int, int]]:
+        """
+        Iterate over the intervals in the tree.
+
+        :returns: An iterator of the start day, end day and person ID of
+                  every interval, ordered by start day.
+        """
+
+        return zip(self.starts, self.ends, self.person_ids)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        The number of bytes used by the arrays of the tree.
+        """
+
+        return sum(values.itemsize * len(values) for values in (
+            self.starts, self.ends, self.person_ids, self._max_ends,
+            self._min_ends))
+
+    def overlapping(self, low: int, high: int) -> array:
+        """
+        Find the intervals overlapping a range of days.
+
+        :param low: The first day of the range.
+        :param high: The last day of the range.
+        :returns: An array of the person IDs of the overlapping intervals,
+                  with a person repeated for every overlapping interval.
+        """
+
+        count = bisect_right(self.starts, high)
+        max_ends, min_ends = self._max_ends, self._min_ends
+        person_ids = array('q')
+        stack = [(1, 0, self._size)]
+        while stack:
+            node, first, last = stack.pop()
+            if first >= count or max_ends[node] < low:
+                continue
+            if last <= count and min_ends[node] >= low:
+                person_ids.extend(self.person_ids[first:last])
+                continue
+            middle = (first + last) // 2
+            stack.append((2 * node + 1, middle, last))
+            stack.append((2 * node, first, middle))
+        return person_ids
+
+    def __build(self, ends: array, padding: int,
+                combine: Callable[[int, int], int]) -> array:
+        """
+        Build a segment tree over the end days.
+
+        :param ends: The end days in order of start day.
+        :param padding: The value of the leaves after the last interval.
+        :param combine: The function combining the values of two children.
+        :returns: The segment tree, with the root at index 1 and the
+                  children of node i at 2i and 2i + 1.
+        """
+
+        tree = array('i', [padding]) * (2 * self._size)
+        tree[self._size:self._size + len(ends)] = ends
+        for node in range(self._size - 1, 0, -1):
+            tree[node] = combine(tree[2 * node], tree[2 * node + 1])
+        return tree
+
+
+class AvailabilityIndex:
+    """
+    Holds the availabilities of all applicants in memory for the current
+    worker.
+
+    The index is loaded from the database into an IntervalTree on first use
+    and reloaded once its time to live has expired, so that submissions to
+    other workers are picked up. Availabilities stored by this worker are
+    added to a list that is scanned on every search. Once it holds
+    merge_threshold availabilities, a background thread merges them into a
+    new tree, which replaces the current one when it is built, so neither
+    the submission nor concurrent searches wait for the merge. Reloads and
+    merges are single-flight, like the reloads of the competence catalog.
+
+    :ivar ttl: The number of seconds a loaded index is considered fresh.
+    :ivar merge_threshold: The number of added availabilities that triggers
+          a merge into the tree.
+    """
+
+    def __init__(self, ttl: float = 300,
+                 merge_threshold: int = 10000) -> None:
+        """
+        Initializes a new AvailabilityIndex object.
+
+        :param ttl: The number of seconds a loaded index is considered fresh.
+        :param merge_threshold: The number of added availabilities that
+               triggers a merge into the tree.
+        """
+
+        self.ttl = ttl
+        self.merge_threshold = merge_threshold
+        self._lock = threading.Lock()
+        self._delta_lock = threading.Lock()
+        self._tree: Optional[IntervalTree] = None
+        self._delta: list[tuple[int, int, int]] = []
+        self._expires_at = 0.0
+        self._merge_thread: Optional[threading.Thread] = None
+
+    @property
+    def nbytes(self) -> int:
+        """
+        The number of bytes used by the arrays of the loaded tree, or 0 if
+        the index has not been loaded.
+        """
+
+        tree = self._tree
+        return 0 if tree is None else tree.nbytes
+
+    def init_app(self, app: Flask) -> None:
+        """
+        Configures the index for a Flask application.
+
+        This function reads the time to live and merge threshold from the
+        application configuration and discards any loaded index.
+
+        :param app: The Flask application.
+        """
+
+        self.ttl = app.config.get('AVAILABILITY_INDEX_TTL', 300)
+        self.merge_threshold = app.config.get(
+                'AVAILABILITY_INDEX_MERGE_THRESHOLD', 10000)
+        with self._delta_lock:
+            self._tree = None
+            self._delta = []
+        app.extensions['availability_index'] = self
+
+    def add(self, availabilities: Iterable[AvailabilityRecord]) -> None:
+        """
+        Add stored availabilities to the index.
+
+        Nothing is added before the index has been loaded, since loading it
+        reads them from the database.
+
+        :param availabilities: The stored availabilities.
+        """
+
+        if self._tree is None:
+            return
+
+        with self._delta_lock:
+            self._delta.extend(
+                    (availability.from_date.toordinal(),
+                     availability.to_date.toordinal(),
+                     availability.person_id)
+                    for availability in availabilities)
+            if len(self._delta) >= self.merge_threshold and not (
+                    self._merge_thread and self._merge_thread.is_alive()):
+                self._merge_thread = threading.Thread(
+                        target=self.__merge, name='availability-merge',
+                        daemon=True)
+                self._merge_thread.start()
+
+    def search(self, from_date: date, to_date: date) -> set[int]:
+        """
+        Find the persons who are available at some time within a date range.
+
+        :param from_date: The first date of the range.
+        :param to_date: The last date of the range.
+        :returns: The IDs of the available persons.
+        :raises SQLAlchemyError: If the index could not be loaded.
+        """
+
+        tree, delta = self.__get()
+        low, high = from_date.toordinal(), to_date.toordinal()
+
+        person_ids = set(tree.overlapping(low, high))
+        person_ids.update(person_id for start, end, person_id in delta
+                          if start <= high and end >= low)
+        return person_ids
+
+    def __get(self) -> tuple[IntervalTree, list[tuple[int, int, int]]]:
+        """
+        Get the current tree and added availabilities, loading the tree if
+        it is missing or has expired.
+
+        :returns: The tree and a copy of the added availabilities.
+        """
+
+        tree = self._tree
+        if tree is None or time.monotonic() >= self._expires_at:
+            if self._lock.acquire(blocking=tree is None):
+                try:
+                    if (self._tree is None
+                            or time.monotonic() >= self._expires_at):
+                        self.__load()
+                finally:
+                    self._lock.release()
+
+        with self._delta_lock:
+            return self._tree, list(self._delta)  # type: ignore[return-value]
+
+    def __merge(self) -> None:
+        """
+        Merge the added availabilities into a new tree.
+
+        The tree is built without holding the lock of the added
+        availabilities, and only replaces the current tree if it has not
+        been reloaded in the meantime. Availabilities added during the merge
+        are kept for the next one.
+        """
+
+        with self._lock:
+            with self._delta_lock:
+                tree, delta = self._tree, list(self._delta)
+            if tree is None:
+                return
+
+            start = time.perf_counter()
+            merged = IntervalTree(heapq.merge(tree, sorted(delta)))
+
+            with self._delta_lock:
+                if self._tree is not tree:
+                    return
+                self._delta = self._delta[len(delta):]
+                self._tree = merged
+        logging.info(f'Merged {len(delta)} availabilities into the index in '
+                     f'{time.perf_counter() - start:.3f}s')
+
+    def __load(self) -> None:
+        """
+        Load the tree from the database.
+
+        Availabilities added while the tree is loaded are kept, since the
+        load may or may not have read them.
+        """
+
+        with self._delta_lock:
+            added = len(self._delta)
+
+        start = time.perf_counter()
+        tree = IntervalTree(
+                (from_date.toordinal(), to_date.toordinal(), person_id)
+                for from_date, to_date, person_id
+                in get_availabilities_from_db())
+
+        with self._delta_lock:
+            self._delta = self._delta[added:]
+            self._tree = tree
+        self._expires_at = time.monotonic() + self.ttl
+        logging.info(f'Loaded {len(tree)} availabilities into the index in '
+                     f'{time.perf_counter() - start:.3f}s')
+
+
+availability_index = AvailabilityIndex()
+
+_POPCOUNT = np.array([bin(byte).count('1') for byte in range(256)], np.uint8)
+_BITMAP_CHUNK_SIZE = 4096
+
+
+class AvailabilityBitmaps:
+    """
+    Holds a bitmap of the available days of every applicant in memory for
+    the current worker.
+
+    Every applicant is a row of a matrix of bytes with a bit per day from
+    the epoch, the first day in the most significant bit, so that days days
+    take days / 8 bytes per applicant. The number of days an applicant is
+    available within a range is the popcount of the bytes covering the
+    range, with the bits outside it masked, which takes the same time
+    however many availabilities the applicant has. Days before the epoch or
+    on or after the epoch plus days are not recorded.
+
+    The bitmaps are loaded and reloaded like the availability index.
+    Availabilities stored by this worker are painted into spare rows before
+    the next search, and the matrix doubles in size when it runs out of
+    them. A person added both by the load and by this worker has two equal
+    rows, which a search reports once.
+
+    :ivar epoch: The first recorded day.
+    :ivar days: The number of recorded days.
+    :ivar ttl: The number of seconds loaded bitmaps are considered fresh.
+    """
+
+    def __init__(self, epoch: date = date(2020, 1, 1), days: int = 4096,
+                 ttl: float = 300) -> None:
+        """
+        Initializes a new AvailabilityBitmaps object.
+
+        :param epoch: The first recorded day.
+        :param days: The number of recorded days, a multiple of 8.
+        :param ttl: The number of seconds loaded bitmaps are considered
+               fresh.
+        """
+
+        self.epoch = epoch
+        self.days = days
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._delta_lock = threading.Lock()
+        self._person_ids = np.empty(0, np.int64)
+        self._bitmaps = np.empty((0, days // 8), np.uint8)
+        self._count = 0
+        self._loaded = False
+        self._delta: list[AvailabilityRecord] = []
+        self._expires_at = 0.0
+
+    @property
+    def last_day(self) -> date:
+        """
+        The last recorded day.
+        """
+
+        return date.fromordinal(self.epoch.toordinal() + self.days - 1)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        The number of bytes used by the person IDs and bitmaps.
+        """
+
+        return self._person_ids.nbytes + self._bitmaps.nbytes
+
+    def init_app(self, app: Flask) -> None:
+        """
+        Configures the bitmaps for a Flask application.
+
+        This function reads the epoch, number of days and time to live from
+        the application configuration and discards any loaded bitmaps.
+
+        :param app: The Flask application.
+        """
+
+        self.epoch = date.fromisoformat(
+                app.config.get('AVAILABILITY_BITMAP_EPOCH', '2020-01-01'))
+        self.days = app.config.get('AVAILABILITY_BITMAP_DAYS', 4096)
+        self.ttl = app.config.get('AVAILABILITY_BITMAP_TTL', 300)
+        with self._delta_lock:
+            self._person_ids = np.empty(0, np.int64)
+            self._bitmaps = np.empty((0, self.days // 8), np.uint8)
+            self._count = 0
+            self._loaded = False
+            self._delta = []
+        app.extensions['availability_bitmaps'] = self
+
+    def add(self, availabilities: Iterable[AvailabilityRecord]) -> None:
+        """
+        Add stored availabilities to the bitmaps.
+
+        Nothing is added before the bitmaps have been loaded, since loading
+        them reads them from the database.
+
+        :param availabilities: The stored availabilities.
+        """
+
+        if not self._loaded:
+            return
+
+        with self._delta_lock:
+            self._delta.extend(availabilities)
+
+    def search(self, from_date: date, to_date: date,
+               min_days: int) -> np.ndarray:
+        """
+        Find the persons who are available on at least a number of days
+        within a date range.
+
+        :param from_date: The first date of the range, not before the epoch.
+        :param to_date: The last date of the range, not after the last day.
+        :param min_days: The minimum number of available days.
+        :returns: The IDs of the available persons in ascending order.
+        :raises SQLAlchemyError: If the bitmaps could not be loaded.
+        """
+
+        person_ids, bitmaps = self.__get()
+        low = from_date.toordinal() - self.epoch.toordinal()
+        high = to_date.toordinal() - self.epoch.toordinal()
+
+        window = bitmaps[:, low // 8:high // 8 + 1].copy()
+        window[:, 0] &= 0xFF >> low % 8
+        window[:, -1] &= (0xFF << 7 - high % 8) & 0xFF
+        available_days = _POPCOUNT[window].sum(axis=1, dtype=np.int32)
+
+        return np.unique(person_ids[available_days >= min_days])
+
+    def __get(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Get the person IDs and bitmaps with the added availabilities,
+        loading them if they are missing or have expired.
+
+        :returns: The person ID and bitmap of every row in use.
+        """
+
+        if not self._loaded or time.monotonic() >= self._expires_at:
+            if self._lock.acquire(blocking=not self._loaded):
+                try:
+                    if (not self._loaded
+                            or time.monotonic() >= self._expires_at):
+                        self.__load()
+                finally:
+                    self._lock.release()
+
+        with self._delta_lock:
+            if self._delta:
+                self.__append(np.array(
+                        [(availability.person_id,
+                          availability.from_date.toordinal(),
+                          availability.to_date.toordinal())
+                         for availability in self._delta],
+                        np.int64).reshape(-1, 3))
+                self._delta = []
+            return (self._person_ids[:self._count],
+                    self._bitmaps[:self._count])
+
+    def __load(self) -> None:
+        """
+        Load the bitmaps from the database.
+
+        Availabilities added while the bitmaps are loaded are kept, since
+        the load may or may not have read them.
+        """
+
+        with self._delta_lock:
+            added = len(self._delta)
+
+        start = time.perf_counter()
+        availabilities = np.array(
+                [(person_id, from_date.toordinal(), to_date.toordinal())
+                 for from_date, to_date, person_id
+                 in get_availabilities_from_db()],
+                np.int64).reshape(-1, 3)
+
+        with self._delta_lock:
+            self._person_ids = np.empty(0, np.int64)
+            self._bitmaps = np.empty((0, self.days // 8), np.uint8)
+            self._count = 0
+            self.__append(availabilities)
+            self._delta = self._delta[added:]
+            self._loaded = True
+        self._expires_at = time.monotonic() + self.ttl
+        logging.info(f'Loaded {self._count} availability bitmaps in '
+                     f'{time.perf_counter() - start:.3f}s')
+
+    def __append(self, availabilities: np.ndarray) -> None:
+        """
+        Add rows for the persons of availabilities and paint their days.
+
+        The days of a chunk of availabilities are marked in a matrix with a
+        row per person and a column per day spanned by the chunk, +1 on the
+        first day and -1 on the day after the last, so that a cumulative sum
+        along the rows is positive on every available day. Must be called
+        with the delta lock held.
+
+        :param availabilities: The person ID, start day and end day of every
+               availability, as an array of three columns.
+        """
+
+        person_ids, inverse = np.unique(availabilities[:, 0],
+                                        return_inverse=True)
+        rows = self._count + inverse.reshape(-1)
+        count = self._count + len(person_ids)
+        if count > len(self._person_ids):
+            capacity = max(count, 2 * len(self._person_ids))
+            grown_person_ids = np.zeros(capacity, np.int64)
+            grown_person_ids[:self._count] = self._person_ids[:self._count]
+            grown_bitmaps = np.zeros((capacity, self.days // 8), np.uint8)
+            grown_bitmaps[:self._count] = self._bitmaps[:self._count]
+            self._person_ids, self._bitmaps = grown_person_ids, grown_bitmaps
+        self._person_ids[self._count:count] = person_ids
+
+        starts = np.maximum(availabilities[:, 1] - self.epoch.toordinal(), 0)
+        ends = np.minimum(availabilities[:, 2] - self.epoch.toordinal(),
+                          self.days - 1)
+        recorded = starts <= ends
+        rows, starts, ends = rows[recorded], starts[recorded], ends[recorded]
+
+        for first in range(0, len(rows), _BITMAP_CHUNK_SIZE):
+            chunk = slice(first, first + _BITMAP_CHUNK_SIZE)
+            chunk_rows, chunk_inverse = np.unique(rows[chunk],
+                                                  return_inverse=True)
+            chunk_inverse = chunk_inverse.reshape(-1)
+            low = int(starts[chunk].min()) // 8 * 8
+            width = (int(ends[chunk].max()) + 8 - low) // 8 * 8
+            marks = np.zeros((len(chunk_rows), width + 1), np.int8)
+            np.add.at(marks, (chunk_inverse, starts[chunk] - low), 1)
+            np.add.at(marks, (chunk_inverse, ends[chunk] + 1 - low), -1)
+            self._bitmaps[chunk_rows, low // 8:(low + width) // 8] |= \
+                np.packbits(np.cumsum(marks[:, :-1], axis=1, dtype=np.int8)
+                            > 0, axis=1)
+        self._count = count
+
+
+availability_bitmaps = AvailabilityBitmaps()
+
+
+def search_available_persons(from_date: date, to_date: date, after: int,
+                             limit: int, min_days: int = 1) -> dict:
+    """
+    Search for the persons who are available within a date range.
+
+    This function finds the persons with an availability overlapping the
+    date range. If AVAILABILITY_INDEX is enabled, the search is answered by
+    the in-memory availability index, otherwise by the database. If more
+    than one available day is required, the search is answered by the
+    availability bitmaps, in which case the range must be within the
+    recorded days.
+
+    :param from_date: The first date of the range.
+    :param to_date: The last date of the range.
+    :param after: The person ID after which the page starts, 0 for the
+           first page.
+    :param limit: The maximum number of person IDs in the page.
+    :param min_days: The minimum number of days within the range the
+           persons must be available.
+    :returns: A dictionary with the 'person_ids' of the page in ascending
+              order and 'next_after', the person ID to pass as after for the
+              next page, or None if this is the last page.
+    :raises SQLAlchemyError: If there is an issue with the database operation.
+    """
+
+    try:
+        if min_days > 1:
+            available = availability_bitmaps.search(
+                    from_date, to_date, min_days)
+            first = int(np.searchsorted(available, after, side='right'))
+            person_ids = available[first:first + limit].tolist()
+        elif current_app.config.get('AVAILABILITY_INDEX'):
+            person_ids = heapq.nsmallest(
+                    limit, (person_id for person_id in availability_index
+                            .search(from_date, to_date)
+                            if person_id > after))
+        else:
+            person_ids = get_available_person_ids_from_db(
+                    from_date, to_date, after, limit)
+    except SQLAlchemyError:
+        raise SQLAlchemyError({'error': 'DATABASE_ERROR'})
+
+    return {
+        'person_ids': person_ids,
+        'next_after': person_ids[-1] if len(person_ids) == limit else None
+    }
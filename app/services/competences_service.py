@@ -1,16 +1,207 @@
+import gzip
+import hashlib
+import json
+import threading
+import time
+from typing import Optional
+
+from flask import Flask
+
+try:
+    import brotli  # type: ignore
+except ImportError:  # pragma: no cover
+    brotli = None
+
 from app.repositories.competences_repository import get_competences_from_db
 
 
+class CatalogSnapshot:
+    """
+    Represents one loaded version of the competence catalog.
+
+    A snapshot is immutable once created and is shared between all requests
+    served by the worker until the catalog is reloaded with different
+    content.
+
+    :ivar version: The version of the catalog, increased every time the
+          loaded competences differ from the previously loaded ones.
+    :ivar competences: A list of dictionaries, each representing a
+          competence.
+    :ivar index: The competences keyed by their competence ID.
+    :ivar etag: A hash of the competences, used as entity tag in responses.
+    :ivar bodies: The competences serialized as a JSON response body, keyed
+          by content coding in order of preference. Always contains the
+          'identity' and 'gzip' codings, and 'br' if brotli is installed.
+    """
+
+    def __init__(self, version: int, competences: list[dict]) -> None:
+        """
+        Initializes a new CatalogSnapshot object.
+
+        :param version: The version of the catalog.
+        :param competences: A list of dictionaries, each representing a
+               competence.
+        """
+
+        self.version = version
+        self.competences = competences
+        self.index = {competence['competence_id']: competence
+                      for competence in competences}
+
+        body = json.dumps(competences, sort_keys=True,
+                          separators=(',', ':')).encode() + b'\n'
+        self.etag = hashlib.sha256(body).hexdigest()
+
+        self.bodies: dict[str, bytes] = {}
+        if brotli is not None:
+            self.bodies['br'] = brotli.compress(body)
+        self.bodies['gzip'] = gzip.compress(body, mtime=0)
+        self.bodies['identity'] = body
+
+
+class CompetenceCatalog:
+    """
+    Holds the selectable competences in memory for the current worker.
+
+    The catalog is loaded from the database on first use and reloaded when
+    its time to live has expired or it has been invalidated. Reloads are
+    single-flight: while one thread queries the database, other threads keep
+    serving the previous snapshot, or wait for the reload if there is none,
+    instead of issuing their own query.
+
+    :ivar ttl: The number of seconds a loaded catalog is considered fresh.
+    """
+
+    def __init__(self, ttl: float = 300) -> None:
+        """
+        Initializes a new CompetenceCatalog object.
+
+        :param ttl: The number of seconds a loaded catalog is considered
+               fresh.
+        """
+
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._previous: Optional[CatalogSnapshot] = None
+        self._expires_at = 0.0
+        self._version = 0
+
+    def init_app(self, app: Flask) -> None:
+        """
+        Configures the catalog for a Flask application.
+
+        This function reads the time to live from the application
+        configuration and discards any previously loaded catalog.
+
+        :param app: The Flask application.
+        """
+
+        self.ttl = app.config.get('COMPETENCE_CACHE_TTL', 300)
+        self._snapshot = None
+        self._previous = None
+        app.extensions['competence_catalog'] = self
+
+    def get(self) -> CatalogSnapshot:
+        """
+        Get the current catalog snapshot.
+
+        This function returns the cached snapshot while it is fresh. Once it
+        has expired, exactly one caller reloads it from the database while
+        concurrent callers are served the expired snapshot.
+
+        :returns: The current CatalogSnapshot.
+        :raises SQLAlchemyError: If there is an issue with the database
+                operation.
+        :raises NoResultFound: If no competences are found in the database.
+        """
+
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() < self._expires_at:
+            return snapshot
+
+        if not self._lock.acquire(blocking=snapshot is None):
+            return snapshot  # type: ignore[return-value]
+
+        try:
+            if (self._snapshot is not None
+                    and time.monotonic() < self._expires_at):
+                return self._snapshot
+            return self.__refresh()
+        finally:
+            self._lock.release()
+
+    def invalidate(self) -> None:
+        """
+        Invalidate the catalog.
+
+        This function discards the cached snapshot so that the next caller
+        reloads the catalog from the database.
+        """
+
+        self._snapshot = None
+
+    def __refresh(self) -> CatalogSnapshot:
+        """
+        Reload the catalog from the database.
+
+        The previous snapshot is kept, including its version, if the
+        competences in the database have not changed.
+
+        :returns: The reloaded CatalogSnapshot.
+        """
+
+        competences = [competence.to_dict()
+                       for competence in get_competences_from_db()]
+
+        previous = self._previous
+        if previous is not None and previous.competences == competences:
+            snapshot = previous
+        else:
+            self._version += 1
+            snapshot = CatalogSnapshot(self._version, competences)
+
+        self._expires_at = time.monotonic() + self.ttl
+        self._snapshot = self._previous = snapshot
+        return snapshot
+
+
+competence_catalog = CompetenceCatalog()
+
+
 def fetch_competences() -> list[dict]:
     """
     Fetches the competences.
 
-    This function fetches the competences from the database. It then
-    converts each competence into a dictionary and returns a list of these
-    dictionaries.
+    This function fetches the competences from the in-memory catalog, which
+    is loaded from the database when it is empty or has expired.
 
     :returns: A list of dictionaries, each representing a competence.
     """
 
-    competences = get_competences_from_db()
-    return [competence.to_dict() for competence in competences]
+    return list(competence_catalog.get().competences)
+
+
+def fetch_competence_catalog() -> CatalogSnapshot:
+    """
+    Fetches the competence catalog.
+
+    This function fetches the current snapshot of the in-memory catalog,
+    which besides the competences carries the data derived from them once
+    per catalog version.
+
+    :returns: The current CatalogSnapshot.
+    """
+
+    return competence_catalog.get()
+
+
+def invalidate_competences() -> None:
+    """
+    Invalidates the cached competences.
+
+    This function should be called after the competence table has been
+    changed so that the next request reloads it from the database.
+    """
+
+    competence_catalog.invalidate()
@@ -0,0 +1,188 @@
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError
+from typing import Optional
+
+from flask import Flask
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.models.idempotency_key import IdempotencyKey
+from app.models.records import ApplicationRecord
+from app.repositories.application_repository import insert_applications_in_db
+
+
+class GroupCommitter:
+    """
+    Coalesces concurrent submissions into shared transactions.
+
+    When SUBMISSION_GROUP_COMMIT is set, request threads hand their validated
+    applications to a committer thread per worker and wait for the result.
+    The committer collects the applications arriving within a short window,
+    or until the batch is full, and inserts them with one transaction, so
+    the cost of a commit is shared by all of them. If the transaction fails,
+    the applications are retried one at a time, so that one failing
+    application does not fail the others.
+
+    :ivar window: The number of seconds to wait for more applications after
+          the first one of a batch arrives.
+    :ivar max_size: The maximum number of applications per transaction.
+    :ivar timeout: The number of seconds a caller waits for its result.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes a new GroupCommitter object.
+        """
+
+        self.window = 0.005
+        self.max_size = 100
+        self.timeout = 30.0
+        self._app: Optional[Flask] = None
+        self._queue: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    def init_app(self, app: Flask) -> None:
+        """
+        Configures the committer for a Flask application.
+
+        This function reads the window and batch size from the application
+        configuration.
+
+        :param app: The Flask application.
+        """
+
+        self._app = app
+        self.window = app.config.get('SUBMISSION_GROUP_COMMIT_WINDOW',
+                                     5) / 1000
+        self.max_size = app.config.get('SUBMISSION_GROUP_COMMIT_MAX_SIZE',
+                                       100)
+        app.extensions['group_committer'] = self
+
+    def submit(self, application: ApplicationRecord,
+               idempotency_key: Optional[IdempotencyKey] = None) -> bool:
+        """
+        Insert an application with the next group commit.
+
+        :param application: The validated application.
+        :param idempotency_key: An optional IdempotencyKey object holding the
+               response to the request, stored in the same transaction as
+               the application if it is inserted.
+        :returns: True if the application was inserted, False if the person
+                  has already applied.
+        :raises SQLAlchemyError: If the application could not be inserted,
+                or if the committer has not been configured with init_app.
+        """
+
+        if self._app is None:
+            raise SQLAlchemyError('Group committer is not initialized')
+
+        self.__start()
+        future: Future = Future()
+        self._queue.put((application, idempotency_key, future))
+        try:
+            return future.result(self.timeout)
+        except TimeoutError:
+            raise SQLAlchemyError('Group commit timed out')
+
+    def __start(self) -> None:
+        """
+        Start the committer thread of the current process if it is not
+        running.
+        """
+
+        if self._pid == os.getpid():
+            return
+
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._queue = queue.Queue()
+            self._thread = threading.Thread(
+                    target=self.__run, args=(self._queue,),
+                    name='group-committer', daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def __run(self, pending: queue.Queue) -> None:
+        """
+        Commit batches of applications as they arrive.
+
+        Applications of a person who is already in the batch are held back
+        to the next batch, since a batch must not contain a person twice.
+
+        :param pending: The queue of applications, their idempotency keys
+               and their futures.
+        """
+
+        held_back: list = []
+        while True:
+            batch = held_back or [pending.get()]
+            held_back = []
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(pending.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            person_ids: set[int] = set()
+            unique = []
+            for item in batch:
+                if item[0].person_id in person_ids:
+                    held_back.append(item)
+                else:
+                    person_ids.add(item[0].person_id)
+                    unique.append(item)
+
+            self.__commit(unique)
+
+    def __commit(self, batch: list[tuple[ApplicationRecord,
+                                         Optional[IdempotencyKey],
+                                         Future]]) -> None:
+        """
+        Insert a batch of applications and resolve their futures.
+
+        :param batch: The applications, their idempotency keys and their
+               futures.
+        """
+
+        if self._app is None:
+            for _, _, future in batch:
+                future.set_exception(SQLAlchemyError(
+                        'Group committer is not initialized'))
+            return
+
+        try:
+            with self._app.app_context():
+                inserted = insert_applications_in_db(
+                        [application for application, _, _ in batch],
+                        [idempotency_key for _, idempotency_key, _ in batch
+                         if idempotency_key is not None])
+        except SQLAlchemyError as exception:
+            if len(batch) == 1:
+                batch[0][2].set_exception(exception)
+                return
+            logging.warning(f'Group commit of {len(batch)} applications '
+                            f'failed, retrying them one at a time')
+            for item in batch:
+                self.__commit([item])
+            return
+        except Exception as exception:
+            for _, _, future in batch:
+                future.set_exception(exception)
+            return
+
+        logging.debug(f'Group committed {len(batch)} applications')
+        for application, _, future in batch:
+            future.set_result(application.person_id in inserted)
+
+
+group_committer = GroupCommitter()
@@ -0,0 +1,127 @@
+import itertools
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+
+from flask import current_app
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.models.idempotency_key import IdempotencyKey
+from app.repositories.idempotency_repository import \
+    delete_idempotency_keys_from_db, get_idempotency_key_from_db, \
+    insert_idempotency_key_in_db
+
+MAX_IDEMPOTENCY_KEY_LENGTH = 255
+
+_saved_responses = itertools.count(1)
+
+
+def valid_idempotency_key(key: str) -> bool:
+    """
+    Check whether an Idempotency-Key header value is valid.
+
+    :param key: The header value.
+    :returns: True if the key is between 1 and MAX_IDEMPOTENCY_KEY_LENGTH
+              printable ASCII characters.
+    """
+
+    return (0 < len(key) <= MAX_IDEMPOTENCY_KEY_LENGTH and key.isascii()
+            and key.isprintable())
+
+
+def find_idempotent_response(person_id: int,
+                             key: str) -> Optional[tuple[str, int]]:
+    """
+    Find the response stored for an idempotency key.
+
+    Stored responses expire after IDEMPOTENCY_KEY_TTL seconds.
+
+    :param person_id: The ID of the person who sent the request.
+    :param key: The idempotency key.
+    :returns: The JSON body and the HTTP status code of the stored response,
+              or None if there is none.
+    :raises SQLAlchemyError: If there is an issue with the database operation.
+    """
+
+    try:
+        idempotency_key = get_idempotency_key_from_db(
+                person_id, key, __expiry_time())
+    except SQLAlchemyError:
+        raise SQLAlchemyError({'error': 'DATABASE_ERROR'})
+
+    if idempotency_key is None:
+        return None
+    return idempotency_key.body, idempotency_key.status_code
+
+
+def create_idempotency_key(person_id: int, key: str, status_code: int,
+                           body: dict) -> IdempotencyKey:
+    """
+    Create a stored response for an idempotency key.
+
+    The response is stored when the returned object is committed, which lets
+    it be stored in the same transaction as the resource it describes.
+
+    :param person_id: The ID of the person who sent the request.
+    :param key: The idempotency key.
+    :param status_code: The HTTP status code of the response.
+    :param body: The body of the response.
+    :returns: The IdempotencyKey object to commit.
+    """
+
+    __purge_expired_responses()
+    return IdempotencyKey(person_id, key, status_code,
+                          current_app.json.dumps(body))
+
+
+def save_idempotent_response(person_id: int, key: str, status_code: int,
+                             body: dict) -> None:
+    """
+    Store the response of a request with an idempotency key.
+
+    If a response is already stored with the key, it is kept.
+
+    :param person_id: The ID of the person who sent the request.
+    :param key: The idempotency key.
+    :param status_code: The HTTP status code of the response.
+    :param body: The body of the response.
+    :raises SQLAlchemyError: If there is an issue with the database operation.
+    """
+
+    try:
+        insert_idempotency_key_in_db(
+                create_idempotency_key(person_id, key, status_code, body))
+    except SQLAlchemyError:
+        raise SQLAlchemyError({'error': 'DATABASE_ERROR'})
+
+
+def __purge_expired_responses() -> None:
+    """
+    Delete the expired responses once every IDEMPOTENCY_KEY_PURGE_INTERVAL
+    stored responses.
+
+    Since a person can only apply once, at most one response per person is
+    stored, so this only bounds how long they are kept.
+    """
+
+    interval = current_app.config.get('IDEMPOTENCY_KEY_PURGE_INTERVAL', 100)
+    if next(_saved_responses) % interval:
+        return
+
+    try:
+        deleted = delete_idempotency_keys_from_db(__expiry_time())
+    except SQLAlchemyError:
+        logging.warning('Failed to purge expired idempotency keys')
+        return
+    logging.info(f'Purged {deleted} expired idempotency keys')
+
+
+def __expiry_time() -> datetime:
+    """
+    Get the time before which stored responses have expired.
+
+    :returns: The UTC expiry time.
+    """
+
+    return datetime.utcnow() - timedelta(
+            seconds=current_app.config.get('IDEMPOTENCY_KEY_TTL', 86400))
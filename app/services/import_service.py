@@ -0,0 +1,201 @@
+import json
+from typing import Iterable, Iterator, Optional, Union
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.models.records import ApplicationRecord
+from app.repositories.application_loader import load_applications_in_db
+from app.repositories.application_repository import insert_applications_in_db
+from app.services.applied_person_service import applied_persons
+from app.services.availability_service import availability_bitmaps, \
+    availability_index
+from app.services.ranking_service import applicant_ranking
+from app.services.validation_service import validate_application
+
+MAX_REPORTED_ERRORS = 1000
+
+
+def import_applications(lines: Iterable[Union[bytes, str]],
+                        chunk_size: int, bulk_load: bool = False) -> dict:
+    """
+    Import applications from NDJSON.
+
+    This function reads one application per line, each a JSON object with
+    the 'person_id' it belongs to and the same 'competences' and
+    'availabilities' as a submitted application. The lines are consumed one
+    at a time and validated with the submission rules. Valid applications
+    are committed in chunks, so a failing chunk does not affect the others.
+
+    With bulk_load, the valid applications are instead streamed into the
+    database with load_applications_in_db, which uses COPY on PostgreSQL.
+    This is meant for loading persons who have not applied before, since a
+    conflict fails the load. Either way, the applied person filter, the
+    availability index and bitmaps and the applicant ranking are updated
+    with every committed chunk.
+
+    :param lines: The NDJSON lines, for example a file or request stream.
+    :param chunk_size: The number of applications committed per transaction.
+    :param bulk_load: Whether to load the applications with the loader.
+    :returns: A dictionary with the number of 'imported' and 'failed' lines
+              and the 'errors' of the first failed lines, each with the
+              'line' number and the 'error' code, and the validation
+              'errors' if the application was invalid. With bulk_load, the
+              loader statistics are included under 'load'.
+    :raises SQLAlchemyError: If bulk_load is used and the load fails.
+    """
+
+    report: dict = {'imported': 0, 'failed': 0, 'errors': []}
+    applications = __validate_lines(lines, report)
+
+    if bulk_load:
+        seen_person_ids: set[int] = set()
+        statistics = load_applications_in_db(
+                (application for line_number, application in applications
+                 if __first_occurrence(application, line_number,
+                                       seen_person_ids, report)),
+                chunk_size, __add_to_caches)
+        report['imported'] = statistics['applications']
+        report['load'] = statistics
+        return report
+
+    chunk: dict[int, tuple[int, ApplicationRecord]] = {}
+    for line_number, application in applications:
+        if application.person_id in chunk:
+            __report_error(report, line_number, 'ALREADY_APPLIED_BEFORE')
+            continue
+
+        chunk[application.person_id] = (line_number, application)
+        if len(chunk) >= chunk_size:
+            __commit_chunk(chunk, report)
+            chunk = {}
+
+    __commit_chunk(chunk, report)
+    return report
+
+
+def __validate_lines(lines: Iterable[Union[bytes, str]],
+                     report: dict) -> Iterator[tuple[int, ApplicationRecord]]:
+    """
+    Validate NDJSON lines one at a time.
+
+    :param lines: The NDJSON lines.
+    :param report: The import report, updated with the invalid lines.
+    :returns: An iterator of the line number and the validated application
+              of every valid line.
+    """
+
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+
+        try:
+            application = json.loads(line)
+        except ValueError:
+            __report_error(report, line_number, 'INVALID_JSON_PAYLOAD')
+            continue
+
+        person_id = (application.get('person_id')
+                     if isinstance(application, dict) else None)
+        if type(person_id) is not int or person_id < 1:
+            __report_error(report, line_number, 'INVALID_PERSON_ID')
+            continue
+
+        try:
+            validation = validate_application(person_id, application)
+        except SQLAlchemyError:
+            __report_error(report, line_number, 'DATABASE_ERROR')
+            continue
+
+        if validation.errors:
+            __report_error(report, line_number, validation.errors[0]['error'],
+                           validation.errors)
+            continue
+
+        yield line_number, ApplicationRecord(
+                person_id, validation.competences, validation.availabilities)
+
+
+def __first_occurrence(application: ApplicationRecord, line_number: int,
+                       seen_person_ids: set[int], report: dict) -> bool:
+    """
+    Check whether an application is the first one of its person.
+
+    :param application: The application.
+    :param line_number: The line number of the application.
+    :param seen_person_ids: The IDs of the persons seen so far, updated by
+           this function.
+    :param report: The import report, updated if the person has been seen.
+    :returns: True if the person has not been seen before.
+    """
+
+    if application.person_id in seen_person_ids:
+        __report_error(report, line_number, 'ALREADY_APPLIED_BEFORE')
+        return False
+
+    seen_person_ids.add(application.person_id)
+    return True
+
+
+def __commit_chunk(chunk: dict[int, tuple[int, ApplicationRecord]],
+                   report: dict) -> None:
+    """
+    Commit a chunk of validated applications.
+
+    :param chunk: The line numbers and applications keyed by person ID.
+    :param report: The import report, updated by this function.
+    """
+
+    if not chunk:
+        return
+
+    try:
+        inserted = insert_applications_in_db(
+                [application for _, application in chunk.values()])
+    except SQLAlchemyError:
+        for line_number, _ in chunk.values():
+            __report_error(report, line_number, 'DATABASE_ERROR')
+        return
+
+    report['imported'] += len(inserted)
+    for person_id, (line_number, _) in chunk.items():
+        if person_id not in inserted:
+            applied_persons.add(person_id)
+            __report_error(report, line_number, 'ALREADY_APPLIED_BEFORE')
+    __add_to_caches([application for person_id, (_, application)
+                     in chunk.items() if person_id in inserted])
+
+
+def __add_to_caches(applications: list[ApplicationRecord]) -> None:
+    """
+    Add committed applications to the in-memory caches.
+
+    :param applications: The applications committed by the import.
+    """
+
+    for application in applications:
+        applied_persons.add(application.person_id)
+        availability_index.add(application.availabilities)
+        availability_bitmaps.add(application.availabilities)
+    applicant_ranking.add(applications)
+
+
+def __report_error(report: dict, line_number: int, error: str,
+                   errors: Optional[list] = None) -> None:
+    """
+    Record a failed line in the import report.
+
+    Only the first MAX_REPORTED_ERRORS failed lines are listed, while all of
+    them are counted.
+
+    :param report: The import report, updated by this function.
+    :param line_number: The number of the failed line.
+    :param error: The error code.
+    :param errors: The validation errors of the line, if any.
+    """
+
+    report['failed'] += 1
+    if len(report['errors']) < MAX_REPORTED_ERRORS:
+        entry = {'line': line_number, 'error': error}
+        if errors:
+            entry['errors'] = errors
+        report['errors'].append(entry)
@@ -0,0 +1,480 @@
+import logging
+import threading
+import time
+from decimal import Decimal
+from typing import Iterable, Optional
+
+import numpy as np
+from flask import Flask
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.models.records import ApplicationRecord, JobProfile
+from app.repositories.application_repository import \
+    get_availabilities_from_db, get_competence_profiles_from_db
+
+_MISSING_EXPERIENCE = -1
+
+
+class ApplicantColumns:
+    """
+    A columnar snapshot of the competences and availabilities of all
+    applicants, ranked against job profiles with vectorized operations.
+
+    Every applicant is a row. The years of experience are kept in hundredths
+    in a matrix of 16-bit integers with a column per competence, which is
+    exact like the Numeric(4, 2) database column, and -1 for competences an
+    applicant lacks. The availabilities are kept in parallel arrays of the
+    start day, end day and row of each, with days as proleptic Gregorian
+    ordinals. Overlapping availabilities of an applicant, which legacy or
+    imported rows may have, are merged into one.
+
+    The arrays have spare rows and columns, like the matrix of
+    AvailabilityBitmaps, and double in size when they run out of them.
+    Extending the latest snapshot fills its spare rows in place and shares
+    the arrays with the extended snapshot, so adding applicants takes time
+    in their number rather than in the number of applicants. The rows in use
+    by a snapshot are never changed, so it can be ranked while it is
+    extended, and extending any other snapshot copies the arrays.
+
+    :ivar person_ids: The person ID of every row.
+    :ivar competence_columns: The column of every competence ID.
+    :ivar experience: The years of experience in hundredths by row and
+          column.
+    :ivar starts: The start day of every availability.
+    :ivar ends: The end day of every availability.
+    :ivar rows: The row of the applicant of every availability.
+    """
+
+    def __init__(self, person_ids: np.ndarray, competence_columns: dict,
+                 experience: np.ndarray, starts: np.ndarray,
+                 ends: np.ndarray, rows: np.ndarray,
+                 count: Optional[int] = None,
+                 availability_count: Optional[int] = None) -> None:
+        """
+        Initializes a new ApplicantColumns object.
+
+        :param person_ids: The person ID of every row.
+        :param competence_columns: The column of every competence ID.
+        :param experience: The years of experience in hundredths by row and
+               column.
+        :param starts: The start day of every availability.
+        :param ends: The end day of every availability.
+        :param rows: The row of the applicant of every availability.
+        :param count: The number of rows in use, all of them by default.
+        :param availability_count: The number of availabilities in use, all
+               of them by default.
+        """
+
+        count = len(person_ids) if count is None else count
+        availability_count = (len(starts) if availability_count is None
+                              else availability_count)
+        self.person_ids = person_ids[:count]
+        self.competence_columns = competence_columns
+        self.experience = experience[:count]
+        self.starts = starts[:availability_count]
+        self.ends = ends[:availability_count]
+        self.rows = rows[:availability_count]
+        self._arrays = (person_ids, experience, starts, ends, rows)
+        self._filled = [count, availability_count]
+
+    @classmethod
+    def empty(cls) -> 'ApplicantColumns':
+        """
+        Create a snapshot without applicants.
+
+        :returns: The empty snapshot.
+        """
+
+        return cls(np.empty(0, np.int64), {},
+                   np.empty((0, 0), np.int16), np.empty(0, np.int32),
+                   np.empty(0, np.int32), np.empty(0, np.int32))
+
+    def __len__(self) -> int:
+        """
+        Get the number of applicants in the snapshot.
+
+        :returns: The number of applicants.
+        """
+
+        return len(self.person_ids)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        The number of bytes used by the arrays of the snapshot, including
+        their spare rows and columns.
+        """
+
+        return sum(values.nbytes for values in self._arrays)
+
+    def extend(self, competences: Iterable[tuple[int, int, Decimal]],
+               availabilities: Iterable[tuple[int, int, int]]
+               ) -> 'ApplicantColumns':
+        """
+        Create a snapshot with rows added for new applicants.
+
+        Since an application is never changed once stored, the competences
+        and availabilities of applicants already in the snapshot are
+        ignored.
+
+        :param competences: The person ID, competence ID and years of
+               experience of every competence.
+        :param availabilities: The person ID, start day and end day of every
+               availability.
+        :returns: The extended snapshot, or this one if there are no new
+                  applicants.
+        """
+
+        competence_rows = np.array(
+                [(person_id, competence_id, round(years * 100))
+                 for person_id, competence_id, years in competences],
+                np.int64).reshape(-1, 3)
+        availability_rows = np.array(list(availabilities),
+                                     np.int64).reshape(-1, 3)
+
+        person_ids = np.unique(np.concatenate(
+                (competence_rows[:, 0], availability_rows[:, 0])))
+        person_ids = person_ids[~np.isin(person_ids, self.person_ids)]
+        if not len(person_ids):
+            return self
+        competence_rows = competence_rows[
+                np.isin(competence_rows[:, 0], person_ids)]
+        availability_rows = self.__merge_overlapping(availability_rows[
+                np.isin(availability_rows[:, 0], person_ids)])
+
+        competence_columns = dict(self.competence_columns)
+        for competence_id in np.unique(competence_rows[:, 1]).tolist():
+            competence_columns.setdefault(
+                    competence_id, len(competence_columns))
+
+        count, availability_count = len(self.person_ids), len(self.starts)
+        new_count = count + len(person_ids)
+        new_availability_count = availability_count + len(availability_rows)
+        copy = self._filled != [count, availability_count]
+        person_id_array, experience, starts, ends, rows = self._arrays
+        person_id_array = self.__reserve(person_id_array, count,
+                                         (new_count,), 0, copy)
+        experience = self.__reserve(
+                experience, count, (new_count, len(competence_columns)),
+                _MISSING_EXPERIENCE, copy)
+        starts, ends, rows = (
+            self.__reserve(values, availability_count,
+                           (new_availability_count,), 0, copy)
+            for values in (starts, ends, rows))
+
+        person_id_array[count:new_count] = person_ids
+        experience[count + np.searchsorted(person_ids, competence_rows[:, 0]),
+                   [competence_columns[competence_id] for competence_id
+                    in competence_rows[:, 1].tolist()]] = \
+            competence_rows[:, 2]
+        starts[availability_count:new_availability_count] = \
+            availability_rows[:, 1]
+        ends[availability_count:new_availability_count] = \
+            availability_rows[:, 2]
+        rows[availability_count:new_availability_count] = \
+            count + np.searchsorted(person_ids, availability_rows[:, 0])
+
+        extended = ApplicantColumns(person_id_array, competence_columns,
+                                    experience, starts, ends, rows,
+                                    new_count, new_availability_count)
+        if not copy:
+            extended._filled = self._filled
+            self._filled[:] = [new_count, new_availability_count]
+        return extended
+
+    def rank(self, profile: JobProfile,
+             limit: int) -> list[tuple[int, float, float]]:
+        """
+        Rank the applicants against a job profile.
+
+        An applicant is eligible if they have at least the minimum years of
+        experience in every required competence and are available on some
+        day of the job. The score of an eligible applicant is the weighted
+        sum of their years of experience in the required competences, times
+        the fraction of the days of the job they are available. Since the
+        availabilities of an applicant in the snapshot never overlap, that
+        fraction is the sum of the overlaps of their availabilities with the
+        job.
+
+        The scores are computed for all applicants at once, and the best
+        ones are selected with a partial sort, which takes O(n) time rather
+        than the O(n log n) of sorting all of them.
+
+        :param profile: The job profile.
+        :param limit: The maximum number of applicants to return.
+        :returns: The person ID, score and availability fraction of the best
+                  eligible applicants, ordered by descending score and then
+                  by person ID.
+        """
+
+        if any(requirement.competence_id not in self.competence_columns
+               for requirement in profile.requirements):
+            return []
+
+        experience = self.experience[:, [
+            self.competence_columns[requirement.competence_id]
+            for requirement in profile.requirements]]
+        minimums = np.array([round(requirement.min_years * 100)
+                             for requirement in profile.requirements],
+                            np.int16)
+        weights = np.array([requirement.weight
+                            for requirement in profile.requirements])
+
+        low = profile.from_date.toordinal()
+        high = profile.to_date.toordinal()
+        overlaps = (np.minimum(self.ends, high)
+                    - np.maximum(self.starts, low) + 1)
+        np.maximum(overlaps, 0, out=overlaps)
+        coverage = np.bincount(self.rows, weights=overlaps,
+                               minlength=len(self.person_ids)) \
+            / (high - low + 1)
+
+        candidates = np.flatnonzero(
+                (experience >= minimums).all(axis=1) & (coverage > 0))
+        scores = experience[candidates] @ weights / 100 \
+            * coverage[candidates]
+
+        if len(candidates) > limit:
+            best = np.argpartition(-scores, limit - 1)[:limit]
+            candidates, scores = candidates[best], scores[best]
+        order = np.lexsort((self.person_ids[candidates], -scores))
+        candidates, scores = candidates[order], scores[order]
+
+        return list(zip(self.person_ids[candidates].tolist(),
+                        scores.tolist(), coverage[candidates].tolist()))
+
+    @staticmethod
+    def __merge_overlapping(availabilities: np.ndarray) -> np.ndarray:
+        """
+        Merge the overlapping availabilities of every person.
+
+        The availabilities are sorted by person and start day, and one
+        starts a new merged availability unless it starts on or before the
+        latest end day of the earlier availabilities of the same person.
+        That end day is a running maximum over the end days offset by a
+        multiple of 2**32 per person, so the maximum never carries over
+        from one person to the next.
+
+        :param availabilities: The person ID, start day and end day of every
+               availability, as an array of three columns.
+        :returns: The merged availabilities in the same form, ordered by
+                  person ID and start day.
+        """
+
+        if not len(availabilities):
+            return availabilities
+
+        person_ids, starts, ends = availabilities[np.lexsort(
+                (availabilities[:, 1], availabilities[:, 0]))].T
+        new_person = np.ones(len(person_ids), bool)
+        new_person[1:] = person_ids[1:] != person_ids[:-1]
+        offsets = np.cumsum(new_person) << 32
+        latest_ends = np.maximum.accumulate(ends + offsets) - offsets
+
+        first = new_person.copy()
+        first[1:] |= starts[1:] > latest_ends[:-1]
+        first_indices = np.flatnonzero(first)
+        return np.column_stack((person_ids[first_indices],
+                                starts[first_indices],
+                                np.maximum.reduceat(ends, first_indices)))
+
+    @staticmethod
+    def __reserve(values: np.ndarray, used: int, shape: tuple[int, ...],
+                  fill: int, copy: bool) -> np.ndarray:
+        """
+        Make room for rows and columns in an array.
+
+        :param values: The array.
+        :param used: The number of rows in use.
+        :param shape: The number of rows, and of columns for a matrix,
+               needed.
+        :param fill: The value of the elements not in use.
+        :param copy: Whether to copy the array even if it has room.
+        :returns: The array if it has room and copy is False, or else a copy
+                  of the rows in use with at least twice the rows or columns
+                  the array lacked.
+        """
+
+        if not copy and all(needed <= size for needed, size
+                            in zip(shape, values.shape)):
+            return values
+
+        reserved = np.full(
+                tuple(size if needed <= size else max(needed, 2 * size)
+                      for needed, size in zip(shape, values.shape)),
+                fill, values.dtype)
+        reserved[(slice(0, used),) + tuple(
+                slice(0, size) for size in values.shape[1:])] = values[:used]
+        return reserved
+
+
+class ApplicantRanking:
+    """
+    Holds the competences and availabilities of all applicants in columnar
+    form for the current worker.
+
+    The snapshot is loaded from the database on first use and reloaded once
+    its time to live has expired, so that submissions to other workers are
+    picked up. Applications stored by this worker are collected and added
+    to the snapshot before the next ranking, so they are ranked right away.
+    Reloads are single-flight, like those of the availability index.
+
+    :ivar ttl: The number of seconds a loaded snapshot is considered fresh.
+    """
+
+    def __init__(self, ttl: float = 300) -> None:
+        """
+        Initializes a new ApplicantRanking object.
+
+        :param ttl: The number of seconds a loaded snapshot is considered
+               fresh.
+        """
+
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._delta_lock = threading.Lock()
+        self._columns: Optional[ApplicantColumns] = None
+        self._delta: list[ApplicationRecord] = []
+        self._expires_at = 0.0
+
+    @property
+    def nbytes(self) -> int:
+        """
+        The number of bytes used by the arrays of the loaded snapshot, or 0
+        if the ranking has not been loaded.
+        """
+
+        columns = self._columns
+        return 0 if columns is None else columns.nbytes
+
+    def init_app(self, app: Flask) -> None:
+        """
+        Configures the ranking for a Flask application.
+
+        This function reads the time to live from the application
+        configuration and discards any loaded snapshot.
+
+        :param app: The Flask application.
+        """
+
+        self.ttl = app.config.get('APPLICANT_RANKING_TTL', 300)
+        with self._delta_lock:
+            self._columns = None
+            self._delta = []
+        app.extensions['applicant_ranking'] = self
+
+    def add(self, applications: Iterable[ApplicationRecord]) -> None:
+        """
+        Add stored applications to the ranking.
+
+        Nothing is added before the snapshot has been loaded, since loading
+        it reads them from the database.
+
+        :param applications: The stored applications.
+        """
+
+        if self._columns is None:
+            return
+
+        with self._delta_lock:
+            self._delta.extend(applications)
+
+    def rank(self, profile: JobProfile,
+             limit: int) -> list[tuple[int, float, float]]:
+        """
+        Rank the applicants against a job profile.
+
+        :param profile: The job profile.
+        :param limit: The maximum number of applicants to return.
+        :returns: The person ID, score and availability fraction of the best
+                  eligible applicants, see ApplicantColumns.rank.
+        :raises SQLAlchemyError: If the snapshot could not be loaded.
+        """
+
+        return self.__get().rank(profile, limit)
+
+    def __get(self) -> ApplicantColumns:
+        """
+        Get the current snapshot with the added applications, loading it if
+        it is missing or has expired.
+
+        :returns: The snapshot.
+        """
+
+        columns = self._columns
+        if columns is None or time.monotonic() >= self._expires_at:
+            if self._lock.acquire(blocking=columns is None):
+                try:
+                    if (self._columns is None
+                            or time.monotonic() >= self._expires_at):
+                        self.__load()
+                finally:
+                    self._lock.release()
+
+        with self._delta_lock:
+            if self._delta:
+                self._columns = self._columns.extend(  # type: ignore
+                        ((competence.person_id, competence.competence_id,
+                          competence.years_of_experience)
+                         for application in self._delta
+                         for competence in application.competences),
+                        ((availability.person_id,
+                          availability.from_date.toordinal(),
+                          availability.to_date.toordinal())
+                         for application in self._delta
+                         for availability in application.availabilities))
+                self._delta = []
+            return self._columns  # type: ignore[return-value]
+
+    def __load(self) -> None:
+        """
+        Load the snapshot from the database.
+
+        Applications added while the snapshot is loaded are kept, since the
+        load may or may not have read them.
+        """
+
+        with self._delta_lock:
+            added = len(self._delta)
+
+        start = time.perf_counter()
+        columns = ApplicantColumns.empty().extend(
+                get_competence_profiles_from_db(),
+                ((person_id, from_date.toordinal(), to_date.toordinal())
+                 for from_date, to_date, person_id
+                 in get_availabilities_from_db()))
+
+        with self._delta_lock:
+            self._delta = self._delta[added:]
+            self._columns = columns
+        self._expires_at = time.monotonic() + self.ttl
+        logging.info(f'Loaded {len(columns)} applicants into the ranking in '
+                     f'{time.perf_counter() - start:.3f}s')
+
+
+applicant_ranking = ApplicantRanking()
+
+
+def rank_applicants(profile: JobProfile, limit: int) -> dict:
+    """
+    Rank the applicants against a job profile.
+
+    :param profile: The validated job profile.
+    :param limit: The maximum number of applicants to return.
+    :returns: A dictionary with the ranked 'applicants', each with the
+              'person_id', the 'score' and the fraction of the days of the
+              job the applicant is available as 'coverage', both rounded to
+              four decimals.
+    :raises SQLAlchemyError: If there is an issue with the database operation.
+    """
+
+    try:
+        ranked = applicant_ranking.rank(profile, limit)
+    except SQLAlchemyError:
+        raise SQLAlchemyError({'error': 'DATABASE_ERROR'})
+
+    return {
+        'applicants': [{'person_id': person_id, 'score': round(score, 4),
+                        'coverage': round(coverage, 4)}
+                       for person_id, score, coverage in ranked]
+    }
@@ -0,0 +1,291 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from flask import Flask
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.models.records import ApplicationRecord, AvailabilityRecord, \
+    CompetenceRecord
+from app.repositories.application_repository import \
+    get_application_from_db, insert_applications_in_db
+from app.repositories.spool_repository import SubmissionSpool
+from app.services.applied_person_service import applied_persons
+from app.services.availability_service import availability_bitmaps, \
+    availability_index
+from app.services.ranking_service import applicant_ranking
+
+
+class SpoolDrainer:
+    """
+    Persists spooled applications to the database in the background.
+
+    When SUBMISSION_SPOOL_ENABLED is set, submitted applications are appended
+    to a SubmissionSpool instead of being inserted directly, and a drainer
+    thread per worker moves them to the database in batches, using one
+    database connection for a whole batch. The thread is started on first use
+    in every process, so it is not inherited across a fork. Applications left
+    in the spool by a stopped worker are drained once their claim expires.
+    Completed applications are pruned from the spool once they are older
+    than the retention.
+
+    :ivar spool: The SubmissionSpool, or None if spooling is disabled.
+    :ivar batch_size: The maximum number of applications per batch.
+    :ivar interval: The number of seconds to wait when the spool is empty.
+    :ivar claim_timeout: The number of seconds after which an application
+          claimed by another drainer is drained again.
+    :ivar retention: The number of seconds the state of a completed
+          application can be fetched.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes a new SpoolDrainer object.
+        """
+
+        self.spool: Optional[SubmissionSpool] = None
+        self.batch_size = 500
+        self.interval = 0.2
+        self.claim_timeout = 60.0
+        self.retention = 86400.0
+        self._pruned_at = 0.0
+        self._app: Optional[Flask] = None
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    def init_app(self, app: Flask) -> None:
+        """
+        Configures the drainer for a Flask application.
+
+        This function stops any running drainer and opens the spool if
+        SUBMISSION_SPOOL_ENABLED is set in the application configuration.
+        The spool must then be configured with an absolute
+        SUBMISSION_SPOOL_PATH on storage that survives restarts of the
+        worker.
+
+        :param app: The Flask application.
+        :raises RuntimeError: If the spool is enabled without an absolute
+                SUBMISSION_SPOOL_PATH.
+        """
+
+        self.stop()
+        self._app = app
+        self.spool = None
+        if app.config.get('SUBMISSION_SPOOL_ENABLED'):
+            path = app.config.get('SUBMISSION_SPOOL_PATH')
+            if not path or not os.path.isabs(path):
+                raise RuntimeError('SUBMISSION_SPOOL_PATH must be an '
+                                   'absolute path on persistent storage')
+            self.spool = SubmissionSpool(path)
+        self.batch_size = app.config.get('SUBMISSION_SPOOL_BATCH_SIZE', 500)
+        self.interval = app.config.get('SUBMISSION_SPOOL_INTERVAL', 0.2)
+        self.claim_timeout = app.config.get(
+                'SUBMISSION_SPOOL_CLAIM_TIMEOUT', 60.0)
+        self.retention = app.config.get('SUBMISSION_SPOOL_RETENTION',
+                                        86400.0)
+        app.extensions['submission_spool'] = self
+
+    def start(self) -> None:
+        """
+        Start the drainer thread of the current process if it is not running.
+        """
+
+        if self.spool is None or self._pid == os.getpid():
+            return
+
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(
+                    target=self.__run, name='spool-drainer', daemon=True)
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def stop(self) -> None:
+        """
+        Stop the drainer thread and wait for its current batch to finish.
+        """
+
+        with self._lock:
+            self._stopped.set()
+            if self._thread is not None and self._pid == os.getpid():
+                self._thread.join()
+            self._thread = None
+            self._pid = None
+
+    def drain(self) -> int:
+        """
+        Drain one batch of spooled applications into the database.
+
+        Applications of persons who have already applied are marked as
+        'Rejected', unless the stored application is the spooled one, which
+        happens when a drainer stopped after storing a batch but before
+        completing it. If the database operation fails, the batch is
+        released to be drained again.
+
+        :returns: The number of applications drained.
+        """
+
+        if self.spool is None or self._app is None:
+            return 0
+
+        batch = self.spool.claim(self.batch_size, self.claim_timeout)
+        if not batch:
+            return 0
+
+        with self._app.app_context():
+            try:
+                inserted = insert_applications_in_db(
+                        [application for _, application in batch])
+                stored = inserted | {
+                    application.person_id for _, application in batch
+                    if application.person_id not in inserted
+                    and self.__is_stored(application)}
+            except SQLAlchemyError:
+                logging.error(f'Failed to drain {len(batch)} spooled '
+                              f'applications')
+                self.spool.complete({tracking_id: 'Queued'
+                                     for tracking_id, _ in batch})
+                return 0
+
+        self.spool.complete({
+            tracking_id: ('Stored' if application.person_id in stored
+                          else 'Rejected')
+            for tracking_id, application in batch})
+        for _, application in batch:
+            applied_persons.add(application.person_id)
+            if application.person_id in inserted:
+                availability_index.add(application.availabilities)
+                availability_bitmaps.add(application.availabilities)
+        applicant_ranking.add(application for _, application in batch
+                              if application.person_id in inserted)
+        logging.info(f'Drained {len(batch)} spooled applications')
+        return len(batch)
+
+    def prune(self) -> int:
+        """
+        Delete the applications completed longer than the retention ago.
+
+        :returns: The number of applications deleted.
+        """
+
+        if self.spool is None:
+            return 0
+
+        pruned = self.spool.prune(time.time() - self.retention)
+        if pruned:
+            logging.info(f'Pruned {pruned} completed spooled applications')
+        return pruned
+
+    def __run(self) -> None:
+        """
+        Drain the spool until the drainer is stopped.
+
+        The next batch is drained immediately after a full one, otherwise
+        after waiting for the interval. The spool is pruned at most once a
+        minute while it is idle.
+        """
+
+        while True:
+            try:
+                drained = self.drain()
+                if not drained and time.monotonic() - self._pruned_at > 60:
+                    self._pruned_at = time.monotonic()
+                    self.prune()
+            except sqlite3.Error as exception:
+                logging.error(f'Failed to read the spool: {exception}')
+                drained = 0
+
+            if self._stopped.wait(
+                    0 if drained >= self.batch_size else self.interval):
+                return
+
+    @staticmethod
+    def __is_stored(application: ApplicationRecord) -> bool:
+        """
+        Check whether the stored application of a person is a spooled one.
+
+        :param application: The spooled application.
+        :returns: True if the person's stored application has the same
+                  competences and availabilities.
+        :raises SQLAlchemyError: If there is an issue with the database
+                operation.
+        """
+
+        stored = get_application_from_db(application.person_id)
+        if stored is None:
+            return False
+
+        return (sorted(stored[1].competences)
+                == sorted(application.competences)
+                and sorted(stored[1].availabilities)
+                == sorted(application.availabilities))
+
+
+submission_spool = SpoolDrainer()
+
+
+def spool_application(
+        person_id: int, competences: list[CompetenceRecord],
+        availabilities: list[AvailabilityRecord]) -> Optional[str]:
+    """
+    Spool an application.
+
+    This function appends a validated application to the submission spool,
+    from which it is stored in the database in the background. Whether the
+    person has already applied is only checked when the application is
+    drained, unless the person already has an application in the spool.
+
+    :param person_id: The ID of the person submitting the application.
+    :param competences: A list of CompetenceRecord objects representing the
+                        competences of the application.
+    :param availabilities: A list of AvailabilityRecord objects representing
+                           the availabilities of the application.
+    :returns: The tracking ID of the spooled application, or None if the
+              person already has an application in the spool.
+    :raises SQLAlchemyError: If the application could not be spooled.
+    """
+
+    spool = submission_spool.spool
+    if spool is None:
+        raise SQLAlchemyError({'error': 'DATABASE_ERROR'})
+
+    submission_spool.start()
+    try:
+        return spool.append(
+                ApplicationRecord(person_id, competences, availabilities))
+    except sqlite3.Error:
+        raise SQLAlchemyError({'error': 'DATABASE_ERROR'})
+
+
+def get_spooled_application_status(person_id: int,
+                                   tracking_id: str) -> Optional[str]:
+    """
+    Get the status of a spooled application.
+
+    :param person_id: The ID of the person who submitted the application.
+    :param tracking_id: The tracking ID of the application.
+    :returns: 'Queued', 'Draining', 'Stored' or 'Rejected', or None if the
+              person has no spooled application with the tracking ID.
+    :raises SQLAlchemyError: If the spool could not be read.
+    """
+
+    spool = submission_spool.spool
+    if spool is None:
+        return None
+
+    submission_spool.start()
+    try:
+        spooled = spool.get(tracking_id)
+    except sqlite3.Error:
+        raise SQLAlchemyError({'error': 'DATABASE_ERROR'})
+
+    if spooled is None or spooled[0] != person_id:
+        return None
+    return spooled[1]
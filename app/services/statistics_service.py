@@ -0,0 +1,81 @@
+import logging
+import time
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.repositories.statistics_repository import \
+    YEARS_OF_EXPERIENCE_BUCKETS, get_application_statistics_from_db, \
+    rebuild_application_statistics_in_db
+
+
+def fetch_application_statistics() -> dict:
+    """
+    Fetch the aggregate statistics of the applications.
+
+    The statistics are read from counters maintained as applications are
+    inserted, so this takes time proportional to the number of competences
+    rather than to the number of applications.
+
+    :returns: A dictionary with the number of 'applications' by status, the
+              lower bounds of the 'years_of_experience_buckets', and the
+              'competences' ordered by ID, each with the 'competence_id',
+              the number of 'applicants' who have it and the number of them
+              in each bucket as 'years_of_experience'.
+    :raises SQLAlchemyError: If there is an issue with the database operation.
+    """
+
+    try:
+        counters = get_application_statistics_from_db()
+    except SQLAlchemyError:
+        raise SQLAlchemyError({'error': 'DATABASE_ERROR'})
+
+    statuses: dict[str, int] = {}
+    competences: dict[int, dict] = {}
+    for statistic, key, count in counters:
+        if statistic == 'status':
+            statuses[key] = count
+            continue
+
+        competence_id, _, bucket = key.partition(':')
+        competence = competences.setdefault(int(competence_id), {
+            'competence_id': int(competence_id),
+            'applicants': 0,
+            'years_of_experience': [0] * len(YEARS_OF_EXPERIENCE_BUCKETS)
+        })
+        if statistic == 'competence':
+            competence['applicants'] = count
+        else:
+            competence['years_of_experience'][
+                YEARS_OF_EXPERIENCE_BUCKETS.index(int(bucket))] = count
+
+    return {
+        'applications': dict(sorted(statuses.items())),
+        'years_of_experience_buckets': list(YEARS_OF_EXPERIENCE_BUCKETS),
+        'competences': [competences[competence_id]
+                        for competence_id in sorted(competences)]
+    }
+
+
+def rebuild_application_statistics() -> dict:
+    """
+    Rebuild the aggregate statistics of the applications.
+
+    This function recomputes the counters from the applications, which
+    corrects any drift, for example after statuses have been changed by
+    other services.
+
+    :returns: A dictionary with the number of 'counters' and the elapsed
+              'seconds'.
+    :raises SQLAlchemyError: If there is an issue with the database operation.
+    """
+
+    start = time.perf_counter()
+    try:
+        counters = rebuild_application_statistics_in_db()
+    except SQLAlchemyError:
+        raise SQLAlchemyError({'error': 'DATABASE_ERROR'})
+
+    seconds = time.perf_counter() - start
+    logging.info(f'Rebuilt {counters} application statistics in '
+                 f'{seconds:.3f}s')
+    return {'counters': counters, 'seconds': round(seconds, 3)}
@@ -0,0 +1,464 @@
+import math
+import re
+from datetime import date, timedelta
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any, Callable, NamedTuple, Optional
+
+from flask import current_app
+from sqlalchemy.exc import NoResultFound, SQLAlchemyError
+
+from app.models.records import AvailabilityRecord, CompetenceRecord, \
+    JobProfile, JobRequirement
+from app.services.competences_service import fetch_competence_catalog
+
+
+class ValidationResult(NamedTuple):
+    """
+    Represents the outcome of validating a submitted application.
+
+    :ivar competences: The validated competences.
+    :ivar availabilities: The validated availabilities.
+    :ivar errors: A list of dictionaries, each with the 'field' the error
+          refers to and the 'error' code. Empty if the application is valid.
+    """
+
+    competences: list[CompetenceRecord]
+    availabilities: list[AvailabilityRecord]
+    errors: list[dict]
+
+
+class ValidationContext:
+    """
+    Holds the state shared by the validators of one application.
+
+    :ivar person_id: The ID of the person submitting the application.
+    :ivar seen_competence_ids: The valid competence IDs seen so far.
+    """
+
+    def __init__(self, person_id: int,
+                 valid_competences: Optional[dict] = None) -> None:
+        """
+        Initializes a new ValidationContext object.
+
+        :param person_id: The ID of the person submitting the application.
+        :param valid_competences: The valid competences keyed by competence
+               ID, or None to fetch them from the competence catalog when
+               needed.
+        """
+
+        self.person_id = person_id
+        self.seen_competence_ids: set = set()
+        self._valid_competences = valid_competences
+
+    @property
+    def valid_competences(self) -> dict:
+        """
+        The valid competences keyed by competence ID.
+
+        The competence catalog is only fetched when the application contains
+        a competence to validate.
+
+        :raises SQLAlchemyError: If there is an issue with the database
+                operation.
+        """
+
+        if self._valid_competences is None:
+            try:
+                self._valid_competences = fetch_competence_catalog().index
+            except NoResultFound:
+                self._valid_competences = {}
+            except SQLAlchemyError:
+                raise SQLAlchemyError({'error': 'DATABASE_ERROR'})
+        return self._valid_competences
+
+
+Parser = Callable[[Any, ValidationContext], tuple[Any, Optional[str]]]
+Validator = Callable[[Any, ValidationContext, str, list], Any]
+
+_YEARS_OF_EXPERIENCE_PATTERN = re.compile(r'\s*\d+(\.\d*)?\s*')
+_MAX_YEARS_OF_EXPERIENCE = Decimal(100)
+_MAX_WEIGHT = 100
+_HUNDREDTH = Decimal('0.01')
+_ONE_DAY = timedelta(days=1)
+
+
+def __parse_competence_id(
+        value: Any, context: ValidationContext) -> tuple[Any, Optional[str]]:
+    """
+    Parse a competence ID.
+
+    :param value: The submitted competence ID.
+    :param context: The validation context of the application.
+    :returns: The competence ID and None, or None and an error code if the
+              competence ID is not in the catalog or already seen.
+    """
+
+    if type(value) is not int or value not in context.valid_competences:
+        return None, 'INVALID_COMPETENCE_ID'
+
+    if value in context.seen_competence_ids:
+        return None, 'DUPLICATE_COMPETENCE_ID'
+    context.seen_competence_ids.add(value)
+
+    return value, None
+
+
+def __parse_years_of_experience(
+        value: Any, context: ValidationContext) -> tuple[Any, Optional[str]]:
+    """
+    Parse a number of years of experience.
+
+    The value may be a number or a decimal string. It is converted to a
+    Decimal rounded to two decimals, matching the database column, without
+    passing through a float.
+
+    :param value: The submitted years of experience.
+    :param context: The validation context of the application.
+    :returns: The years of experience and None, or None and an error code if
+              the value is not a non-negative number below 100.
+    """
+
+    if type(value) is str:
+        if not _YEARS_OF_EXPERIENCE_PATTERN.fullmatch(value):
+            return None, 'INVALID_YEARS_OF_EXPERIENCE'
+        years = Decimal(value.strip())
+    elif type(value) is int or (type(value) is float
+                                and math.isfinite(value)):
+        years = Decimal(str(value))
+    else:
+        return None, 'INVALID_YEARS_OF_EXPERIENCE'
+
+    if years < 0 or years >= _MAX_YEARS_OF_EXPERIENCE:
+        return None, 'INVALID_YEARS_OF_EXPERIENCE'
+
+    return years.quantize(_HUNDREDTH, rounding=ROUND_HALF_UP), None
+
+
+def __parse_weight(
+        value: Any, context: ValidationContext) -> tuple[Any, Optional[str]]:
+    """
+    Parse the weight of a job requirement.
+
+    :param value: The submitted weight.
+    :param context: The validation context of the job profile.
+    :returns: The weight as a float and None, or None and an error code if
+              the value is not a number above 0 and at most 100.
+    """
+
+    if (type(value) is int or type(value) is float) \
+            and 0 < value <= _MAX_WEIGHT:
+        return float(value), None
+    return None, 'INVALID_WEIGHT'
+
+
+def __parse_date(
+        value: Any, context: ValidationContext) -> tuple[Any, Optional[str]]:
+    """
+    Parse a date in the format YYYY-MM-DD.
+
+    :param value: The submitted date.
+    :param context: The validation context of the application.
+    :returns: The date and None, or None and an error code if the value is
+              not a valid date in the expected format.
+    """
+
+    if (type(value) is str and len(value) == 10 and value.isascii()
+            and value[4] == '-' and value[7] == '-'
+            and value[:4].isdigit() and value[5:7].isdigit()
+            and value[8:].isdigit()):
+        year, month, day = int(value[:4]), int(value[5:7]), int(value[8:])
+        if (year >= 1 and 1 <= month <= 12
+                and 1 <= day <= __days_in_month(year, month)):
+            return date(year, month, day), None
+
+    return None, 'INVALID_DATE_FORMAT'
+
+
+def __days_in_month(year: int, month: int) -> int:
+    """
+    Get the number of days in a month.
+
+    :param year: The year.
+    :param month: The month, from 1 to 12.
+    :returns: The number of days in the month.
+    """
+
+    if month == 2:
+        leap_year = year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+        return 29 if leap_year else 28
+    return 30 if month in (4, 6, 9, 11) else 31
+
+
+def __check_date_range(values: list) -> Optional[str]:
+    """
+    Check that an availability does not end before it starts.
+
+    :param values: The parsed from date and to date.
+    :returns: An error code, or None if the date range is valid.
+    """
+
+    from_date, to_date = values
+    return 'INVALID_DATE_RANGE' if from_date > to_date else None
+
+
+def __compile_object(
+        type_error: str, fields: tuple[tuple[str, str, Parser], ...],
+        record_type: Callable[..., Any],
+        check: Optional[Callable[[list], Optional[str]]] = None) -> Validator:
+    """
+    Compile an object schema into a validator.
+
+    The schema is a tuple of fields, each a tuple of the key, the error code
+    when the key is missing and the parser of its value. The returned
+    validator first checks that all keys are present and then parses every
+    value, appending errors to the list it is given instead of raising.
+
+    :param type_error: The error code when the item is not an object.
+    :param fields: The fields of the object.
+    :param record_type: The record created from the person ID and the parsed
+           values.
+    :param check: An optional check of the parsed values as a whole.
+    :returns: A validator taking the item, the validation context, the path
+              of the item and the list of errors, returning the record or
+              None if the item is invalid.
+    """
+
+    keys = tuple((key, missing_error) for key, missing_error, _ in fields)
+    parsers = tuple((key, parser) for key, _, parser in fields)
+
+    def validate(item: Any, context: ValidationContext, path: str,
+                 errors: list) -> Any:
+        if type(item) is not dict:
+            errors.append({'field': path, 'error': type_error})
+            return None
+
+        missing = False
+        for key, missing_error in keys:
+            if key not in item:
+                errors.append({'field': f'{path}.{key}',
+                               'error': missing_error})
+                missing = True
+        if missing:
+            return None
+
+        values = []
+        invalid = False
+        for key, parser in parsers:
+            value, error = parser(item[key], context)
+            if error is not None:
+                errors.append({'field': f'{path}.{key}', 'error': error})
+                invalid = True
+            values.append(value)
+        if invalid:
+            return None
+
+        if check is not None:
+            error = check(values)
+            if error is not None:
+                errors.append({'field': path, 'error': error})
+                return None
+
+        return record_type(context.person_id, *values)
+
+    return validate
+
+
+def __compile_list(item_validator: Validator,
+                   empty_error: Optional[str] = None) -> Validator:
+    """
+    Compile a list schema into a validator.
+
+    :param item_validator: The validator of the list items.
+    :param empty_error: The error code when the list is empty, or None if
+           the list may be empty.
+    :returns: A validator taking the list, the validation context, the path
+              of the list and the list of errors, returning the valid
+              records.
+    """
+
+    def validate(items: Any, context: ValidationContext, path: str,
+                 errors: list) -> list:
+        if type(items) is not list:
+            errors.append({'field': path,
+                           'error': 'INVALID_PAYLOAD_STRUCTURE'})
+            return []
+
+        if not items and empty_error is not None:
+            errors.append({'field': path, 'error': empty_error})
+            return []
+
+        records = [item_validator(item, context, f'{path}[{index}]', errors)
+                   for index, item in enumerate(items)]
+        return [record for record in records if record is not None]
+
+    return validate
+
+
+__validate_competences = __compile_list(__compile_object(
+        'INVALID_COMPETENCE',
+        (('competence_id', 'MISSING_COMPETENCE_ID', __parse_competence_id),
+         ('years_of_experience', 'MISSING_YEARS_OF_EXPERIENCE',
+          __parse_years_of_experience)),
+        CompetenceRecord))
+
+__validate_availabilities = __compile_list(
+        empty_error='MISSING_AVAILABILITIES',
+        item_validator=__compile_object(
+                'INVALID_AVAILABILITY',
+                (('from_date', 'MISSING_FROM_DATE', __parse_date),
+                 ('to_date', 'MISSING_TO_DATE', __parse_date)),
+                AvailabilityRecord, __check_date_range))
+
+
+def __job_requirement(person_id: int, competence_id: int, min_years: Decimal,
+                      weight: float) -> JobRequirement:
+    """
+    Create a job requirement from its parsed values.
+
+    :param person_id: The ID of the person ranking applicants, unused.
+    :param competence_id: The ID of the required competence.
+    :param min_years: The minimum years of experience.
+    :param weight: The weight of the requirement.
+    :returns: The JobRequirement.
+    """
+
+    return JobRequirement(competence_id, min_years, weight)
+
+
+__validate_requirements = __compile_list(
+        empty_error='MISSING_COMPETENCES',
+        item_validator=__compile_object(
+                'INVALID_COMPETENCE',
+                (('competence_id', 'MISSING_COMPETENCE_ID',
+                  __parse_competence_id),
+                 ('min_years', 'MISSING_MIN_YEARS',
+                  __parse_years_of_experience),
+                 ('weight', 'MISSING_WEIGHT', __parse_weight)),
+                __job_requirement))
+
+__validate_window = __compile_object(
+        'INVALID_WINDOW',
+        (('from_date', 'MISSING_FROM_DATE', __parse_date),
+         ('to_date', 'MISSING_TO_DATE', __parse_date)),
+        AvailabilityRecord, __check_date_range)
+
+
+def validate_application(
+        person_id: int, application: Any,
+        valid_competences: Optional[dict] = None,
+        max_availabilities: Optional[int] = None) -> ValidationResult:
+    """
+    Validate a submitted application.
+
+    This function validates the competences and availabilities of an
+    application in a single pass, using validators compiled once from the
+    application schema. All errors are collected instead of stopping at the
+    first one. The competences are optional, while at least one and at most
+    MAX_AVAILABILITIES availabilities are required. Valid availabilities are
+    returned in canonical form, see canonicalize_availabilities. Callers
+    outside of a Flask application context pass the valid competences and
+    the maximum number of availabilities.
+
+    :param person_id: The ID of the person submitting the application.
+    :param application: The submitted application.
+    :param valid_competences: The valid competences keyed by competence ID,
+           or None to fetch them from the competence catalog when needed.
+    :param max_availabilities: The maximum number of availabilities, or
+           None to read MAX_AVAILABILITIES from the application
+           configuration.
+    :returns: A ValidationResult with the validated records and the errors.
+    :raises SQLAlchemyError: If the competence catalog could not be fetched.
+    """
+
+    errors: list[dict] = []
+
+    if type(application) is not dict:
+        errors.append({'field': '', 'error': 'INVALID_PAYLOAD_STRUCTURE'})
+        return ValidationResult([], [], errors)
+
+    context = ValidationContext(person_id, valid_competences)
+    competences = __validate_competences(
+            application.get('competences', []), context, 'competences',
+            errors)
+
+    if max_availabilities is None:
+        max_availabilities = current_app.config.get('MAX_AVAILABILITIES', 100)
+    availabilities = application.get('availabilities', [])
+    if (type(availabilities) is list
+            and len(availabilities) > max_availabilities):
+        errors.append({'field': 'availabilities',
+                       'error': 'TOO_MANY_AVAILABILITIES'})
+        availabilities = []
+    else:
+        availabilities = canonicalize_availabilities(
+                __validate_availabilities(
+                        availabilities, context, 'availabilities', errors))
+
+    return ValidationResult(competences, availabilities, errors)
+
+
+def canonicalize_availabilities(
+        availabilities: list[AvailabilityRecord]) -> list[AvailabilityRecord]:
+    """
+    Canonicalize the availabilities of an application.
+
+    This function sorts the availabilities and merges those that overlap or
+    are adjacent, so that the same days are covered by the fewest possible
+    non-overlapping availabilities. This takes O(n log n) time.
+
+    :param availabilities: The validated availabilities of one person.
+    :returns: The availabilities sorted by date with no overlapping or
+              adjacent ones.
+    """
+
+    if len(availabilities) < 2:
+        return availabilities
+
+    ordered = sorted(availabilities, key=lambda availability: (
+        availability.from_date, availability.to_date))
+
+    merged = [ordered[0]]
+    for availability in ordered[1:]:
+        last = merged[-1]
+        if availability.from_date <= last.to_date + _ONE_DAY:
+            if availability.to_date > last.to_date:
+                merged[-1] = last._replace(to_date=availability.to_date)
+        else:
+            merged.append(availability)
+
+    return merged
+
+
+def validate_job_profile(
+        person_id: int,
+        profile: Any) -> tuple[Optional[JobProfile], list[dict]]:
+    """
+    Validate a job profile to rank applicants against.
+
+    The profile holds a non-empty list of 'competences', each with a
+    'competence_id' from the catalog, the 'min_years' of experience and a
+    'weight', and a 'window' with the 'from_date' and 'to_date' of the job.
+    All errors are collected, like those of validate_application.
+
+    :param person_id: The ID of the person ranking applicants.
+    :param profile: The submitted job profile.
+    :returns: The JobProfile, or None if the profile is invalid, and a list of
+              dictionaries with the 'field' and 'error' of every error.
+    :raises SQLAlchemyError: If the competence catalog could not be fetched.
+    """
+
+    errors: list[dict] = []
+
+    if type(profile) is not dict:
+        errors.append({'field': '', 'error': 'INVALID_PAYLOAD_STRUCTURE'})
+        return None, errors
+
+    context = ValidationContext(person_id)
+    requirements = __validate_requirements(
+            profile.get('competences', []), context, 'competences', errors)
+    window = __validate_window(profile.get('window'), context, 'window',
+                               errors)
+
+    if errors:
+        return None, errors
+    return JobProfile(requirements, window.from_date, window.to_date), errors
@@ -0,0 +1,78 @@
+import functools
+import json
+import logging
+from typing import Any, Awaitable, Callable
+
+import jwt
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+
+from app.utilities.status_codes import StatusCodes
+
+
+class DefaultJSONResponse(JSONResponse):
+    """
+    A JSON response that serializes values such as dates and decimals as
+    strings, like the responses of the Flask application.
+    """
+
+    def render(self, content: Any) -> bytes:
+        """
+        Serialize the content of the response.
+
+        :param content: The content to serialize.
+        :returns: The JSON encoded content.
+        """
+
+        return json.dumps(content, default=str).encode()
+
+
+def jwt_required_async(
+        endpoint: Callable[[Request], Awaitable[Response]]
+) -> Callable[[Request], Awaitable[Response]]:
+    """
+    Require a valid access token for an ASGI endpoint.
+
+    The token is read from the Authorization header and verified with the
+    JWT_SECRET_KEY of the application configuration, and its claims are
+    stored as request.state.jwt. Only access tokens with the 'id' and
+    'role' claims are accepted. Requests without a valid token are
+    answered with the same errors as the JWT handlers of the Flask
+    application.
+
+    :param endpoint: The endpoint to protect.
+    :returns: The protected endpoint.
+    """
+
+    @functools.wraps(endpoint)
+    async def wrapper(request: Request) -> Response:
+        requester_ip = request.client.host if request.client else None
+
+        scheme, _, token = request.headers.get(
+                'Authorization', '').partition(' ')
+        if scheme != 'Bearer' or not token:
+            logging.warning(f'{requester_ip} - Unauthorized request: '
+                            f'Missing Authorization Header')
+            return DefaultJSONResponse({'error': 'UNAUTHORIZED'},
+                                       StatusCodes.UNAUTHORIZED)
+
+        try:
+            claims = jwt.decode(
+                    token, request.app.state.config['JWT_SECRET_KEY'],
+                    algorithms=['HS256'],
+                    options={'require': ['type', 'id', 'role']})
+            if claims['type'] != 'access':
+                raise jwt.InvalidTokenError('Only access tokens are allowed')
+        except jwt.ExpiredSignatureError:
+            logging.warning(f'{requester_ip} - Expired JWT token')
+            return DefaultJSONResponse({'error': 'TOKEN_EXPIRED'},
+                                       StatusCodes.UNAUTHORIZED)
+        except jwt.InvalidTokenError as error:
+            logging.warning(f'{requester_ip} - Invalid JWT provided: {error}')
+            return DefaultJSONResponse({'error': 'INVALID_TOKEN'},
+                                       StatusCodes.UNAUTHORIZED)
+
+        request.state.jwt = claims
+        return await endpoint(request)
+
+    return wrapper
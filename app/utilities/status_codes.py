@@ -4,6 +4,9 @@ class StatusCodes:
 
     :ivar OK: The request was successful.
     :ivar CREATED: The resource was created successfully.
+    :ivar ACCEPTED: The request was accepted for later processing.
+    :ivar NOT_MODIFIED: The resource has not changed since the client's
+          cached copy.
     :ivar BAD_REQUEST: The request was malformed.
     :ivar UNAUTHORIZED: The request was unauthorized.
     :ivar NOT_FOUND: The resource was not found.
@@ -13,6 +16,8 @@ class StatusCodes:
 
     OK = 200
     CREATED = 201
+    ACCEPTED = 202
+    NOT_MODIFIED = 304
     BAD_REQUEST = 400
     UNAUTHORIZED = 401
     NOT_FOUND = 404
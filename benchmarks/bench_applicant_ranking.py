@@ -0,0 +1,115 @@
+"""
+Ranking applicants against job profiles.
+
+Loads the given number of applicants into a SQLite database. Each applicant
+has three of ten competences and two availabilities within a year. Then
+times the ranking of a shortlist of 50 for job profiles of one to three
+competences in two ways. The first reads the competence profiles and
+availabilities on every request and scores them row by row in Python. The
+second uses the columnar ApplicantRanking. Also reports the load time and
+memory use of the ranking.
+
+Usage: python -m benchmarks.bench_applicant_ranking [applicants]
+"""
+import heapq
+import random
+import sys
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from app.models.records import ApplicationRecord, AvailabilityRecord, \
+    CompetenceRecord, JobProfile, JobRequirement
+from app.repositories.application_loader import load_applications_in_db
+from app.repositories.application_repository import \
+    get_availabilities_from_db, get_competence_profiles_from_db
+from app.services.ranking_service import applicant_ranking
+from benchmarks.utilities import create_benchmark_app
+
+FIRST_DAY = date(2024, 1, 1)
+SHORTLIST = 50
+RANKINGS = 5
+
+
+def main(applicants: int) -> None:
+    app = create_benchmark_app()
+    with app.app_context():
+        load_applications_in_db(__generate_applications(applicants))
+
+        profiles = [
+            JobProfile([JobRequirement(competence_id, Decimal(1),
+                                       float(competence_id))
+                        for competence_id in range(1, count + 1)],
+                       FIRST_DAY + timedelta(days=150),
+                       FIRST_DAY + timedelta(days=180))
+            for count in (1, 2, 3)]
+
+        start = time.perf_counter()
+        applicant_ranking.rank(profiles[0], SHORTLIST)
+        load_seconds = time.perf_counter() - start
+        nbytes = applicant_ranking.nbytes
+        print(f'{applicants} applicants, ranking loaded in '
+              f'{load_seconds:.1f}s using {nbytes / 2 ** 20:.1f} MiB '
+              f'({nbytes / applicants:.0f} bytes per applicant)')
+
+        for profile in profiles:
+            scan = __time(lambda: __rank_by_scan(profile))
+            ranking = __time(
+                    lambda: applicant_ranking.rank(profile, SHORTLIST))
+            print(f'{len(profile.requirements)} competences  '
+                  f'scan {scan * 1000:8.1f} ms/ranking  '
+                  f'columnar {ranking * 1000:6.1f} ms/ranking')
+
+
+def __rank_by_scan(profile: JobProfile) -> list[tuple[float, int]]:
+    low = profile.from_date.toordinal()
+    high = profile.to_date.toordinal()
+    years: dict[int, dict[int, Decimal]] = {}
+    for person_id, competence_id, value in get_competence_profiles_from_db():
+        years.setdefault(person_id, {})[competence_id] = value
+    covered: dict[int, int] = {}
+    for from_date, to_date, person_id in get_availabilities_from_db():
+        overlap = (min(to_date.toordinal(), high)
+                   - max(from_date.toordinal(), low) + 1)
+        if overlap > 0:
+            covered[person_id] = covered.get(person_id, 0) + overlap
+
+    scores = []
+    for person_id, days in covered.items():
+        experience = years.get(person_id, {})
+        if all(experience.get(requirement.competence_id, -1)
+               >= requirement.min_years
+               for requirement in profile.requirements):
+            scores.append((sum(
+                    requirement.weight
+                    * float(experience[requirement.competence_id])
+                    for requirement in profile.requirements)
+                    * days / (high - low + 1), person_id))
+    return heapq.nlargest(SHORTLIST, scores)
+
+
+def __time(rank) -> float:
+    start = time.perf_counter()
+    for _ in range(RANKINGS):
+        rank()
+    return (time.perf_counter() - start) / RANKINGS
+
+
+def __generate_applications(applicants: int):
+    generator = random.Random(1)
+    for person_id in range(1, applicants + 1):
+        competences = [
+            CompetenceRecord(person_id, competence_id,
+                             Decimal(generator.randrange(1000)) / 100)
+            for competence_id in generator.sample(range(1, 11), 3)]
+        start = FIRST_DAY + timedelta(days=generator.randrange(300))
+        end = start + timedelta(days=generator.randrange(30))
+        availabilities = [
+            AvailabilityRecord(person_id, start, end),
+            AvailabilityRecord(person_id, end + timedelta(days=10),
+                               end + timedelta(days=40))]
+        yield ApplicationRecord(person_id, competences, availabilities)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,53 @@
+"""
+Submissions per second through the ORM and the bulk insert paths.
+
+Stores applications with two competences and 1, 20 and 200 availabilities
+through store_application, as records like those returned by
+validate_application, once with the ORM unit of work and once with
+APPLICATION_BULK_INSERT enabled.
+
+Usage: python -m benchmarks.bench_application_insert [submissions]
+"""
+import sys
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from app.models.records import AvailabilityRecord, CompetenceRecord
+from app.services.application_service import store_application
+from benchmarks.utilities import create_benchmark_app
+
+
+def main(submissions: int) -> None:
+    app = create_benchmark_app()
+    person_id = 0
+
+    print(f'{submissions} submissions per measurement')
+    for availability_count in (1, 20, 200):
+        for bulk_insert in (False, True):
+            app.config['APPLICATION_BULK_INSERT'] = bulk_insert
+
+            with app.app_context():
+                start = time.perf_counter()
+                for _ in range(submissions):
+                    person_id += 1
+                    store_application(
+                            person_id,
+                            [CompetenceRecord(person_id, 1,
+                                              Decimal('2.50')),
+                             CompetenceRecord(person_id, 2,
+                                              Decimal('4.00'))],
+                            [AvailabilityRecord(
+                                    person_id,
+                                    date(2024, 1, 1) + timedelta(days=3 * i),
+                                    date(2024, 1, 2) + timedelta(days=3 * i))
+                             for i in range(availability_count)])
+                elapsed = time.perf_counter() - start
+
+            path = 'bulk' if bulk_insert else 'orm'
+            print(f'{availability_count:4} availabilities {path:5} '
+                  f'{submissions / elapsed:10.0f} submissions/s')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 300)
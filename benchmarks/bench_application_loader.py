@@ -0,0 +1,71 @@
+"""
+Rows per second of the application loader and the chunked batch insert.
+
+Loads synthetic applications with two competences and two availabilities
+each, once with load_applications_in_db (COPY on PostgreSQL, multi-row
+inserts elsewhere) and once with insert_applications_in_db. Runs on a
+temporary SQLite database, and also on PostgreSQL if BENCHMARK_POSTGRES_URL
+is set. The tables of that database are dropped and recreated.
+
+Usage: python -m benchmarks.bench_application_loader [applications]
+"""
+import itertools
+import os
+import sys
+import time
+from datetime import date
+from decimal import Decimal
+
+from app.extensions import database
+from app.models.records import ApplicationRecord, AvailabilityRecord, \
+    CompetenceRecord
+from app.repositories.application_loader import load_applications_in_db
+from app.repositories.application_repository import insert_applications_in_db
+from benchmarks.utilities import create_benchmark_app
+
+
+def generate_applications(first_person_id: int, count: int):
+    for person_id in range(first_person_id, first_person_id + count):
+        yield ApplicationRecord(
+                person_id,
+                [CompetenceRecord(person_id, 1, Decimal('2.50')),
+                 CompetenceRecord(person_id, 2, Decimal('4.00'))],
+                [AvailabilityRecord(person_id, date(2024, 1, 1),
+                                    date(2024, 1, 31)),
+                 AvailabilityRecord(person_id, date(2024, 3, 1),
+                                    date(2024, 5, 31))])
+
+
+def run(database_url: str, count: int) -> None:
+    app = create_benchmark_app(database_url)
+
+    with app.app_context():
+        database.drop_all()
+        database.create_all()
+
+        statistics = load_applications_in_db(
+                generate_applications(1, count))
+        print(f'{database.engine.dialect.name:10} loader       '
+              f'{statistics["rows_per_second"]:10} rows/s')
+
+        start = time.perf_counter()
+        applications = generate_applications(count + 1, count)
+        while True:
+            chunk = list(itertools.islice(applications, 1000))
+            if not chunk:
+                break
+            insert_applications_in_db(chunk)
+        rows_per_second = 5 * count / (time.perf_counter() - start)
+        print(f'{database.engine.dialect.name:10} batch insert '
+              f'{rows_per_second:10.0f} rows/s')
+
+
+def main(count: int) -> None:
+    print(f'{count} applications, {5 * count} rows per measurement')
+    run('', count)
+    if os.environ.get('BENCHMARK_POSTGRES_URL'):
+        run(os.environ['BENCHMARK_POSTGRES_URL'], count)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,69 @@
+"""
+Memory and lookup speed of the applied person filter.
+
+Loads the given number of applicants, spread over three times as many
+person IDs, into an AppliedPersonFilter and compares its memory use and
+lookups per second with a set of ints and with querying the application
+status table of a SQLite database.
+
+Usage: python -m benchmarks.bench_applied_person_filter [applicants]
+"""
+import random
+import sys
+import time
+import tracemalloc
+
+from app.models.records import ApplicationRecord
+from app.repositories.application_loader import load_applications_in_db
+from app.services.applied_person_service import AppliedPersonFilter
+from app.services.application_service import already_applied
+from benchmarks.utilities import create_benchmark_app
+
+LOOKUPS = 200000
+DATABASE_LOOKUPS = 5000
+
+
+def main(applicants: int) -> None:
+    person_ids = sorted(random.Random(1).sample(range(1, 3 * applicants),
+                                                applicants))
+    probes = random.Random(2).choices(range(1, 3 * applicants), k=LOOKUPS)
+
+    tracemalloc.start()
+    person_filter = AppliedPersonFilter()
+    person_filter.load(person_ids)
+    filter_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    person_set = set(person_ids)
+    set_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print(f'{applicants} applicants')
+    print(f'filter {filter_bytes / 2 ** 20:8.1f} MiB '
+          f'{__lookups_per_second(person_filter, probes):12.0f} lookups/s')
+    print(f'set    {set_bytes / 2 ** 20:8.1f} MiB '
+          f'{__lookups_per_second(person_set, probes):12.0f} lookups/s')
+
+    app = create_benchmark_app()
+    app.config['APPLIED_PERSON_FILTER'] = False
+    with app.app_context():
+        load_applications_in_db(ApplicationRecord(person_id, [], [])
+                                for person_id in person_ids)
+
+        start = time.perf_counter()
+        for person_id in probes[:DATABASE_LOOKUPS]:
+            already_applied(person_id)
+        elapsed = time.perf_counter() - start
+    print(f'query  {"":8} {DATABASE_LOOKUPS / elapsed:16.0f} lookups/s')
+
+
+def __lookups_per_second(person_ids, probes: list[int]) -> float:
+    start = time.perf_counter()
+    for person_id in probes:
+        person_id in person_ids
+    return len(probes) / (time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,95 @@
+"""
+Availability coverage searches on day bitmaps.
+
+Loads the given number of applicants, each with four availabilities within
+two years, into a SQLite database. Then times searches for the applicants
+available on every day and on at least half of the days of windows of a
+week, a month and a quarter, answered by the availability bitmaps and by
+scanning the availability rows in memory, and reports the load time and
+memory use of the bitmaps per applicant.
+
+Usage: python -m benchmarks.bench_availability_coverage [applicants]
+"""
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+from app.models.records import ApplicationRecord, AvailabilityRecord
+from app.repositories.application_loader import load_applications_in_db
+from app.repositories.application_repository import \
+    get_availabilities_from_db
+from app.services.availability_service import availability_bitmaps
+from benchmarks.utilities import create_benchmark_app
+
+FIRST_DAY = date(2024, 1, 1)
+SEARCHES = 10
+
+
+def main(applicants: int) -> None:
+    app = create_benchmark_app()
+    with app.app_context():
+        load_applications_in_db(__generate_applications(applicants))
+
+        start = time.perf_counter()
+        availability_bitmaps.search(FIRST_DAY, FIRST_DAY, 1)
+        load_seconds = time.perf_counter() - start
+        print(f'{applicants} applicants, bitmaps loaded in '
+              f'{load_seconds:.1f}s using '
+              f'{availability_bitmaps.nbytes / 2 ** 20:.1f} MiB '
+              f'({availability_bitmaps.nbytes / applicants:.0f} bytes per '
+              f'applicant for {availability_bitmaps.days} days)')
+
+        rows = [(person_id, from_date.toordinal(), to_date.toordinal())
+                for from_date, to_date, person_id
+                in get_availabilities_from_db()]
+
+    generator = random.Random(2)
+    for days in (7, 30, 90):
+        windows = [FIRST_DAY + timedelta(days=generator.randrange(600))
+                   for _ in range(SEARCHES)]
+        for label, fraction in (('every day', 1), ('half', 2)):
+            min_days = days // fraction
+            bitmaps = __time(lambda window: len(availability_bitmaps.search(
+                    window, window + timedelta(days=days - 1), min_days)),
+                             windows)
+            scan = __time(lambda window: __scan(
+                    rows, window, window + timedelta(days=days - 1),
+                    min_days), windows)
+            print(f'{days:3} day window, {label:9}  '
+                  f'scan {scan * 1000:8.1f} ms/search  '
+                  f'bitmaps {bitmaps * 1000:6.1f} ms/search')
+
+
+def __scan(rows: list[tuple[int, int, int]], from_date: date, to_date: date,
+           min_days: int) -> int:
+    low, high = from_date.toordinal(), to_date.toordinal()
+    available_days: dict[int, int] = {}
+    for person_id, start, end in rows:
+        days = min(end, high) - max(start, low) + 1
+        if days > 0:
+            available_days[person_id] = available_days.get(person_id, 0) + days
+    return sum(1 for days in available_days.values() if days >= min_days)
+
+
+def __time(search, windows: list[date]) -> float:
+    start = time.perf_counter()
+    for window in windows:
+        search(window)
+    return (time.perf_counter() - start) / len(windows)
+
+
+def __generate_applications(applicants: int):
+    generator = random.Random(1)
+    for person_id in range(1, applicants + 1):
+        availabilities = []
+        end = FIRST_DAY - timedelta(days=1)
+        for _ in range(4):
+            start = end + timedelta(days=generator.randrange(2, 120))
+            end = start + timedelta(days=generator.randrange(60))
+            availabilities.append(AvailabilityRecord(person_id, start, end))
+        yield ApplicationRecord(person_id, [], availabilities)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
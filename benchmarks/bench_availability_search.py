@@ -0,0 +1,74 @@
+"""
+Availability window searches on a million availabilities.
+
+Loads the given number of availabilities, four per applicant starting
+within two years and lasting up to two months, into a SQLite database.
+Then times window searches of a day, a week and a month, and of a week
+after most availabilities have ended, answered by the database through its
+composite index and by the in-memory availability index, and reports the
+load time and memory use of the index.
+
+Usage: python -m benchmarks.bench_availability_search [availabilities]
+"""
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+from app.models.records import ApplicationRecord, AvailabilityRecord
+from app.repositories.application_loader import load_applications_in_db
+from app.services.availability_service import availability_index, \
+    search_available_persons
+from benchmarks.utilities import create_benchmark_app
+
+FIRST_DAY = date(2024, 1, 1)
+WINDOWS = 20
+# The length of the searched windows and the range of days they start in.
+# The last windows start after most availabilities have ended.
+SEARCHES = ((1, 0, 700), (7, 0, 700), (30, 0, 700), (7, 780, 795))
+
+
+def main(availabilities: int) -> None:
+    app = create_benchmark_app()
+    with app.app_context():
+        load_applications_in_db(__generate_applications(availabilities))
+
+        app.config['AVAILABILITY_INDEX'] = True
+        start = time.perf_counter()
+        availability_index.search(FIRST_DAY, FIRST_DAY)
+        load_seconds = time.perf_counter() - start
+        print(f'{availabilities} availabilities, index loaded in '
+              f'{load_seconds:.1f}s using '
+              f'{availability_index.nbytes / 2 ** 20:.1f} MiB')
+
+        generator = random.Random(2)
+        for days, first, last in SEARCHES:
+            windows = [FIRST_DAY + timedelta(
+                    days=generator.randrange(first, last))
+                       for _ in range(WINDOWS)]
+            for use_index in (False, True):
+                app.config['AVAILABILITY_INDEX'] = use_index
+                start = time.perf_counter()
+                for window in windows:
+                    search_available_persons(
+                            window, window + timedelta(days=days - 1), 0, 500)
+                elapsed = (time.perf_counter() - start) / WINDOWS
+                source = 'index' if use_index else 'query'
+                print(f'{days:3} day window from day {first:3} {source:5} '
+                      f'{elapsed * 1000:8.1f} ms/search')
+
+
+def __generate_applications(availabilities: int):
+    generator = random.Random(1)
+    for person_id in range(1, availabilities // 4 + 1):
+        records = []
+        for _ in range(4):
+            start = FIRST_DAY + timedelta(days=generator.randrange(730))
+            records.append(AvailabilityRecord(
+                    person_id, start,
+                    start + timedelta(days=generator.randrange(60))))
+        yield ApplicationRecord(person_id, [], records)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
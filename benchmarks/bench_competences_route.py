@@ -0,0 +1,72 @@
+"""
+Requests per second of the competences endpoint.
+
+Compares the pre-rendered responses served by the competences route with
+the previous approach of serializing the competence list with jsonify on
+every request, both with and without the in-memory catalog.
+
+Usage: python -m benchmarks.bench_competences_route [competences] [requests]
+"""
+import sys
+
+from flask import jsonify
+from flask_jwt_extended import jwt_required
+
+from app.extensions import database
+from app.models.competence import Competence
+from app.services.competences_service import fetch_competences, \
+    invalidate_competences
+from benchmarks.utilities import create_benchmark_app, create_token, measure
+
+
+def main(competence_count: int, repetitions: int) -> None:
+    app = create_benchmark_app()
+
+    @app.route('/baseline/uncached')
+    @jwt_required()
+    def uncached():
+        invalidate_competences()
+        return jsonify(fetch_competences())
+
+    @app.route('/baseline/cached')
+    @jwt_required()
+    def cached():
+        return jsonify(fetch_competences())
+
+    with app.app_context():
+        database.session.add_all(
+                [Competence(i18n_key=f'competence_{index}')
+                 for index in range(competence_count)])
+        database.session.commit()
+
+    client = app.test_client()
+    headers = {'Authorization': f'Bearer {create_token(app)}'}
+    url = '/api/application-form/competences/'
+    etag = client.get(url, headers=headers).headers['ETag']
+
+    scenarios = {
+        'query + jsonify (before)':
+            lambda: client.get('/baseline/uncached', headers=headers),
+        'cached catalog + jsonify':
+            lambda: client.get('/baseline/cached', headers=headers),
+        'pre-rendered identity':
+            lambda: client.get(url, headers=headers),
+        'pre-rendered gzip':
+            lambda: client.get(url, headers={
+                **headers, 'Accept-Encoding': 'gzip'}),
+        'pre-rendered br':
+            lambda: client.get(url, headers={
+                **headers, 'Accept-Encoding': 'br'}),
+        'If-None-Match (304)':
+            lambda: client.get(url, headers={
+                **headers, 'If-None-Match': etag}),
+    }
+
+    print(f'{competence_count} competences, {repetitions} requests')
+    for name, scenario in scenarios.items():
+        print(f'{name:28} {measure(scenario, repetitions):10.0f} req/s')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 2000)
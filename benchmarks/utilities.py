@@ -0,0 +1,61 @@
+import datetime as dt
+import os
+import tempfile
+import time
+from typing import Callable
+
+from flask import Flask
+from flask_jwt_extended import create_access_token
+
+
+def create_benchmark_app(database_url: str = '') -> Flask:
+    """
+    Create an application backed by a temporary SQLite database.
+
+    :param database_url: The database to use instead of a temporary SQLite
+           database.
+    :returns: The configured Flask application with all tables created.
+    """
+
+    if not database_url:
+        database_url = 'sqlite:///' + os.path.join(
+                tempfile.mkdtemp(), 'benchmark.db')
+    os.environ['DATABASE_URL'] = database_url
+    os.environ.setdefault('JWT_SECRET', 'benchmark-secret-key-benchmark-key')
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+    from app.app import create_app
+    return create_app()
+
+
+def create_token(app: Flask, person_id: int = 1, role: int = 2) -> str:
+    """
+    Create an access token for the given person and role.
+
+    :param app: The Flask application.
+    :param person_id: The ID of the person.
+    :param role: The role of the person.
+    :returns: The encoded access token.
+    """
+
+    with app.app_context():
+        return create_access_token(
+                identity=None,
+                additional_claims={'id': person_id, 'role': role},
+                expires_delta=dt.timedelta(days=1))
+
+
+def measure(function: Callable[[], object], repetitions: int) -> float:
+    """
+    Measure how many times per second a function can be called.
+
+    :param function: The function to call.
+    :param repetitions: The number of calls to time.
+    :returns: The number of calls per second.
+    """
+
+    function()
+    start = time.perf_counter()
+    for _ in range(repetitions):
+        function()
+    return repetitions / (time.perf_counter() - start)
@@ -0,0 +1,68 @@
+"""
+Gunicorn configuration for production.
+
+The application is created once in the master process and the workers are
+forked from it, so they share its imported modules, database tables check
+and warmed caches through copy-on-write instead of each building their own.
+Every worker then replaces the database connections inherited from the
+master and warms its pool and caches before it accepts requests, see
+setup_worker.
+
+Environment variables:
+    WEB_CONCURRENCY: The number of worker processes, 2 by default.
+    GUNICORN_WORKER_CLASS: 'gthread' (default), 'gevent' or 'sync'.
+    GUNICORN_THREADS: The number of threads per gthread worker, 4 by
+        default, and 1 for the other classes. Also sizes the database
+        pool, see config.py.
+    GUNICORN_WORKER_CONNECTIONS: The number of concurrent requests per
+        gevent worker, 100 by default.
+    GUNICORN_TIMEOUT: The number of seconds before a silent worker is
+        restarted, 30 by default.
+"""
+import gc
+import os
+
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+workers = int(os.environ.setdefault('WEB_CONCURRENCY', '2'))
+threads = int(os.environ.setdefault(
+    'GUNICORN_THREADS', '4' if worker_class == 'gthread' else '1'))
+worker_connections = int(
+    os.environ.get('GUNICORN_WORKER_CONNECTIONS', 100))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+preload_app = True
+errorlog = '-'
+
+if worker_class == 'gevent':
+    # Everything imported with the preloaded application must see the
+    # patched socket and threading modules, so patch before it is loaded.
+    # psycopg2 does its I/O in C, which would block every greenlet of the
+    # worker for the duration of a query unless it waits through gevent.
+    # The greenlets of a worker share its database pool, which
+    # DATABASE_POOL_SIZE should size rather than the thread count.
+    from gevent import monkey
+
+    monkey.patch_all()
+    from psycogreen.gevent import patch_psycopg
+
+    patch_psycopg()
+    os.environ.setdefault('DATABASE_POOL_SIZE', '10')
+
+
+def pre_fork(server, worker) -> None:
+    """
+    Moves the objects of the master to the permanent generation of the
+    garbage collector before a worker is forked, so the collections of the
+    worker do not write to, and thereby copy, the pages they share.
+    """
+
+    gc.freeze()
+
+
+def post_fork(server, worker) -> None:
+    """
+    Prepares a worker to serve requests, see setup_worker.
+    """
+
+    from app.app import setup_worker
+
+    setup_worker(server.app.wsgi())
@@ -0,0 +1,80 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.models.application import ApplicationStatus
+from app.models.availability import Availability
+from app.models.competence_profile import CompetenceProfile
+from app.models.records import ApplicationRecord, AvailabilityRecord, \
+    CompetenceRecord
+from app.repositories.application_loader import CopyBuffer, \
+    load_applications_in_db
+from tests.utilities.test_utilities import add_application_status_for_user_1, \
+    remove_application_components_from_db
+
+
+def generate_application_records(person_ids):
+    return (ApplicationRecord(
+            person_id,
+            [CompetenceRecord(person_id, 1, Decimal('2.50')),
+             CompetenceRecord(person_id, 2, Decimal('10.25'))],
+            [AvailabilityRecord(person_id, date(2024, 1, 1),
+                                date(2024, 1, 31))])
+            for person_id in person_ids)
+
+
+def test_copy_buffer_read():
+    lines = (f'{number}\tline\n' for number in range(1000))
+    buffer = CopyBuffer(lines)
+
+    chunks = []
+    while True:
+        chunk = buffer.read(100)
+        if not chunk:
+            break
+        assert len(chunk) <= 100
+        chunks.append(chunk)
+
+    assert b''.join(chunks) == ''.join(
+            f'{number}\tline\n' for number in range(1000)).encode()
+
+
+def test_load_applications_in_db_success(app_with_client):
+    app, _ = app_with_client
+
+    with app.app_context():
+        statistics = load_applications_in_db(
+                generate_application_records(range(1, 26)), batch_size=10)
+
+        assert statistics['applications'] == 25
+        assert statistics['rows'] == 100
+        assert statistics['rows_per_second'] > 0
+
+        assert ApplicationStatus.query.count() == 25
+        assert ApplicationStatus.query.first().status == 'Pending'
+        assert CompetenceProfile.query.filter_by(
+                person_id=7, competence_id=2).one().years_of_experience \
+            == Decimal('10.25')
+        availability = Availability.query.filter_by(person_id=25).one()
+        assert availability.from_date == date(2024, 1, 1)
+        assert availability.to_date == date(2024, 1, 31)
+
+    remove_application_components_from_db(app)
+
+
+def test_load_applications_in_db_conflict(app_with_client):
+    app, _ = app_with_client
+    add_application_status_for_user_1(app)
+
+    with app.app_context():
+        with pytest.raises(SQLAlchemyError):
+            load_applications_in_db(
+                    generate_application_records([2, 3, 1, 4]), batch_size=2)
+
+        assert sorted(status.person_id for status in
+                      ApplicationStatus.query.all()) == [1, 2, 3]
+        assert CompetenceProfile.query.count() == 4
+
+    remove_application_components_from_db(app)
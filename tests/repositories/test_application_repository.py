@@ -1,3 +1,5 @@
+from datetime import date
+from decimal import Decimal
 from unittest.mock import patch
 
 import pytest
@@ -6,8 +8,11 @@ from sqlalchemy.exc import SQLAlchemyError
 from app.models.application import ApplicationStatus
 from app.models.availability import Availability
 from app.models.competence_profile import CompetenceProfile
+from app.models.records import ApplicationRecord, CompetenceRecord
 from app.repositories.application_repository import \
-    get_application_status_from_db, insert_application_in_db
+    get_application_from_db, get_application_status_from_db, \
+    get_qualified_person_ids_from_db, insert_application_in_db, \
+    insert_applications_in_db
 from tests.utilities.test_utilities import add_application_status_for_user_1, \
     generate_application_status, \
     generate_availabilities, generate_competences, \
@@ -21,8 +26,8 @@ def test_insert_application_in_db_success(app_with_client):
     application_status = generate_application_status()
 
     with app.app_context():
-        insert_application_in_db(
-                competences, availabilities, application_status)
+        assert insert_application_in_db(
+                competences, availabilities, application_status) is True
 
         inserted_competences = CompetenceProfile.query.all()
         assert inserted_competences[0].person_id == 1
@@ -52,13 +57,41 @@ def test_insert_application_in_db_success(app_with_client):
     remove_application_components_from_db(app)
 
 
+def test_insert_application_in_db_bulk_insert(app_with_client):
+    app, _ = app_with_client
+    app.config['APPLICATION_BULK_INSERT'] = True
+
+    with app.app_context():
+        with patch('app.extensions.database.session.add_all') as mock:
+            assert insert_application_in_db(
+                    generate_competences(), generate_availabilities(),
+                    generate_application_status()) is True
+            mock.assert_not_called()
+
+        inserted_competences = CompetenceProfile.query.order_by(
+                CompetenceProfile.competence_id).all()
+        assert [(competence.person_id, competence.competence_id,
+                 competence.years_of_experience)
+                for competence in inserted_competences] == [(1, 1, 5),
+                                                            (1, 2, 3)]
+
+        inserted_availabilities = Availability.query.order_by(
+                Availability.from_date).all()
+        assert [(availability.from_date.strftime('%Y-%m-%d'),
+                 availability.to_date.strftime('%Y-%m-%d'))
+                for availability in inserted_availabilities] == [
+                   ('2021-01-01', '2021-01-02'), ('2021-01-03', '2021-01-04')]
+
+    remove_application_components_from_db(app)
+
+
 def test_insert_competences_in_db_failure(app_with_client):
     app, _ = app_with_client
     competences = generate_competences()
     availabilities = generate_availabilities()
     application_status = generate_application_status()
 
-    with patch('app.extensions.database.session.add',
+    with patch('app.extensions.database.session.add_all',
                side_effect=SQLAlchemyError) as mock:
         with app.app_context():
             with pytest.raises(SQLAlchemyError):
@@ -78,6 +111,80 @@ def test_insert_competences_in_db_failure(app_with_client):
     remove_application_components_from_db(app)
 
 
+def test_insert_application_in_db_already_applied(app_with_client):
+    app, _ = app_with_client
+    add_application_status_for_user_1(app)
+
+    with app.app_context():
+        assert insert_application_in_db(
+                generate_competences(), generate_availabilities(),
+                generate_application_status()) is False
+
+        assert len(ApplicationStatus.query.all()) == 1
+        assert len(CompetenceProfile.query.all()) == 0
+        assert len(Availability.query.all()) == 0
+
+    remove_application_components_from_db(app)
+
+
+def test_insert_application_in_db_twice(app_with_client):
+    app, _ = app_with_client
+
+    with app.app_context():
+        assert insert_application_in_db(
+                generate_competences(), generate_availabilities(),
+                generate_application_status()) is True
+        assert insert_application_in_db(
+                generate_competences(), generate_availabilities(),
+                generate_application_status()) is False
+
+        assert len(ApplicationStatus.query.all()) == 1
+        assert len(CompetenceProfile.query.all()) == 2
+        assert len(Availability.query.all()) == 2
+
+    remove_application_components_from_db(app)
+
+
+def test_insert_applications_in_db_success(app_with_client):
+    app, _ = app_with_client
+    add_application_status_for_user_1(app)
+
+    applications = [
+        ApplicationRecord(person_id, [
+            CompetenceProfile(person_id, 1, 2)], [
+            Availability(person_id, date(2024, 1, 1), date(2024, 1, 2))])
+        for person_id in (1, 2, 3)]
+
+    with app.app_context():
+        assert insert_applications_in_db(applications) == {2, 3}
+
+        assert sorted(status.person_id for status in
+                      ApplicationStatus.query.all()) == [1, 2, 3]
+        assert sorted(competence.person_id for competence in
+                      CompetenceProfile.query.all()) == [2, 3]
+        assert sorted(availability.person_id for availability in
+                      Availability.query.all()) == [2, 3]
+
+    remove_application_components_from_db(app)
+
+
+def test_insert_applications_in_db_failure(app_with_client):
+    app, _ = app_with_client
+    applications = [ApplicationRecord(1, generate_competences(),
+                                      generate_availabilities())]
+
+    with app.app_context():
+        with patch('app.extensions.database.session.commit',
+                   side_effect=SQLAlchemyError):
+            with pytest.raises(SQLAlchemyError):
+                insert_applications_in_db(applications)
+
+        assert ApplicationStatus.query.count() == 0
+        assert CompetenceProfile.query.count() == 0
+
+    remove_application_components_from_db(app)
+
+
 def test_get_application_status_from_db_success(app_with_client):
     app, _ = app_with_client
     person_id = 1
@@ -106,3 +213,67 @@ def test_get_application_status_from_db_error(app_with_client):
             assert isinstance(exception_info.value, SQLAlchemyError)
             mock.filter_by.return_value.first.assert_called_once()
             mock.filter_by.assert_called_once_with(person_id=person_id)
+
+
+def test_get_application_from_db_success(app_with_client):
+    app, _ = app_with_client
+
+    with app.app_context():
+        insert_application_in_db(generate_competences(),
+                                 generate_availabilities(),
+                                 generate_application_status())
+
+        status, application = get_application_from_db(1)
+
+        assert status == 'Pending'
+        assert [(competence.competence_id, competence.years_of_experience)
+                for competence in application.competences] == [
+                   (1, Decimal('5.00')), (2, Decimal('3.00'))]
+        assert [(availability.from_date, availability.to_date)
+                for availability in application.availabilities] == [
+                   (date(2021, 1, 1), date(2021, 1, 2)),
+                   (date(2021, 1, 3), date(2021, 1, 4))]
+        assert get_application_from_db(2) is None
+
+    remove_application_components_from_db(app)
+
+
+def test_get_application_from_db_without_details(app_with_client):
+    app, _ = app_with_client
+    add_application_status_for_user_1(app)
+
+    with app.app_context():
+        assert get_application_from_db(1) == (
+                'Pending', ApplicationRecord(1, [], []))
+
+    remove_application_components_from_db(app)
+
+
+def test_get_qualified_person_ids_from_db(app_with_client):
+    app, _ = app_with_client
+    experiences = {1: [(1, '0.30'), (2, '5.00')],
+                   2: [(1, '0.29'), (2, '5.00')],
+                   3: [(1, '1.00')],
+                   4: [(1, '0.30'), (2, '4.99')],
+                   5: [(1, '0.30'), (2, '5.00'), (3, '1.00')]}
+
+    with app.app_context():
+        insert_applications_in_db([
+            ApplicationRecord(person_id, [
+                CompetenceRecord(person_id, competence_id, Decimal(years))
+                for competence_id, years in competences], [])
+            for person_id, competences in experiences.items()])
+
+        requirements = {1: Decimal('0.3'), 2: Decimal('5')}
+        assert get_qualified_person_ids_from_db(
+                requirements, 0, 10) == [1, 5]
+        assert get_qualified_person_ids_from_db(
+                requirements, 1, 10) == [5]
+        assert get_qualified_person_ids_from_db(
+                requirements, 0, 1) == [1]
+        assert get_qualified_person_ids_from_db(
+                {1: Decimal('0.29')}, 0, 10) == [1, 2, 3, 4, 5]
+        assert get_qualified_person_ids_from_db(
+                {3: Decimal('1.01')}, 0, 10) == []
+
+    remove_application_components_from_db(app)
@@ -0,0 +1,86 @@
+import time
+from datetime import date
+from decimal import Decimal
+
+from app.models.records import ApplicationRecord, AvailabilityRecord, \
+    CompetenceRecord
+from app.repositories.spool_repository import SubmissionSpool
+
+
+def generate_application_record(person_id: int) -> ApplicationRecord:
+    return ApplicationRecord(
+            person_id,
+            [CompetenceRecord(person_id, 1, Decimal('2.50'))],
+            [AvailabilityRecord(person_id, date(2024, 1, 1),
+                                date(2024, 1, 31))])
+
+
+def test_append_and_claim(tmp_path):
+    spool = SubmissionSpool(str(tmp_path / 'spool.db'))
+    application = generate_application_record(1)
+
+    tracking_id = spool.append(application)
+
+    assert spool.get(tracking_id) == (1, 'Queued')
+    assert spool.claim(10, 60) == [(tracking_id, application)]
+    assert spool.get(tracking_id) == (1, 'Draining')
+    assert spool.claim(10, 60) == []
+
+
+def test_append_same_person_twice(tmp_path):
+    spool = SubmissionSpool(str(tmp_path / 'spool.db'))
+
+    assert spool.append(generate_application_record(1)) is not None
+    assert spool.append(generate_application_record(1)) is None
+
+
+def test_claim_batch_size(tmp_path):
+    spool = SubmissionSpool(str(tmp_path / 'spool.db'))
+    for person_id in range(1, 6):
+        spool.append(generate_application_record(person_id))
+
+    assert len(spool.claim(3, 60)) == 3
+    assert len(spool.claim(3, 60)) == 2
+
+
+def test_claim_expired(tmp_path):
+    spool = SubmissionSpool(str(tmp_path / 'spool.db'))
+    tracking_id = spool.append(generate_application_record(1))
+    spool.claim(10, 60)
+
+    assert spool.claim(10, -1) == [
+        (tracking_id, generate_application_record(1))]
+
+
+def test_complete_survives_reopen(tmp_path):
+    path = str(tmp_path / 'spool.db')
+    spool = SubmissionSpool(path)
+    stored = spool.append(generate_application_record(1))
+    released = spool.append(generate_application_record(2))
+    spool.claim(10, 60)
+
+    spool.complete({stored: 'Stored', released: 'Queued'})
+
+    reopened = SubmissionSpool(path)
+    assert reopened.get(stored) == (1, 'Stored')
+    assert reopened.claim(10, 60) == [
+        (released, generate_application_record(2))]
+
+
+def test_prune(tmp_path):
+    spool = SubmissionSpool(str(tmp_path / 'spool.db'))
+    stored = spool.append(generate_application_record(1))
+    queued = spool.append(generate_application_record(2))
+    spool.claim(1, 60)
+    spool.complete({stored: 'Stored'})
+
+    assert spool.prune(time.time() - 60) == 0
+    assert spool.prune(time.time() + 1) == 1
+    assert spool.get(stored) is None
+    assert spool.get(queued) == (2, 'Queued')
+
+
+def test_get_unknown_tracking_id(tmp_path):
+    spool = SubmissionSpool(str(tmp_path / 'spool.db'))
+
+    assert spool.get('unknown') is None
@@ -0,0 +1,128 @@
+from datetime import date
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.extensions import database
+from app.models.application import ApplicationStatus
+from app.models.application_statistic import ApplicationStatistic
+from app.models.records import ApplicationRecord, AvailabilityRecord, \
+    CompetenceRecord
+from app.repositories.application_loader import load_applications_in_db
+from app.repositories.application_repository import \
+    insert_application_in_db, insert_applications_in_db
+from app.repositories.statistics_repository import \
+    get_application_statistics_from_db, rebuild_application_statistics_in_db
+from tests.utilities.test_utilities import \
+    remove_application_components_from_db
+
+
+def generate_application(person_id: int,
+                         *years: Decimal) -> ApplicationRecord:
+    return ApplicationRecord(
+            person_id,
+            [CompetenceRecord(person_id, competence_id, value)
+             for competence_id, value in enumerate(years, 1)],
+            [AvailabilityRecord(person_id, date(2024, 1, 1),
+                                date(2024, 1, 31))])
+
+
+def test_statistics_maintained_on_insert(app_with_client):
+    app, _ = app_with_client
+    single = generate_application(1, Decimal('0.5'), Decimal('20'))
+
+    with app.app_context():
+        insert_application_in_db(single.competences, single.availabilities,
+                                 ApplicationStatus(1))
+        insert_applications_in_db([
+            generate_application(1, Decimal('4')),
+            generate_application(2, Decimal('4'), Decimal('9.99'))])
+        load_applications_in_db([generate_application(3, Decimal('1'))])
+
+        assert sorted(get_application_statistics_from_db()) == [
+            ('competence', '1', 3), ('competence', '2', 2),
+            ('status', 'Pending', 3), ('years', '1:0', 1),
+            ('years', '1:1', 1), ('years', '1:3', 1), ('years', '2:20', 1),
+            ('years', '2:5', 1)]
+
+    remove_application_components_from_db(app)
+
+
+def test_statistics_sharded(app_with_client):
+    app, _ = app_with_client
+    app.config['APPLICATION_STATISTICS_SHARDS'] = 4
+
+    with app.app_context():
+        for person_id in range(1, 6):
+            application = generate_application(person_id, Decimal('1'))
+            insert_application_in_db(application.competences,
+                                     application.availabilities,
+                                     ApplicationStatus(person_id))
+
+        assert sorted(shard for shard, in database.session.query(
+                ApplicationStatistic.shard).filter_by(
+                statistic='status')) == [0, 1, 2, 3]
+        assert sorted(get_application_statistics_from_db()) == [
+            ('competence', '1', 5), ('status', 'Pending', 5),
+            ('years', '1:1', 5)]
+
+        assert rebuild_application_statistics_in_db() == 3
+        assert database.session.query(ApplicationStatistic).count() == 3
+        assert sorted(get_application_statistics_from_db()) == [
+            ('competence', '1', 5), ('status', 'Pending', 5),
+            ('years', '1:1', 5)]
+
+    remove_application_components_from_db(app)
+
+
+def test_statistics_not_maintained_on_failed_insert(app_with_client):
+    app, _ = app_with_client
+
+    with app.app_context():
+        with patch('app.extensions.database.session.commit',
+                   side_effect=SQLAlchemyError):
+            with pytest.raises(SQLAlchemyError):
+                insert_applications_in_db(
+                        [generate_application(1, Decimal('4'))])
+
+        assert get_application_statistics_from_db() == []
+
+
+def test_rebuild_application_statistics_in_db(app_with_client):
+    app, _ = app_with_client
+
+    with app.app_context():
+        insert_applications_in_db([
+            generate_application(person_id, Decimal(person_id),
+                                 Decimal('2.5'))
+            for person_id in range(1, 7)])
+        maintained = sorted(get_application_statistics_from_db())
+        database.session.get(ApplicationStatus, 1).status = 'Accepted'
+        database.session.commit()
+
+        assert rebuild_application_statistics_in_db() == len(maintained) + 1
+        rebuilt = sorted(get_application_statistics_from_db())
+
+    assert rebuilt == sorted([('status', 'Accepted', 1),
+                              ('status', 'Pending', 5)]
+                             + [counter for counter in maintained
+                                if counter[0] != 'status'])
+
+    remove_application_components_from_db(app)
+
+
+def test_rebuild_application_statistics_in_db_failure(app_with_client):
+    app, _ = app_with_client
+
+    with app.app_context():
+        insert_applications_in_db([generate_application(1, Decimal('4'))])
+        with patch('app.extensions.database.session.commit',
+                   side_effect=SQLAlchemyError):
+            with pytest.raises(SQLAlchemyError):
+                rebuild_application_statistics_in_db()
+
+        assert len(get_application_statistics_from_db()) == 3
+
+    remove_application_components_from_db(app)
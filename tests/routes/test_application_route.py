@@ -1,3 +1,11 @@
+from unittest.mock import patch
+
+import pytest
+
+from app.services.application_service import application_cache
+from app.services.applied_person_service import applied_persons
+from app.services.spool_service import submission_spool
+from tests.services.test_spool_service import enable_spool
 from tests.utilities.test_status_codes import StatusCodes
 from tests.utilities.test_utilities import application_route_post_request, \
     generate_token_for_person_id_1, \
@@ -293,7 +301,10 @@ def test_add_submitted_application_missing_to_date(app_with_client):
     remove_application_components_from_db(app)
 
 
-def test_add_submitted_application_invalid_date_format(app_with_client):
+@pytest.mark.parametrize('from_date', [
+    'invalid_date', '0000-01-01', '202\u00b2-01-01'])
+def test_add_submitted_application_invalid_date_format(app_with_client,
+                                                       from_date):
     app, test_client = app_with_client
     setup_competences_in_db(app)
     token = generate_token_for_person_id_1(app)
@@ -301,7 +312,7 @@ def test_add_submitted_application_invalid_date_format(app_with_client):
     payload = {
         "competences": [{"competence_id": 1, "years_of_experience": '5.00'}],
         "availabilities": [
-            {"from_date": "invalid_date", "to_date": "2021-01-02"}]
+            {"from_date": from_date, "to_date": "2021-01-02"}]
     }
     response = application_route_post_request(test_client, token, payload)
 
@@ -331,3 +342,302 @@ def test_add_submitted_application_invalid_date_range(app_with_client):
 
     remove_competences_from_db(app)
     remove_application_components_from_db(app)
+
+
+def test_add_submitted_application_duplicate_competence_id(app_with_client):
+    app, test_client = app_with_client
+    setup_competences_in_db(app)
+    token = generate_token_for_person_id_1(app)
+
+    payload = {
+        "competences": [{"competence_id": 1, "years_of_experience": '5.00'},
+                        {"competence_id": 1, "years_of_experience": '2.00'}],
+        "availabilities": [
+            {"from_date": "2021-01-01", "to_date": "2021-01-02"}]
+    }
+    response = application_route_post_request(test_client, token, payload)
+
+    assert response.status_code == StatusCodes.BAD_REQUEST
+    assert response.json['error'] == 'DUPLICATE_COMPETENCE_ID'
+
+    remove_competences_from_db(app)
+    remove_application_components_from_db(app)
+
+
+def test_add_submitted_application_unhashable_competence_id(app_with_client):
+    app, test_client = app_with_client
+    setup_competences_in_db(app)
+    token = generate_token_for_person_id_1(app)
+
+    payload = {
+        "competences": [{"competence_id": [1], "years_of_experience": '5.00'}],
+        "availabilities": [
+            {"from_date": "2021-01-01", "to_date": "2021-01-02"}]
+    }
+    response = application_route_post_request(test_client, token, payload)
+
+    assert response.status_code == StatusCodes.BAD_REQUEST
+    assert response.json['error'] == 'INVALID_COMPETENCE_ID'
+
+    remove_competences_from_db(app)
+    remove_application_components_from_db(app)
+
+
+def test_add_submitted_application_reports_all_errors(app_with_client):
+    app, test_client = app_with_client
+    setup_competences_in_db(app)
+    token = generate_token_for_person_id_1(app)
+
+    payload = {
+        "competences": [{"competence_id": 999}],
+        "availabilities": [{"from_date": "2021-01-02"}]
+    }
+    response = application_route_post_request(test_client, token, payload)
+
+    assert response.status_code == StatusCodes.BAD_REQUEST
+    assert response.json['error'] == 'MISSING_YEARS_OF_EXPERIENCE'
+    assert response.json['errors'] == [
+        {'field': 'competences[0].years_of_experience',
+         'error': 'MISSING_YEARS_OF_EXPERIENCE'},
+        {'field': 'availabilities[0].to_date', 'error': 'MISSING_TO_DATE'}]
+
+    remove_competences_from_db(app)
+    remove_application_components_from_db(app)
+
+
+def test_add_submitted_application_years_of_experience_format(
+        app_with_client):
+    app, test_client = app_with_client
+    setup_competences_in_db(app)
+    token = generate_token_for_person_id_1(app)
+
+    payload = {
+        "competences": [{"competence_id": 1, "years_of_experience": 5},
+                        {"competence_id": 2, "years_of_experience": 2.5}],
+        "availabilities": [
+            {"from_date": "2021-01-01", "to_date": "2021-01-02"}]
+    }
+    response = application_route_post_request(test_client, token, payload)
+
+    assert response.status_code == StatusCodes.CREATED
+    assert response.json['competences'] == [
+        {"competence_id": 1, "years_of_experience": "5.00"},
+        {"competence_id": 2, "years_of_experience": "2.50"}]
+
+    response = test_client.get('/api/application-form/submit/',
+                               headers={'Authorization': f'Bearer {token}'})
+    assert response.json['competences'] == [
+        {"competence_id": 1, "years_of_experience": "5.00"},
+        {"competence_id": 2, "years_of_experience": "2.50"}]
+
+    remove_competences_from_db(app)
+    remove_application_components_from_db(app)
+
+
+def test_add_submitted_application_merges_availabilities(app_with_client):
+    app, test_client = app_with_client
+    token = generate_token_for_person_id_1(app)
+
+    payload = {
+        "availabilities": [
+            {"from_date": "2021-01-03", "to_date": "2021-01-05"},
+            {"from_date": "2021-01-01", "to_date": "2021-01-02"},
+            {"from_date": "2021-01-04", "to_date": "2021-01-04"}]
+    }
+    response = application_route_post_request(test_client, token, payload)
+
+    assert response.status_code == StatusCodes.CREATED
+    assert response.json['availabilities'] == [
+        {"from_date": "2021-01-01", "to_date": "2021-01-05"}]
+
+    remove_application_components_from_db(app)
+
+
+def test_add_submitted_application_spooled(app_with_client, tmp_path):
+    app, test_client = app_with_client
+    enable_spool(app, tmp_path)
+    token = generate_token_for_person_id_1(app)
+
+    payload = {
+        "availabilities": [
+            {"from_date": "2021-01-01", "to_date": "2021-01-02"}]
+    }
+    response = application_route_post_request(test_client, token, payload)
+    duplicate = application_route_post_request(test_client, token, payload)
+
+    assert response.status_code == StatusCodes.ACCEPTED
+    assert response.json['status'] == 'Queued'
+    assert duplicate.status_code == StatusCodes.CONFLICT
+    assert duplicate.json == {'error': 'ALREADY_APPLIED_BEFORE'}
+
+    submission_spool.stop()
+    submission_spool.drain()
+
+    tracking_id = response.json['tracking_id']
+    response = test_client.get(
+            f'/api/application-form/submit/spool/{tracking_id}',
+            headers={'Authorization': f'Bearer {token}'})
+
+    assert response.status_code == StatusCodes.OK
+    assert response.json == {'tracking_id': tracking_id, 'status': 'Stored'}
+
+    remove_application_components_from_db(app)
+
+
+def test_get_spooled_application_not_found(app_with_client, tmp_path):
+    app, test_client = app_with_client
+    enable_spool(app, tmp_path)
+    token = generate_token_for_person_id_1(app)
+
+    response = test_client.get('/api/application-form/submit/spool/unknown',
+                               headers={'Authorization': f'Bearer {token}'})
+
+    assert response.status_code == StatusCodes.NOT_FOUND
+    assert response.json == {'error': 'APPLICATION_NOT_FOUND'}
+
+    submission_spool.stop()
+
+
+def idempotent_post_request(test_client, token, payload, key):
+    return test_client.post('/api/application-form/submit/',
+                            headers={'Authorization': f'Bearer {token}',
+                                     'Idempotency-Key': key},
+                            json=payload)
+
+
+def test_add_submitted_application_idempotent_retry(app_with_client):
+    app, test_client = app_with_client
+    token = generate_token_for_person_id_1(app)
+
+    payload = {
+        "availabilities": [
+            {"from_date": "2021-01-01", "to_date": "2021-01-02"}]
+    }
+    response = idempotent_post_request(test_client, token, payload, 'key-1')
+    retry = idempotent_post_request(test_client, token, {}, 'key-1')
+    other_key = idempotent_post_request(test_client, token, payload, 'key-2')
+
+    assert response.status_code == StatusCodes.CREATED
+    assert retry.status_code == StatusCodes.CREATED
+    assert retry.json == response.json
+    assert retry.headers['Idempotent-Replayed'] == 'true'
+    assert other_key.status_code == StatusCodes.CONFLICT
+
+    remove_application_components_from_db(app)
+
+
+def test_add_submitted_application_idempotent_conflict(app_with_client):
+    app, test_client = app_with_client
+    token = generate_token_for_person_id_1(app)
+
+    payload = {
+        "availabilities": [
+            {"from_date": "2021-01-01", "to_date": "2021-01-02"}]
+    }
+    response = idempotent_post_request(test_client, token, payload, 'key-1')
+    applied_persons.load(())
+    with patch('app.routes.application_route.find_idempotent_response',
+               side_effect=[None, ('{"status": "Pending"}', 201)]):
+        retry = idempotent_post_request(test_client, token, payload, 'key-1')
+
+    assert response.status_code == StatusCodes.CREATED
+    assert retry.status_code == StatusCodes.CREATED
+    assert retry.json == {'status': 'Pending'}
+
+    remove_application_components_from_db(app)
+
+
+def test_add_submitted_application_invalid_idempotency_key(app_with_client):
+    app, test_client = app_with_client
+    token = generate_token_for_person_id_1(app)
+
+    response = idempotent_post_request(test_client, token, {}, 'k' * 256)
+
+    assert response.status_code == StatusCodes.BAD_REQUEST
+    assert response.json == {'error': 'INVALID_IDEMPOTENCY_KEY'}
+
+
+def test_add_spooled_application_idempotent_retry(app_with_client, tmp_path):
+    app, test_client = app_with_client
+    enable_spool(app, tmp_path)
+    token = generate_token_for_person_id_1(app)
+
+    payload = {
+        "availabilities": [
+            {"from_date": "2021-01-01", "to_date": "2021-01-02"}]
+    }
+    response = idempotent_post_request(test_client, token, payload, 'key-1')
+    retry = idempotent_post_request(test_client, token, payload, 'key-1')
+
+    assert response.status_code == StatusCodes.ACCEPTED
+    assert retry.status_code == StatusCodes.ACCEPTED
+    assert retry.json == response.json
+
+    submission_spool.stop()
+
+
+def test_add_submitted_application_known_applicant(app_with_client):
+    app, test_client = app_with_client
+    token = generate_token_for_person_id_1(app)
+    applied_persons.add(1)
+
+    with patch('app.routes.application_route.validate_application') as \
+            validate:
+        response = application_route_post_request(
+                test_client, token, {"availabilities": []})
+
+    assert response.status_code == StatusCodes.CONFLICT
+    assert response.json == {'error': 'ALREADY_APPLIED_BEFORE'}
+    validate.assert_not_called()
+
+
+def test_get_submitted_application(app_with_client):
+    app, test_client = app_with_client
+    token = generate_token_for_person_id_1(app)
+    headers = {'Authorization': f'Bearer {token}'}
+
+    payload = {
+        "competences": [{"competence_id": 1, "years_of_experience": '5'}],
+        "availabilities": [
+            {"from_date": "2021-01-01", "to_date": "2021-01-02"}]
+    }
+    with patch('app.services.validation_service.fetch_competence_catalog') \
+            as catalog:
+        catalog.return_value.index = {1: {}}
+        submitted = application_route_post_request(test_client, token,
+                                                   payload)
+    application_cache.init_app(app)
+
+    response = test_client.get('/api/application-form/submit/',
+                               headers=headers)
+    status = test_client.get('/api/application-form/submit/status',
+                             headers=headers)
+
+    assert response.status_code == StatusCodes.OK
+    assert response.json == submitted.json
+    assert status.status_code == StatusCodes.OK
+    assert status.json == {'status': 'Pending'}
+
+    remove_application_components_from_db(app)
+
+
+def test_get_submitted_application_not_found(app_with_client):
+    app, test_client = app_with_client
+    token = generate_token_for_person_id_1(app)
+
+    response = test_client.get('/api/application-form/submit/status',
+                               headers={'Authorization': f'Bearer {token}'})
+
+    assert response.status_code == StatusCodes.NOT_FOUND
+    assert response.json == {'error': 'APPLICATION_NOT_FOUND'}
+
+
+def test_get_submitted_application_unauthorized_role(app_with_client):
+    app, test_client = app_with_client
+    token = generate_token_for_recruiter(app)
+
+    response = test_client.get('/api/application-form/submit/',
+                               headers={'Authorization': f'Bearer {token}'})
+
+    assert response.status_code == StatusCodes.UNAUTHORIZED
+    assert response.json == {'error': 'UNAUTHORIZED_ROLE'}
@@ -0,0 +1,376 @@
+import gzip
+import json
+from unittest.mock import patch
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.models.records import ApplicationRecord
+from app.repositories.application_repository import insert_applications_in_db
+from tests.repositories.test_spool_repository import \
+    generate_application_record
+from tests.utilities.test_status_codes import StatusCodes
+from tests.utilities.test_utilities import generate_token_for_person_id_1, \
+    generate_token_for_recruiter, remove_application_components_from_db, \
+    remove_competences_from_db, setup_competences_in_db
+
+
+def list_applications_request(test_client, token, query=''):
+    return test_client.get(f'/api/application-form/applications/{query}',
+                           headers={'Authorization': f'Bearer {token}'})
+
+
+def test_list_applications_pages(app_with_client):
+    app, test_client = app_with_client
+    token = generate_token_for_recruiter(app)
+    with app.app_context():
+        insert_applications_in_db(
+                [generate_application_record(person_id)
+                 for person_id in (3, 5, 8)]
+                + [ApplicationRecord(9, [], [])])
+
+    first = list_applications_request(test_client, token, '?limit=2')
+    second = list_applications_request(
+            test_client, token,
+            f'?limit=2&after={first.json["next_after"]}')
+    last = list_applications_request(
+            test_client, token,
+            f'?limit=2&after={second.json["next_after"]}')
+
+    assert first.status_code == StatusCodes.OK
+    assert [application['person_id'] for application
+            in first.json['applications']] == [3, 5]
+    assert first.json['applications'][0] == {
+        'person_id': 3,
+        'status': 'Pending',
+        'competences': [{'competence_id': 1, 'years_of_experience': '2.50'}],
+        'availabilities': [{'from_date': '2024-01-01',
+                            'to_date': '2024-01-31'}]}
+    assert [application['person_id'] for application
+            in second.json['applications']] == [8, 9]
+    assert second.json['applications'][1]['competences'] == []
+    assert last.json == {'applications': [], 'next_after': None}
+
+    remove_application_components_from_db(app)
+
+
+def test_list_applications_last_page(app_with_client):
+    app, test_client = app_with_client
+    token = generate_token_for_recruiter(app)
+    with app.app_context():
+        insert_applications_in_db([generate_application_record(3)])
+
+    response = list_applications_request(test_client, token)
+
+    assert response.status_code == StatusCodes.OK
+    assert len(response.json['applications']) == 1
+    assert response.json['next_after'] is None
+
+    remove_application_components_from_db(app)
+
+
+def test_list_applications_invalid_pagination(app_with_client):
+    app, test_client = app_with_client
+    token = generate_token_for_recruiter(app)
+
+    for query in ('?after=-1', '?limit=0', '?limit=501', '?after=x',
+                  '?after=²', f'?after={2 ** 63}', '?after=' + '9' * 30):
+        response = list_applications_request(test_client, token, query)
+
+        assert response.status_code == StatusCodes.BAD_REQUEST
+        assert response.json == {'error': 'INVALID_PAGINATION'}
+
+
+def test_list_applications_unauthorized_role(app_with_client):
+    app, test_client = app_with_client
+    token = generate_token_for_person_id_1(app)
+
+    response = list_applications_request(test_client, token)
+
+    assert response.status_code == StatusCodes.UNAUTHORIZED
+    assert response.json == {'error': 'UNAUTHORIZED_ROLE'}
+
+
+def test_search_available_applicants(app_with_client):
+    app, test_client = app_with_client
+    token = generate_token_for_recruiter(app)
+    with app.app_context():
+        insert_applications_in_db([generate_application_record(3)])
+
+    response = list_applications_request(
+            test_client, token,
+            'available?from_date=2024-01-31&to_date=2024-02-10')
+
+    assert response.status_code == StatusCodes.OK
+    assert response.json == {'person_ids': [3], 'next_after': None}
+
+    response = list_applications_request(
+            test_client, token,
+            'available?from_date=2024-01-31&to_date=2024-02-10&min_days=2')
+
+    assert response.status_code == StatusCodes.OK
+    assert response.json == {'person_ids': [], 'next_after': None}
+
+    remove_application_components_from_db(app)
+
+
+def test_search_available_applicants_invalid_dates(app_with_client):
+    app, test_client = app_with_client
+    token = generate_token_for_recruiter(app)
+
+    for query, error in (
+            ('from_date=2024-01-31', 'INVALID_DATE_FORMAT'),
+            ('from_date=2024-W01-1&to_date=2024-02-10',
+             'INVALID_DATE_FORMAT'),
+            ('from_date=2024-02-30&to_date=2024-03-10',
+             'INVALID_DATE_FORMAT'),
+            ('from_date=2024-02-10&to_date=2024-01-31',
+             'INVALID_DATE_RANGE'),
+            ('from_date=2024-01-01&to_date=2024-01-31&min_days=32',
+             'INVALID_MIN_DAYS'),
+            ('from_date=2024-01-01&to_date=2024-01-31&min_days=0',
+             'INVALID_MIN_DAYS'),
+            ('from_date=2019-12-31&to_date=2020-01-31&min_days=2',
+             'INVALID_DATE_RANGE'),
+            ('from_date=2024-01-01&to_date=2024-01-31&limit=0',
+             'INVALID_PAGINATION')):
+        response = list_applications_request(test_client, token,
+                                             f'available?{query}')
+
+        assert response.status_code == StatusCodes.BAD_REQUEST
+        assert response.json == {'error': error}
+
+
+def test_search_available_applicants_unauthorized_role(app_with_client):
+    app, test_client = app_with_client
+    token = generate_token_for_person_id_1(app)
+
+    response = list_applications_request(
+            test_client, token,
+            'available?from_date=2024-01-01&to_date=2024-01-31')
+
+    assert response.status_code == StatusCodes.UNAUTHORIZED
+
+
+def test_search_qualified_applicants(app_with_client):
+    app, test_client = app_with_client
+    token = generate_token_for_recruiter(app)
+    with app.app_context():
+        insert_applications_in_db([generate_application_record(3),
+                                   generate_application_record(4)])
+
+    response = list_applications_request(
+            test_client, token, 'qualified?competence=1:2.5&limit=1')
+
+    assert response.status_code == StatusCodes.OK
+    assert response.json == {'person_ids': [3], 'next_after': 3}
+
+    response = list_applications_request(
+            test_client, token, 'qualified?competence=1:2.51')
+
+    assert response.status_code == StatusCodes.OK
+    assert response.json == {'person_ids': [], 'next_after': None}
+
+    remove_application_components_from_db(app)
+
+
+def test_search_qualified_applicants_invalid_requirements(app_with_client):
+    app, test_client = app_with_client
+    token = generate_token_for_recruiter(app)
+
+    for query, error in (
+            ('', 'INVALID_COMPETENCE_REQUIREMENT'),
+            ('competence=1', 'INVALID_COMPETENCE_REQUIREMENT'),
+            ('competence=1:2.505', 'INVALID_COMPETENCE_REQUIREMENT'),
+            ('competence=1:100', 'INVALID_COMPETENCE_REQUIREMENT'),
+            ('competence=1:1e2', 'INVALID_COMPETENCE_REQUIREMENT'),
+            ('competence=%D9%A1:1', 'INVALID_COMPETENCE_REQUIREMENT'),
+            ('competence=1:1&competence=1:2',
+             'INVALID_COMPETENCE_REQUIREMENT'),
+            (f'competence={2 ** 63}:1', 'INVALID_COMPETENCE_REQUIREMENT'),
+            ('&'.join(f'competence={competence_id}:1'
+                      for competence_id in range(21)),
+             'INVALID_COMPETENCE_REQUIREMENT'),
+            ('competence=1:1&after=-1', 'INVALID_PAGINATION'),
+            (f'competence=1:1&after={2 ** 63}', 'INVALID_PAGINATION')):
+        response = list_applications_request(test_client, token,
+                                             f'qualified?{query}')
+
+        assert response.status_code == StatusCodes.BAD_REQUEST
+        assert response.json == {'error': error}
+
+
+def test_search_qualified_applicants_unauthorized_role(app_with_client):
+    app, test_client = app_with_client
+    token = generate_token_for_person_id_1(app)
+
+    response = list_applications_request(test_client, token,
+                                         'qualified?competence=1:1')
+
+    assert response.status_code == StatusCodes.UNAUTHORIZED
+
+
+def rank_applicants_request(test_client, token, profile, query=''):
+    return test_client.post(
+            f'/api/application-form/applications/rank{query}',
+            json=profile, headers={'Authorization': f'Bearer {token}'})
+
+
+def test_rank_applicants(app_with_client):
+    app, test_client = app_with_client
+    token = generate_token_for_recruiter(app)
+    setup_competences_in_db(app)
+    with app.app_context():
+        insert_applications_in_db([generate_application_record(3),
+                                   generate_application_record(4)])
+
+    response = rank_applicants_request(test_client, token, {
+        'competences': [{'competence_id': 1, 'min_years': 2, 'weight': 2}],
+        'window': {'from_date': '2024-01-22', 'to_date': '2024-02-10'}},
+        '?limit=1')
+
+    assert response.status_code == StatusCodes.OK
+    assert response.json == {'applicants': [
+        {'person_id': 3, 'score': 2.5, 'coverage': 0.5}]}
+
+    remove_application_components_from_db(app)
+    remove_competences_from_db(app)
+
+
+def test_rank_applicants_invalid_request(app_with_client):
+    app, test_client = app_with_client
+    token = generate_token_for_recruiter(app)
+    setup_competences_in_db(app)
+    profile = {
+        'competences': [{'competence_id': 1, 'min_years': 2, 'weight': 2}],
+        'window': {'from_date': '2024-01-22', 'to_date': '2024-02-10'}}
+
+    response = rank_applicants_request(test_client, token, profile,
+                                       '?after=1')
+
+    assert response.status_code == StatusCodes.BAD_REQUEST
+    assert response.json == {'error': 'INVALID_PAGINATION'}
+
+    response = rank_applicants_request(
+            test_client, token, {**profile, 'window': {}})
+
+    assert response.status_code == StatusCodes.BAD_REQUEST
+    assert response.json['error'] == 'MISSING_FROM_DATE'
+
+    response = rank_applicants_request(test_client, token, [])
+
+    assert response.status_code == StatusCodes.BAD_REQUEST
+    assert response.json == {'error': 'INVALID_JSON_PAYLOAD'}
+
+    remove_competences_from_db(app)
+
+
+def test_rank_applicants_unauthorized_role(app_with_client):
+    app, test_client = app_with_client
+    token = generate_token_for_person_id_1(app)
+
+    response = rank_applicants_request(test_client, token, {})
+
+    assert response.status_code == StatusCodes.UNAUTHORIZED
+
+
+def test_export_all_applications(app_with_client):
+    app, test_client = app_with_client
+    token = generate_token_for_recruiter(app)
+    with app.app_context():
+        insert_applications_in_db([generate_application_record(3),
+                                   generate_application_record(4)])
+
+    response = list_applications_request(test_client, token, 'export')
+
+    assert response.status_code == StatusCodes.OK
+    assert response.mimetype == 'application/x-ndjson'
+    assert [json.loads(line)['person_id']
+            for line in response.data.splitlines()] == [3, 4]
+
+    response = test_client.get(
+            '/api/application-form/applications/export?format=csv',
+            headers={'Authorization': f'Bearer {token}',
+                     'Accept-Encoding': 'gzip'})
+
+    assert response.status_code == StatusCodes.OK
+    assert response.mimetype == 'text/csv'
+    assert response.content_encoding == 'gzip'
+    assert 'Accept-Encoding' in response.vary
+    assert gzip.decompress(response.data).decode().splitlines() == [
+        'person_id,status,competences,availabilities',
+        '3,Pending,1:2.50,2024-01-01/2024-01-31',
+        '4,Pending,1:2.50,2024-01-01/2024-01-31']
+
+    remove_application_components_from_db(app)
+
+
+def test_export_all_applications_invalid_format(app_with_client):
+    app, test_client = app_with_client
+    token = generate_token_for_recruiter(app)
+
+    response = list_applications_request(test_client, token,
+                                         'export?format=xml')
+
+    assert response.status_code == StatusCodes.BAD_REQUEST
+    assert response.json == {'error': 'INVALID_EXPORT_FORMAT'}
+
+
+def test_export_all_applications_sqlalchemy_error(app_with_client):
+    app, test_client = app_with_client
+    token = generate_token_for_recruiter(app)
+
+    with patch('app.repositories.application_repository.database.session.'
+               'execute', side_effect=SQLAlchemyError):
+        response = list_applications_request(test_client, token, 'export')
+
+    assert response.status_code == StatusCodes.INTERNAL_SERVER_ERROR
+    assert response.json == {'error': 'DATABASE_ERROR'}
+
+
+def test_export_all_applications_unauthorized_role(app_with_client):
+    app, test_client = app_with_client
+    token = generate_token_for_person_id_1(app)
+
+    response = list_applications_request(test_client, token, 'export')
+
+    assert response.status_code == StatusCodes.UNAUTHORIZED
+
+
+def test_get_application_statistics(app_with_client):
+    app, test_client = app_with_client
+    token = generate_token_for_recruiter(app)
+    with app.app_context():
+        insert_applications_in_db([generate_application_record(person_id)
+                                   for person_id in (1, 2)])
+
+    response = list_applications_request(test_client, token, 'statistics')
+
+    assert response.status_code == StatusCodes.OK
+    assert response.json['applications'] == {'Pending': 2}
+    assert response.json['competences'] == [
+        {'competence_id': 1, 'applicants': 2,
+         'years_of_experience': [0, 0, 2, 0, 0, 0, 0]}]
+
+    remove_application_components_from_db(app)
+
+
+def test_get_application_statistics_sqlalchemy_error(app_with_client):
+    app, test_client = app_with_client
+    token = generate_token_for_recruiter(app)
+
+    with patch('app.repositories.statistics_repository.database.session.'
+               'execute', side_effect=SQLAlchemyError):
+        response = list_applications_request(test_client, token,
+                                             'statistics')
+
+    assert response.status_code == StatusCodes.INTERNAL_SERVER_ERROR
+    assert response.json == {'error': 'DATABASE_ERROR'}
+
+
+def test_get_application_statistics_unauthorized_role(app_with_client):
+    app, test_client = app_with_client
+    token = generate_token_for_person_id_1(app)
+
+    response = list_applications_request(test_client, token, 'statistics')
+
+    assert response.status_code == StatusCodes.UNAUTHORIZED
@@ -1,3 +1,5 @@
+import gzip
+import json
 from unittest.mock import patch
 
 from sqlalchemy.exc import SQLAlchemyError
@@ -33,7 +35,7 @@ def test_competences_no_result(app_with_client):
     assert response.json['error'] == 'COMPETENCES_NOT_FOUND'
 
 
-@patch('app.routes.competences_route.fetch_competences')
+@patch('app.routes.competences_route.fetch_competence_catalog')
 def test_get_personal_info_sqlalchemy_error(mock_fetch, app_with_client):
     app, test_client = app_with_client
     token = generate_token_for_person_id_1(app)
@@ -46,3 +48,75 @@ def test_get_personal_info_sqlalchemy_error(mock_fetch, app_with_client):
 
     assert response.status_code == StatusCodes.INTERNAL_SERVER_ERROR
     assert response.json['error'] == 'COULD_NOT_FETCH_COMPETENCES'
+
+
+def test_get_competences_cache_headers(app_with_client):
+    app, test_client = app_with_client
+    setup_competences_in_db(app)
+    token = generate_token_for_person_id_1(app)
+
+    response = test_client.get(
+            '/api/application-form/competences/',
+            headers={'Authorization': f'Bearer {token}'})
+    assert response.status_code == StatusCodes.OK
+    assert response.headers['ETag']
+    assert response.headers['Cache-Control'] == 'private, max-age=300'
+
+    remove_competences_from_db(app)
+
+
+def test_get_competences_not_modified(app_with_client):
+    app, test_client = app_with_client
+    setup_competences_in_db(app)
+    token = generate_token_for_person_id_1(app)
+
+    etag = test_client.get(
+            '/api/application-form/competences/',
+            headers={'Authorization': f'Bearer {token}'}).headers['ETag']
+
+    response = test_client.get(
+            '/api/application-form/competences/',
+            headers={'Authorization': f'Bearer {token}',
+                     'If-None-Match': etag})
+    assert response.status_code == StatusCodes.NOT_MODIFIED
+    assert response.data == b''
+    assert response.headers['ETag'] == etag
+
+    remove_competences_from_db(app)
+
+
+def test_get_competences_etag_mismatch(app_with_client):
+    app, test_client = app_with_client
+    setup_competences_in_db(app)
+    token = generate_token_for_person_id_1(app)
+
+    response = test_client.get(
+            '/api/application-form/competences/',
+            headers={'Authorization': f'Bearer {token}',
+                     'If-None-Match': '"outdated"'})
+    assert response.status_code == StatusCodes.OK
+    assert len(response.json) == 2
+
+    remove_competences_from_db(app)
+
+
+def test_get_competences_compressed(app_with_client):
+    app, test_client = app_with_client
+    setup_competences_in_db(app)
+    token = generate_token_for_person_id_1(app)
+
+    identity = test_client.get(
+            '/api/application-form/competences/',
+            headers={'Authorization': f'Bearer {token}'})
+    response = test_client.get(
+            '/api/application-form/competences/',
+            headers={'Authorization': f'Bearer {token}',
+                     'Accept-Encoding': 'gzip'})
+
+    assert response.status_code == StatusCodes.OK
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.headers['Vary'] == 'Accept-Encoding'
+    assert response.headers['ETag'] != identity.headers['ETag']
+    assert json.loads(gzip.decompress(response.data)) == identity.json
+
+    remove_competences_from_db(app)
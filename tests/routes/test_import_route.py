@@ -0,0 +1,52 @@
+from tests.services.test_import_service import generate_ndjson_line
+from tests.utilities.test_status_codes import StatusCodes
+from tests.utilities.test_utilities import generate_token_for_person_id_1, \
+    generate_token_for_recruiter, remove_application_components_from_db, \
+    remove_competences_from_db, setup_competences_in_db
+
+
+def import_route_post_request(test_client, token, data,
+                              content_type='application/x-ndjson'):
+    return test_client.post('/api/application-form/import/',
+                            headers={'Authorization': f'Bearer {token}'},
+                            data=data, content_type=content_type)
+
+
+def test_import_applications_success(app_with_client):
+    app, test_client = app_with_client
+    setup_competences_in_db(app)
+    token = generate_token_for_recruiter(app)
+
+    data = b''.join(generate_ndjson_line(person_id)
+                    for person_id in range(1, 4)) + b'{"person_id": 4}\n'
+    response = import_route_post_request(test_client, token, data)
+
+    assert response.status_code == StatusCodes.OK
+    assert response.json['imported'] == 3
+    assert response.json['failed'] == 1
+    assert response.json['errors'][0]['line'] == 4
+    assert response.json['errors'][0]['error'] == 'MISSING_AVAILABILITIES'
+
+    remove_competences_from_db(app)
+    remove_application_components_from_db(app)
+
+
+def test_import_applications_unauthorized_role(app_with_client):
+    app, test_client = app_with_client
+    token = generate_token_for_person_id_1(app)
+
+    response = import_route_post_request(test_client, token, b'')
+
+    assert response.status_code == StatusCodes.UNAUTHORIZED
+    assert response.json == {'error': 'UNAUTHORIZED_ROLE'}
+
+
+def test_import_applications_invalid_content_type(app_with_client):
+    app, test_client = app_with_client
+    token = generate_token_for_recruiter(app)
+
+    response = import_route_post_request(test_client, token, b'{}',
+                                         content_type='application/json')
+
+    assert response.status_code == StatusCodes.BAD_REQUEST
+    assert response.json == {'error': 'INVALID_NDJSON_PAYLOAD'}
@@ -0,0 +1,28 @@
+from tests.utilities.test_status_codes import StatusCodes
+from tests.utilities.test_utilities import generate_token_for_person_id_1, \
+    generate_token_for_recruiter
+
+
+def pool_metrics_request(test_client, token):
+    return test_client.get('/api/application-form/metrics/pool',
+                           headers={'Authorization': f'Bearer {token}'})
+
+
+def test_get_pool_metrics(app_with_client):
+    app, test_client = app_with_client
+    token = generate_token_for_recruiter(app)
+
+    response = pool_metrics_request(test_client, token)
+
+    assert response.status_code == StatusCodes.OK
+    assert response.json['pool'] == 'InstrumentedQueuePool'
+    assert response.json['checkouts'] >= 1
+
+
+def test_get_pool_metrics_unauthorized_role(app_with_client):
+    app, test_client = app_with_client
+    token = generate_token_for_person_id_1(app)
+
+    response = pool_metrics_request(test_client, token)
+
+    assert response.status_code == StatusCodes.UNAUTHORIZED
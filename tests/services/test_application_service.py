@@ -2,7 +2,10 @@ from unittest.mock import patch
 
 from sqlalchemy.exc import SQLAlchemyError
 
-from app.services.application_service import already_applied, store_application
+from app.services.application_service import ApplicationCache, \
+    already_applied, application_cache, fetch_application, \
+    fetch_application_status, store_application
+from app.services.idempotency_service import find_idempotent_response
 from tests.utilities.test_utilities import add_application_status_for_user_1, \
     generate_availabilities, \
     generate_competences, remove_application_components_from_db
@@ -26,6 +29,18 @@ def test_insert_application_in_db_success(app_with_client):
     remove_application_components_from_db(app)
 
 
+def test_store_application_already_applied(app_with_client):
+    app, client = app_with_client
+    person_id = 1
+    add_application_status_for_user_1(app)
+
+    with app.app_context():
+        assert store_application(person_id, generate_competences(),
+                                 generate_availabilities()) is None
+
+    remove_application_components_from_db(app)
+
+
 def test_already_applied_true(app_with_client):
     app, client = app_with_client
     person_id = 1
@@ -66,3 +81,91 @@ def test_insert_application_in_db_sqlalchemy_error(
         assert mock_insert.called is True
 
     remove_application_components_from_db(app)
+
+
+def test_store_application_group_commit(app_with_client):
+    app, client = app_with_client
+    app.config['SUBMISSION_GROUP_COMMIT'] = True
+
+    with app.app_context():
+        application = store_application(1, generate_competences(),
+                                        generate_availabilities())
+        assert application['status'] == 'Pending'
+        assert already_applied(1)
+        assert store_application(1, generate_competences(),
+                                 generate_availabilities()) is None
+
+    remove_application_components_from_db(app)
+
+
+def test_store_application_group_commit_idempotent(app_with_client):
+    app, client = app_with_client
+    app.config['SUBMISSION_GROUP_COMMIT'] = True
+
+    with app.app_context():
+        with patch('app.services.group_commit_service.'
+                   'insert_applications_in_db',
+                   side_effect=SQLAlchemyError):
+            try:
+                store_application(1, generate_competences(),
+                                  generate_availabilities(), 'retry-1')
+                assert False
+            except SQLAlchemyError:
+                assert find_idempotent_response(1, 'retry-1') is None
+
+        store_application(1, generate_competences(),
+                          generate_availabilities(), 'retry-1')
+        body, status_code = find_idempotent_response(1, 'retry-1')
+        assert status_code == 201
+        assert app.json.loads(body)['status'] == 'Pending'
+
+    remove_application_components_from_db(app)
+
+
+def test_application_cache_evicts_least_recently_used():
+    cache = ApplicationCache(max_size=2, ttl=30)
+    cache.put(1, {'status': 'Pending'})
+    cache.put(2, {'status': 'Pending'})
+    cache.get(1)
+    cache.put(3, {'status': 'Pending'})
+
+    assert cache.get(1) == {'status': 'Pending'}
+    assert cache.get(2) is None
+    assert cache.get(3) == {'status': 'Pending'}
+
+
+def test_application_cache_expires():
+    cache = ApplicationCache(max_size=2, ttl=0)
+    cache.put(1, {'status': 'Pending'})
+
+    assert cache.get(1) is None
+
+
+def test_fetch_application_written_through(app_with_client):
+    app, client = app_with_client
+
+    with app.app_context():
+        application = store_application(1, generate_competences(),
+                                        generate_availabilities())
+
+        with patch('app.services.application_service.'
+                   'get_application_from_db') as query:
+            assert fetch_application(1) == application
+            assert fetch_application_status(1) == {'status': 'Pending'}
+        query.assert_not_called()
+
+    remove_application_components_from_db(app)
+
+
+def test_fetch_application_from_db(app_with_client):
+    app, client = app_with_client
+
+    with app.app_context():
+        application = store_application(1, generate_competences(),
+                                        generate_availabilities())
+        application_cache.init_app(app)
+
+        assert fetch_application(1) == application
+        assert fetch_application(2) is None
+
+    remove_application_components_from_db(app)
@@ -0,0 +1,77 @@
+from unittest.mock import patch
+
+from app.app import create_app
+from app.services.application_service import already_applied, \
+    store_application
+from app.services.applied_person_service import AppliedPersonFilter, \
+    applied_persons
+from tests.utilities.test_utilities import add_application_status_for_user_1, \
+    generate_availabilities, generate_competences, \
+    remove_application_components_from_db
+
+
+def test_filter_lookup():
+    person_filter = AppliedPersonFilter()
+    person_filter.load([2, 3, 5, 8])
+
+    assert [person_id for person_id in range(10)
+            if person_id in person_filter] == [2, 3, 5, 8]
+    assert 'a' not in person_filter
+    assert len(person_filter) == 4
+    assert person_filter.nbytes == 32
+
+
+def test_filter_add_and_merge():
+    person_filter = AppliedPersonFilter(merge_threshold=3)
+    person_filter.load([2, 4])
+
+    person_filter.add(3)
+    person_filter.add(4)
+    assert 3 in person_filter
+    assert len(person_filter) == 4
+
+    person_filter.add(1)
+    assert len(person_filter) == 4
+    assert [person_id for person_id in range(6)
+            if person_id in person_filter] == [1, 2, 3, 4]
+
+
+def test_filter_warmed_at_startup(app_with_client):
+    app, _ = app_with_client
+    add_application_status_for_user_1(app)
+
+    create_app()
+
+    assert 1 in applied_persons
+    assert 2 not in applied_persons
+
+    remove_application_components_from_db(app)
+
+
+def test_already_applied_uses_filter(app_with_client):
+    app, _ = app_with_client
+    add_application_status_for_user_1(app)
+
+    with app.app_context():
+        assert 1 not in applied_persons
+        assert already_applied(1)
+        assert 1 in applied_persons
+
+        with patch('app.services.application_service.'
+                   'get_application_status_from_db') as query:
+            assert already_applied(1)
+        query.assert_not_called()
+
+    remove_application_components_from_db(app)
+
+
+def test_store_application_updates_filter(app_with_client):
+    app, _ = app_with_client
+
+    with app.app_context():
+        store_application(2, generate_competences(),
+                          generate_availabilities())
+
+    assert 2 in applied_persons
+
+    remove_application_components_from_db(app)
@@ -0,0 +1,229 @@
+import random
+import threading
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from app.models.records import ApplicationRecord, AvailabilityRecord
+from app.repositories.application_repository import insert_applications_in_db
+from app.services.availability_service import AvailabilityBitmaps, \
+    AvailabilityIndex, IntervalTree, search_available_persons
+from tests.utilities.test_utilities import \
+    remove_application_components_from_db
+
+
+def generate_intervals(count: int, seed: int) -> list[tuple[int, int, int]]:
+    generator = random.Random(seed)
+    intervals = []
+    for person_id in range(1, count + 1):
+        start = generator.randrange(1000)
+        intervals.append((start, start + generator.randrange(60), person_id))
+    return sorted(intervals)
+
+
+def test_interval_tree_matches_scan():
+    intervals = generate_intervals(1000, 1)
+    tree = IntervalTree(intervals)
+
+    generator = random.Random(2)
+    for _ in range(100):
+        low = generator.randrange(-10, 1100)
+        high = low + generator.randrange(30)
+        assert sorted(tree.overlapping(low, high)) == sorted(
+                person_id for start, end, person_id in intervals
+                if start <= high and end >= low)
+
+    assert len(tree) == 1000
+    assert list(tree) == intervals
+
+
+def test_interval_tree_empty():
+    assert list(IntervalTree([]).overlapping(0, 10)) == []
+
+
+def insert_availabilities(app, availabilities):
+    with app.app_context():
+        insert_applications_in_db(
+                [ApplicationRecord(person_id, [], [
+                    AvailabilityRecord(person_id, date.fromisoformat(start),
+                                       date.fromisoformat(end))])
+                 for person_id, start, end in availabilities])
+
+
+def test_availability_index_search(app_with_client):
+    app, _ = app_with_client
+    insert_availabilities(app, [(2, '2024-01-01', '2024-01-10'),
+                                (3, '2024-01-05', '2024-02-01'),
+                                (4, '2024-03-01', '2024-03-02')])
+    index = AvailabilityIndex(merge_threshold=2)
+
+    assert index.nbytes == 0
+    with app.app_context():
+        assert index.search(date(2024, 1, 10),
+                            date(2024, 2, 28)) == {2, 3}
+        assert index.nbytes > 0
+
+        index.add([AvailabilityRecord(5, date(2024, 2, 1),
+                                      date(2024, 2, 1))])
+        assert index.search(date(2024, 2, 1), date(2024, 3, 1)) == {3, 4, 5}
+
+        index.add([AvailabilityRecord(6, date(2023, 1, 1),
+                                      date(2025, 1, 1))])
+        with patch('app.services.availability_service.'
+                   'get_availabilities_from_db') as query:
+            assert index.search(date(2024, 2, 1),
+                                date(2024, 3, 1)) == {3, 4, 5, 6}
+        query.assert_not_called()
+
+    remove_application_components_from_db(app)
+
+
+def test_availability_index_merges_in_background(app_with_client):
+    app, _ = app_with_client
+    insert_availabilities(app, [(2, '2024-01-01', '2024-01-10')])
+    index = AvailabilityIndex(merge_threshold=2)
+    merging, release = threading.Event(), threading.Event()
+
+    def build_tree(intervals):
+        merging.set()
+        release.wait(10)
+        return IntervalTree(intervals)
+
+    with app.app_context():
+        assert index.search(date(2024, 1, 1), date(2024, 12, 31)) == {2}
+
+        with patch('app.services.availability_service.IntervalTree',
+                   side_effect=build_tree):
+            index.add([AvailabilityRecord(3, date(2024, 2, 1),
+                                          date(2024, 2, 2)),
+                       AvailabilityRecord(4, date(2024, 3, 1),
+                                          date(2024, 3, 2))])
+            assert merging.wait(10)
+            index.add([AvailabilityRecord(5, date(2024, 4, 1),
+                                          date(2024, 4, 2))])
+            assert index.search(date(2024, 1, 1),
+                                date(2024, 12, 31)) == {2, 3, 4, 5}
+            release.set()
+            index._merge_thread.join(10)
+
+        assert len(index._tree) == 3
+        assert index.search(date(2024, 1, 1),
+                            date(2024, 12, 31)) == {2, 3, 4, 5}
+
+    remove_application_components_from_db(app)
+
+
+def test_availability_index_reloads(app_with_client):
+    app, _ = app_with_client
+    insert_availabilities(app, [(2, '2024-01-01', '2024-01-10')])
+    index = AvailabilityIndex(ttl=0)
+
+    with app.app_context():
+        assert index.search(date(2024, 1, 1), date(2024, 12, 31)) == {2}
+        insert_availabilities(app, [(3, '2024-06-01', '2024-06-10')])
+        assert index.search(date(2024, 1, 1), date(2024, 12, 31)) == {2, 3}
+
+    remove_application_components_from_db(app)
+
+
+def generate_availabilities(first_person_id: int, count: int,
+                            seed: int) -> list[AvailabilityRecord]:
+    generator = random.Random(seed)
+    availabilities = []
+    for person_id in range(first_person_id, first_person_id + count):
+        end = date(2023, 12, 1)
+        for _ in range(generator.randrange(1, 4)):
+            start = end + timedelta(days=generator.randrange(2, 40))
+            end = start + timedelta(days=generator.randrange(30))
+            availabilities.append(AvailabilityRecord(person_id, start, end))
+    return availabilities
+
+
+def count_available_days(availabilities: list[AvailabilityRecord],
+                         from_date: date, to_date: date) -> dict[int, int]:
+    available_days: dict[int, int] = {}
+    for availability in availabilities:
+        days = (min(availability.to_date, to_date)
+                - max(availability.from_date, from_date)).days + 1
+        available_days[availability.person_id] = (
+                available_days.get(availability.person_id, 0) + max(days, 0))
+    return available_days
+
+
+def assert_bitmaps_match_scan(bitmaps: AvailabilityBitmaps,
+                              availabilities: list[AvailabilityRecord],
+                              seed: int) -> None:
+    generator = random.Random(seed)
+    for _ in range(50):
+        from_date = date(2024, 1, 1) + timedelta(
+                days=generator.randrange(120))
+        to_date = min(from_date + timedelta(days=generator.randrange(30)),
+                      bitmaps.last_day)
+        min_days = generator.randrange(1, (to_date - from_date).days + 2)
+        assert bitmaps.search(from_date, to_date, min_days).tolist() == \
+            sorted(person_id for person_id, days in count_available_days(
+                    availabilities, from_date, to_date).items()
+                   if days >= min_days)
+
+
+def test_availability_bitmaps_match_scan(app_with_client):
+    app, _ = app_with_client
+    availabilities = generate_availabilities(1, 100, 1)
+    with app.app_context():
+        insert_applications_in_db([
+            ApplicationRecord(person_id, [], [
+                availability for availability in availabilities
+                if availability.person_id == person_id])
+            for person_id in range(1, 101)])
+    bitmaps = AvailabilityBitmaps(date(2024, 1, 1), 128)
+
+    with app.app_context():
+        assert_bitmaps_match_scan(bitmaps, availabilities, 2)
+        assert bitmaps.nbytes == 100 * (8 + 16)
+
+        added = generate_availabilities(101, 150, 3)
+        bitmaps.add(added)
+        bitmaps.add(availabilities[:2])
+        with patch('app.services.availability_service.'
+                   'get_availabilities_from_db') as query:
+            assert_bitmaps_match_scan(bitmaps, availabilities + added, 4)
+        query.assert_not_called()
+
+    remove_application_components_from_db(app)
+
+
+def test_search_available_persons(app_with_client):
+    app, _ = app_with_client
+    insert_availabilities(app, [(person_id, '2024-01-01', '2024-01-10')
+                                for person_id in range(2, 7)])
+
+    for use_index in (False, True):
+        app.config['AVAILABILITY_INDEX'] = use_index
+        with app.app_context():
+            assert search_available_persons(
+                    date(2024, 1, 10), date(2024, 1, 20), 2, 3) == {
+                'person_ids': [3, 4, 5], 'next_after': 5}
+            assert search_available_persons(
+                    date(2024, 1, 10), date(2024, 1, 20), 5, 3) == {
+                'person_ids': [6], 'next_after': None}
+            assert search_available_persons(
+                    date(2024, 1, 11), date(2024, 1, 20), 0, 3) == {
+                'person_ids': [], 'next_after': None}
+
+    remove_application_components_from_db(app)
+
+
+def test_search_available_persons_min_days(app_with_client):
+    app, _ = app_with_client
+    insert_availabilities(app, [(2, '2024-01-01', '2024-01-10'),
+                                (3, '2024-01-05', '2024-01-20'),
+                                (4, '2024-01-08', '2024-01-09')])
+
+    with app.app_context():
+        assert search_available_persons(
+                date(2024, 1, 5), date(2024, 1, 10), 0, 3, 6) == {
+            'person_ids': [2, 3], 'next_after': None}
+        assert search_available_persons(
+                date(2024, 1, 5), date(2024, 1, 10), 2, 1, 2) == {
+            'person_ids': [3], 'next_after': 3}
+
+    remove_application_components_from_db(app)
@@ -1,9 +1,13 @@
+import threading
+import time
 from unittest.mock import patch
 
 import pytest
 from sqlalchemy.exc import NoResultFound, SQLAlchemyError
 
-from app.services.competences_service import fetch_competences
+from app.models.competence import Competence
+from app.services.competences_service import competence_catalog, \
+    fetch_competence_catalog, fetch_competences, invalidate_competences
 from tests.utilities.test_utilities import remove_competences_from_db, \
     setup_competences_in_db
 
@@ -39,3 +43,97 @@ def test_fetch_competences_sqlalchemy_error(mock_fetch, app_with_client):
         with pytest.raises(SQLAlchemyError) as exception:
             fetch_competences()
         assert str(exception.value) == 'DATABASE CONNECTION ERROR.'
+
+
+def test_fetch_competences_is_cached(app_with_client):
+    app, _ = app_with_client
+    setup_competences_in_db(app)
+    with app.app_context():
+        first = fetch_competences()
+        with patch('app.services.competences_service.'
+                   'get_competences_from_db') as mock_fetch:
+            assert fetch_competences() == first
+            mock_fetch.assert_not_called()
+
+    remove_competences_from_db(app)
+
+
+def test_invalidate_competences_reloads(app_with_client):
+    app, _ = app_with_client
+    setup_competences_in_db(app)
+    with app.app_context():
+        fetch_competences()
+        version = competence_catalog.get().version
+
+        with patch('app.services.competences_service.'
+                   'get_competences_from_db') as mock_fetch:
+            mock_fetch.return_value = [Competence(competence_id=3,
+                                                  i18n_key='designer')]
+            invalidate_competences()
+            assert fetch_competences() == [{'competence_id': 3,
+                                            'i18n_key': 'designer'}]
+            mock_fetch.assert_called_once()
+
+        assert competence_catalog.get().version == version + 1
+
+    remove_competences_from_db(app)
+
+
+def test_fetch_competences_reloads_after_ttl(app_with_client):
+    app, _ = app_with_client
+    setup_competences_in_db(app)
+    with app.app_context():
+        competence_catalog.ttl = 0
+        version = competence_catalog.get().version
+
+        with patch('app.services.competences_service.'
+                   'get_competences_from_db',
+                   return_value=Competence.query.all()) as mock_fetch:
+            fetch_competences()
+            fetch_competences()
+            assert mock_fetch.call_count == 2
+
+        assert competence_catalog.get().version == version
+
+    remove_competences_from_db(app)
+
+
+def test_fetch_competences_single_flight(app_with_client):
+    app, _ = app_with_client
+    competences = [Competence(competence_id=1, i18n_key='tester')]
+
+    def slow_fetch():
+        time.sleep(0.1)
+        return competences
+
+    results = []
+
+    def fetch():
+        results.append(fetch_competences())
+
+    with app.app_context():
+        with patch('app.services.competences_service.'
+                   'get_competences_from_db',
+                   side_effect=slow_fetch) as mock_fetch:
+            threads = [threading.Thread(target=fetch) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            assert mock_fetch.call_count == 1
+
+    assert results == [[{'competence_id': 1, 'i18n_key': 'tester'}]] * 8
+
+
+def test_fetch_competence_catalog_index(app_with_client):
+    app, _ = app_with_client
+    setup_competences_in_db(app)
+    with app.app_context():
+        catalog = fetch_competence_catalog()
+        assert catalog.index == {
+            1: {'competence_id': 1, 'i18n_key': 'tester'},
+            2: {'competence_id': 2, 'i18n_key': 'developer'}}
+        assert fetch_competence_catalog().index is catalog.index
+
+    remove_competences_from_db(app)
@@ -0,0 +1,129 @@
+import csv
+import gzip
+import io
+import json
+import os
+import resource
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.models.records import ApplicationRecord, AvailabilityRecord, \
+    CompetenceRecord
+from app.repositories.application_loader import load_applications_in_db
+from app.repositories.application_repository import insert_applications_in_db
+from app.services.export_service import export_applications
+from tests.repositories.test_spool_repository import \
+    generate_application_record
+from tests.utilities.test_utilities import \
+    remove_application_components_from_db
+
+EXPORT_RSS_BUDGET = 32 * 2 ** 20
+
+
+def resident_set_size() -> int:
+    with open('/proc/self/statm') as statm:
+        return int(statm.read().split()[1]) * resource.getpagesize()
+
+
+def insert_export_applications(app) -> None:
+    with app.app_context():
+        insert_applications_in_db([
+            generate_application_record(2),
+            ApplicationRecord(3, [], [
+                AvailabilityRecord(3, date(2024, 3, 1), date(2024, 3, 2)),
+                AvailabilityRecord(3, date(2024, 1, 1), date(2024, 1, 2))]),
+            ApplicationRecord(4, [CompetenceRecord(4, 2, Decimal('1.00')),
+                                  CompetenceRecord(4, 1, Decimal('0.50'))],
+                              [])])
+
+
+def test_export_applications_ndjson(app_with_client):
+    app, _ = app_with_client
+    insert_export_applications(app)
+
+    with app.app_context():
+        export = b''.join(export_applications('ndjson', chunk_size=10))
+
+    assert [json.loads(line) for line in export.splitlines()] == [
+        {'person_id': 2, 'status': 'Pending',
+         'competences': [{'competence_id': 1,
+                          'years_of_experience': '2.50'}],
+         'availabilities': [{'from_date': '2024-01-01',
+                             'to_date': '2024-01-31'}]},
+        {'person_id': 3, 'status': 'Pending', 'competences': [],
+         'availabilities': [
+             {'from_date': '2024-01-01', 'to_date': '2024-01-02'},
+             {'from_date': '2024-03-01', 'to_date': '2024-03-02'}]},
+        {'person_id': 4, 'status': 'Pending',
+         'competences': [
+             {'competence_id': 1, 'years_of_experience': '0.50'},
+             {'competence_id': 2, 'years_of_experience': '1.00'}],
+         'availabilities': []}]
+
+    remove_application_components_from_db(app)
+
+
+def test_export_applications_csv_gzip(app_with_client):
+    app, _ = app_with_client
+    insert_export_applications(app)
+
+    with app.app_context():
+        export = b''.join(export_applications('csv', compress=True))
+
+    assert list(csv.reader(io.StringIO(gzip.decompress(export).decode()))) \
+        == [['person_id', 'status', 'competences', 'availabilities'],
+            ['2', 'Pending', '1:2.50', '2024-01-01/2024-01-31'],
+            ['3', 'Pending', '',
+             '2024-01-01/2024-01-02;2024-03-01/2024-03-02'],
+            ['4', 'Pending', '1:0.50;2:1.00', '']]
+
+    remove_application_components_from_db(app)
+
+
+def test_export_applications_sqlalchemy_error(app_with_client):
+    app, _ = app_with_client
+
+    with app.app_context():
+        with patch('app.repositories.application_repository.database.'
+                   'session.execute', side_effect=SQLAlchemyError):
+            with pytest.raises(SQLAlchemyError) as exception:
+                next(export_applications('ndjson'))
+
+    assert exception.value.args[0] == {'error': 'DATABASE_ERROR'}
+
+
+@pytest.mark.skipif(not os.path.exists('/proc/self/statm'),
+                    reason='Needs /proc to measure the resident set size')
+def test_export_applications_rss_budget(app_with_client):
+    app, _ = app_with_client
+    first_day = date(2024, 1, 1)
+    with app.app_context():
+        load_applications_in_db(
+                ApplicationRecord(
+                        person_id,
+                        [CompetenceRecord(person_id, 1, Decimal('1.50'))],
+                        [AvailabilityRecord(
+                            person_id,
+                            first_day + timedelta(days=person_id % 300),
+                            first_day + timedelta(days=person_id % 300 + 9)),
+                         AvailabilityRecord(
+                            person_id,
+                            first_day + timedelta(days=person_id % 300 + 20),
+                            first_day + timedelta(days=person_id % 300 + 29))
+                         ])
+                for person_id in range(1, 250001))
+
+        baseline = peak = resident_set_size()
+        exported = 0
+        for chunk in export_applications('ndjson'):
+            exported += chunk.count(b'\n')
+            peak = max(peak, resident_set_size())
+
+    assert exported == 250000
+    assert peak - baseline < EXPORT_RSS_BUDGET
+
+    remove_application_components_from_db(app)
@@ -0,0 +1,82 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.models.application import ApplicationStatus
+from app.repositories.application_repository import insert_applications_in_db
+from app.services.group_commit_service import GroupCommitter, \
+    group_committer
+from tests.repositories.test_spool_repository import \
+    generate_application_record
+from tests.utilities.test_utilities import add_application_status_for_user_1, \
+    remove_application_components_from_db
+
+
+def submit_concurrently(app, person_ids) -> list:
+    def submit(person_id):
+        with app.app_context():
+            return group_committer.submit(
+                    generate_application_record(person_id))
+
+    with ThreadPoolExecutor(len(person_ids)) as executor:
+        return list(executor.map(submit, person_ids))
+
+
+def test_submit_shares_transactions(app_with_client):
+    app, _ = app_with_client
+    app.config['SUBMISSION_GROUP_COMMIT_WINDOW'] = 200
+    group_committer.init_app(app)
+    add_application_status_for_user_1(app)
+
+    with patch('app.services.group_commit_service.insert_applications_in_db',
+               wraps=insert_applications_in_db) as insert:
+        results = submit_concurrently(app, [1, 2, 3, 4, 5, 2])
+
+    assert results == [False, True, True, True, True, False]
+    assert insert.call_count < 6
+    with app.app_context():
+        assert ApplicationStatus.query.count() == 5
+
+    remove_application_components_from_db(app)
+
+
+def test_submit_isolates_failures(app_with_client):
+    app, _ = app_with_client
+    app.config['SUBMISSION_GROUP_COMMIT_WINDOW'] = 200
+    group_committer.init_app(app)
+
+    def insert_or_fail(applications, idempotency_keys):
+        if len(applications) > 1 or applications[0].person_id == 3:
+            raise SQLAlchemyError
+        return insert_applications_in_db(applications, idempotency_keys)
+
+    with patch('app.services.group_commit_service.insert_applications_in_db',
+               side_effect=insert_or_fail):
+        def submit(person_id):
+            try:
+                return submit_concurrently(app, [person_id])[0]
+            except SQLAlchemyError:
+                return None
+
+        with ThreadPoolExecutor(3) as executor:
+            results = list(executor.map(submit, [2, 3, 4]))
+
+    assert results == [True, None, True]
+    with app.app_context():
+        assert ApplicationStatus.query.count() == 2
+
+    remove_application_components_from_db(app)
+
+
+def test_submit_not_initialized():
+    committer = GroupCommitter()
+
+    with patch('app.services.group_commit_service.insert_applications_in_db'
+               ) as insert:
+        with pytest.raises(SQLAlchemyError):
+            committer.submit(generate_application_record(1))
+
+    insert.assert_not_called()
@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.extensions import database
+from app.models.idempotency_key import IdempotencyKey
+from app.services.idempotency_service import find_idempotent_response, \
+    save_idempotent_response, valid_idempotency_key
+
+
+def test_save_and_find_idempotent_response(app_with_client):
+    app, _ = app_with_client
+
+    with app.app_context():
+        save_idempotent_response(1, 'key', 201, {'status': 'Pending'})
+        save_idempotent_response(1, 'key', 202, {'status': 'Queued'})
+
+        body, status_code = find_idempotent_response(1, 'key')
+        assert app.json.loads(body) == {'status': 'Pending'}
+        assert status_code == 201
+        assert find_idempotent_response(2, 'key') is None
+        assert find_idempotent_response(1, 'other') is None
+
+
+def test_find_expired_idempotent_response(app_with_client):
+    app, _ = app_with_client
+    app.config['IDEMPOTENCY_KEY_TTL'] = 60
+
+    with app.app_context():
+        save_idempotent_response(1, 'key', 201, {'status': 'Pending'})
+        IdempotencyKey.query.one().created_at = (
+                datetime.utcnow() - timedelta(seconds=61))
+        database.session.commit()
+
+        assert find_idempotent_response(1, 'key') is None
+
+
+def test_save_purges_expired_responses(app_with_client):
+    app, _ = app_with_client
+    app.config['IDEMPOTENCY_KEY_PURGE_INTERVAL'] = 1
+
+    with app.app_context():
+        save_idempotent_response(1, 'key', 201, {'status': 'Pending'})
+        IdempotencyKey.query.one().created_at = datetime(2000, 1, 1)
+        database.session.commit()
+
+        save_idempotent_response(2, 'key', 201, {'status': 'Pending'})
+
+        assert [idempotency_key.person_id for idempotency_key
+                in IdempotencyKey.query.all()] == [2]
+
+
+def test_find_idempotent_response_failure(app_with_client):
+    app, _ = app_with_client
+
+    with app.app_context():
+        with patch('app.services.idempotency_service.'
+                   'get_idempotency_key_from_db',
+                   side_effect=SQLAlchemyError):
+            with pytest.raises(SQLAlchemyError) as exception:
+                find_idempotent_response(1, 'key')
+
+    assert exception.value.args[0] == {'error': 'DATABASE_ERROR'}
+
+
+def test_valid_idempotency_key():
+    assert valid_idempotency_key('3f2a-retry')
+    assert not valid_idempotency_key('')
+    assert not valid_idempotency_key('k' * 256)
+    assert not valid_idempotency_key('key\n')
+    assert not valid_idempotency_key('nyckel-å')
@@ -0,0 +1,130 @@
+import json
+from unittest.mock import patch
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.models.application import ApplicationStatus
+from app.models.availability import Availability
+from app.models.competence_profile import CompetenceProfile
+from app.services.import_service import import_applications
+from tests.utilities.test_utilities import add_application_status_for_user_1, \
+    remove_application_components_from_db, remove_competences_from_db, \
+    setup_competences_in_db
+
+
+def generate_ndjson_line(person_id: int, **fields) -> bytes:
+    application = {
+        'person_id': person_id,
+        'competences': [{'competence_id': 1, 'years_of_experience': '2.5'}],
+        'availabilities': [{'from_date': '2024-01-01',
+                            'to_date': '2024-01-31'}]}
+    application.update(fields)
+    return json.dumps(application).encode() + b'\n'
+
+
+def test_import_applications_success(app_with_client):
+    app, _ = app_with_client
+    setup_competences_in_db(app)
+    lines = [generate_ndjson_line(person_id) for person_id in range(2, 7)]
+
+    with app.app_context():
+        report = import_applications(lines, chunk_size=2)
+
+        assert report == {'imported': 5, 'failed': 0, 'errors': []}
+        assert ApplicationStatus.query.count() == 5
+        assert CompetenceProfile.query.count() == 5
+        assert Availability.query.count() == 5
+
+    remove_competences_from_db(app)
+    remove_application_components_from_db(app)
+
+
+def test_import_applications_reports_failed_lines(app_with_client):
+    app, _ = app_with_client
+    setup_competences_in_db(app)
+    add_application_status_for_user_1(app)
+    lines = [generate_ndjson_line(1),
+             b'not json\n',
+             b'\n',
+             generate_ndjson_line(2),
+             generate_ndjson_line(2),
+             generate_ndjson_line(0),
+             generate_ndjson_line(3, availabilities=[])]
+
+    with app.app_context():
+        report = import_applications(lines, chunk_size=10)
+
+        assert report['imported'] == 1
+        assert report['failed'] == 5
+        assert sorted((error['line'], error['error'])
+                      for error in report['errors']) == [
+                   (1, 'ALREADY_APPLIED_BEFORE'),
+                   (2, 'INVALID_JSON_PAYLOAD'),
+                   (5, 'ALREADY_APPLIED_BEFORE'),
+                   (6, 'INVALID_PERSON_ID'),
+                   (7, 'MISSING_AVAILABILITIES')]
+        assert ApplicationStatus.query.count() == 2
+        assert CompetenceProfile.query.count() == 1
+
+    remove_competences_from_db(app)
+    remove_application_components_from_db(app)
+
+
+@patch('app.services.import_service.insert_applications_in_db')
+def test_import_applications_sqlalchemy_error(mock_insert, app_with_client):
+    app, _ = app_with_client
+    setup_competences_in_db(app)
+    mock_insert.side_effect = [SQLAlchemyError, {3}]
+    lines = [generate_ndjson_line(person_id) for person_id in (1, 2, 3)]
+
+    with app.app_context():
+        report = import_applications(lines, chunk_size=2)
+
+    assert report['imported'] == 1
+    assert report['errors'] == [{'line': 1, 'error': 'DATABASE_ERROR'},
+                                {'line': 2, 'error': 'DATABASE_ERROR'}]
+
+    remove_competences_from_db(app)
+
+
+def test_import_applications_bulk_load(app_with_client):
+    app, _ = app_with_client
+    setup_competences_in_db(app)
+    lines = [generate_ndjson_line(person_id) for person_id in range(1, 6)]
+    lines.append(generate_ndjson_line(3))
+
+    with app.app_context():
+        report = import_applications(lines, chunk_size=2, bulk_load=True)
+
+        assert report['imported'] == 5
+        assert report['errors'] == [{'line': 6,
+                                     'error': 'ALREADY_APPLIED_BEFORE'}]
+        assert report['load']['rows'] == 15
+        assert ApplicationStatus.query.count() == 5
+
+    remove_competences_from_db(app)
+    remove_application_components_from_db(app)
+
+
+def test_import_applications_bulk_load_updates_caches(app_with_client):
+    app, _ = app_with_client
+    setup_competences_in_db(app)
+    lines = [generate_ndjson_line(person_id) for person_id in range(1, 6)]
+
+    with app.app_context(), \
+            patch('app.services.import_service.applied_persons') as applied, \
+            patch('app.services.import_service.availability_index') as index, \
+            patch('app.services.import_service.availability_bitmaps') \
+            as bitmaps, \
+            patch('app.services.import_service.applicant_ranking') as ranking:
+        import_applications(lines, chunk_size=2, bulk_load=True)
+
+    assert sorted(call.args[0] for call in applied.add.call_args_list) == [
+        1, 2, 3, 4, 5]
+    assert index.add.call_count == bitmaps.add.call_count == 5
+    assert sorted(application.person_id
+                  for call in ranking.add.call_args_list
+                  for application in call.args[0]) == [1, 2, 3, 4, 5]
+
+    remove_competences_from_db(app)
+    remove_application_components_from_db(app)
@@ -0,0 +1,62 @@
+import inspect
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+from app.services.pool_metrics_service import InstrumentedQueuePool, \
+    PoolMetrics, fetch_pool_metrics, pool_metrics
+
+
+def test_pool_metrics_wait_histogram():
+    metrics = PoolMetrics()
+
+    for seconds in (0.0002, 0.001, 0.003, 0.7, 12):
+        metrics.record_wait(seconds)
+    metrics.count('timeouts')
+
+    snapshot = metrics.snapshot()
+    assert snapshot['wait_counts'] == [2, 1, 0, 0, 0, 0, 1, 0, 1]
+    assert snapshot['wait_seconds_max'] == 12
+    assert snapshot['wait_seconds_total'] == pytest.approx(12.7042)
+    assert snapshot['timeouts'] == 1
+    assert snapshot['checkouts'] == 0
+
+
+def test_queue_pool_do_get_unchanged():
+    assert '_do_get' in vars(QueuePool)
+    assert list(inspect.signature(QueuePool._do_get).parameters) == ['self']
+
+
+def test_instrumented_queue_pool_counts_checkouts_and_timeouts(tmp_path):
+    engine = create_engine(f'sqlite:///{tmp_path / "pool.db"}',
+                           poolclass=InstrumentedQueuePool, pool_size=1,
+                           max_overflow=0, pool_timeout=0.01)
+    before = pool_metrics.snapshot()
+
+    with engine.connect():
+        with pytest.raises(PoolTimeoutError):
+            engine.connect()
+    engine.dispose()
+
+    after = pool_metrics.snapshot()
+    assert after['checkouts'] - before['checkouts'] == 1
+    assert after['checkins'] - before['checkins'] == 1
+    assert after['connects'] - before['connects'] == 1
+    assert after['timeouts'] - before['timeouts'] == 1
+    assert sum(after['wait_counts']) - sum(before['wait_counts']) == 2
+    assert after['wait_seconds_max'] >= 0.01
+
+
+def test_fetch_pool_metrics(app_with_client):
+    app, _ = app_with_client
+
+    with app.app_context():
+        metrics = fetch_pool_metrics()
+
+    assert metrics['pool'] == 'InstrumentedQueuePool'
+    assert metrics['size'] == app.config['DATABASE_POOL_SIZE']
+    assert metrics['checked_out'] == 0
+    assert len(metrics['wait_counts']) == \
+        len(metrics['wait_seconds_buckets']) + 1
@@ -0,0 +1,194 @@
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.models.records import ApplicationRecord, AvailabilityRecord, \
+    CompetenceRecord, JobProfile, JobRequirement
+from app.repositories.application_repository import insert_applications_in_db
+from app.services.ranking_service import ApplicantColumns, \
+    ApplicantRanking, rank_applicants
+from tests.utilities.test_utilities import \
+    remove_application_components_from_db
+
+FIRST_DAY = date(2024, 1, 1)
+
+
+def generate_applications(first_person_id: int, count: int,
+                          seed: int) -> list[ApplicationRecord]:
+    generator = random.Random(seed)
+    applications = []
+    for person_id in range(first_person_id, first_person_id + count):
+        competences = [
+            CompetenceRecord(person_id, competence_id,
+                             Decimal(generator.randrange(1000)) / 100)
+            for competence_id in generator.sample(range(1, 6), 3)]
+        start = FIRST_DAY + timedelta(days=generator.randrange(60))
+        end = start + timedelta(days=generator.randrange(20))
+        availabilities = [
+            AvailabilityRecord(person_id, start, end),
+            AvailabilityRecord(person_id, start + timedelta(days=30),
+                               start + timedelta(days=40))]
+        applications.append(ApplicationRecord(
+                person_id, competences, availabilities))
+    return applications
+
+
+def extend_columns(columns: ApplicantColumns,
+                   applications: list[ApplicationRecord]) -> ApplicantColumns:
+    return columns.extend(
+            [(competence.person_id, competence.competence_id,
+              competence.years_of_experience)
+             for application in applications
+             for competence in application.competences],
+            [(availability.person_id, availability.from_date.toordinal(),
+              availability.to_date.toordinal())
+             for application in applications
+             for availability in application.availabilities])
+
+
+def rank_by_scan(applications: list[ApplicationRecord],
+                 profile: JobProfile) -> list[tuple[int, float, float]]:
+    days = (profile.to_date - profile.from_date).days + 1
+    ranked = []
+    for application in applications:
+        years = {competence.competence_id: competence.years_of_experience
+                 for competence in application.competences}
+        if any(years.get(requirement.competence_id, -1)
+               < requirement.min_years
+               for requirement in profile.requirements):
+            continue
+        available_days = {
+            availability.from_date + timedelta(days=day)
+            for availability in application.availabilities
+            for day in range((availability.to_date
+                              - availability.from_date).days + 1)}
+        covered = sum(profile.from_date + timedelta(days=day)
+                      in available_days for day in range(days))
+        if covered:
+            ranked.append((application.person_id, float(sum(
+                    requirement.weight * float(
+                            years[requirement.competence_id])
+                    for requirement in profile.requirements))
+                    * covered / days, covered / days))
+    return sorted(ranked, key=lambda applicant: (-applicant[1], applicant[0]))
+
+
+def assert_ranked(ranked: list[tuple[int, float, float]],
+                  expected: list[tuple[int, float, float]]) -> None:
+    assert [person_id for person_id, _, _ in ranked] == [
+        person_id for person_id, _, _ in expected]
+    assert [value for _, score, coverage in ranked
+            for value in (score, coverage)] == pytest.approx(
+                [value for _, score, coverage in expected
+                 for value in (score, coverage)])
+
+
+def test_applicant_columns_rank_matches_scan():
+    applications = generate_applications(1, 500, 1)
+    columns = extend_columns(extend_columns(
+            ApplicantColumns.empty(), applications[:300]), applications[250:])
+    profile = JobProfile([JobRequirement(1, Decimal('2.50'), 2.0),
+                          JobRequirement(3, Decimal('0.00'), 0.5)],
+                         date(2024, 2, 1), date(2024, 2, 14))
+
+    expected = rank_by_scan(applications, profile)
+
+    assert len(columns) == 500
+    assert_ranked(columns.rank(profile, 10), expected[:10])
+    assert_ranked(columns.rank(profile, 1000), expected)
+
+
+def test_applicant_columns_extend_in_place():
+    applications = generate_applications(1, 30, 3)
+    profile = JobProfile([JobRequirement(2, Decimal('0.00'), 1.0)],
+                         FIRST_DAY, FIRST_DAY + timedelta(days=90))
+
+    first = extend_columns(ApplicantColumns.empty(), applications[:10])
+    second = extend_columns(first, applications[10:11])
+    third = extend_columns(second, applications[11:12])
+    branch = extend_columns(second, applications[20:22])
+
+    assert np.shares_memory(second.experience, third.experience)
+    assert not np.shares_memory(second.experience, branch.experience)
+    for columns, expected in ((first, applications[:10]),
+                              (second, applications[:11]),
+                              (third, applications[:12]),
+                              (branch,
+                               applications[:11] + applications[20:22])):
+        assert_ranked(columns.rank(profile, 100),
+                      rank_by_scan(expected, profile))
+
+
+def test_applicant_columns_rank_overlapping_availabilities():
+    applications = generate_applications(1, 200, 4)
+    generator = random.Random(5)
+    for application in applications:
+        for availability in list(application.availabilities):
+            start = availability.from_date + timedelta(
+                    days=generator.randrange(-5, 15))
+            application.availabilities.append(AvailabilityRecord(
+                    application.person_id, start,
+                    start + timedelta(days=generator.randrange(10))))
+    columns = extend_columns(ApplicantColumns.empty(), applications)
+    profile = JobProfile([JobRequirement(4, Decimal('0.00'), 1.0)],
+                         date(2024, 1, 20), date(2024, 2, 20))
+
+    ranked = columns.rank(profile, 1000)
+
+    assert_ranked(ranked, rank_by_scan(applications, profile))
+    assert max(coverage for _, _, coverage in ranked) <= 1.0
+
+
+def test_applicant_columns_rank_unknown_competence():
+    columns = extend_columns(ApplicantColumns.empty(),
+                             generate_applications(1, 10, 1))
+    profile = JobProfile([JobRequirement(99, Decimal('0.00'), 1.0)],
+                         FIRST_DAY, FIRST_DAY)
+
+    assert columns.rank(profile, 10) == []
+    assert ApplicantColumns.empty().rank(profile, 10) == []
+
+
+def test_applicant_ranking_loads_and_adds(app_with_client):
+    app, _ = app_with_client
+    applications = generate_applications(1, 20, 2)
+    with app.app_context():
+        insert_applications_in_db(applications[:10])
+    ranking = ApplicantRanking()
+    profile = JobProfile([JobRequirement(2, Decimal('0.00'), 1.0)],
+                         FIRST_DAY, FIRST_DAY + timedelta(days=90))
+
+    assert ranking.nbytes == 0
+    with app.app_context():
+        assert_ranked(ranking.rank(profile, 100),
+                      rank_by_scan(applications[:10], profile))
+        assert ranking.nbytes > 0
+
+        ranking.add(applications[10:])
+        with patch('app.services.ranking_service.'
+                   'get_competence_profiles_from_db') as mock:
+            assert_ranked(ranking.rank(profile, 100),
+                          rank_by_scan(applications, profile))
+        mock.assert_not_called()
+
+    remove_application_components_from_db(app)
+
+
+def test_rank_applicants_sqlalchemy_error(app_with_client):
+    app, _ = app_with_client
+    profile = JobProfile([JobRequirement(1, Decimal('0.00'), 1.0)],
+                         FIRST_DAY, FIRST_DAY)
+
+    with app.app_context():
+        with patch('app.services.ranking_service.'
+                   'get_competence_profiles_from_db',
+                   side_effect=SQLAlchemyError):
+            with pytest.raises(SQLAlchemyError) as exception:
+                rank_applicants(profile, 10)
+
+    assert exception.value.args[0] == {'error': 'DATABASE_ERROR'}
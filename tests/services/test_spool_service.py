@@ -0,0 +1,133 @@
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.models.application import ApplicationStatus
+from app.models.availability import Availability
+from app.repositories.application_repository import insert_applications_in_db
+from app.services.spool_service import get_spooled_application_status, \
+    spool_application, submission_spool
+from tests.repositories.test_spool_repository import \
+    generate_application_record
+from tests.utilities.test_utilities import add_application_status_for_user_1, \
+    remove_application_components_from_db
+
+
+def enable_spool(app, tmp_path) -> None:
+    app.config.update({
+        'SUBMISSION_SPOOL_ENABLED': True,
+        'SUBMISSION_SPOOL_PATH': str(tmp_path / 'spool.db')
+    })
+    submission_spool.init_app(app)
+
+
+def spool_application_record(person_id: int) -> str:
+    application = generate_application_record(person_id)
+    return spool_application(person_id, application.competences,
+                             application.availabilities)
+
+
+def test_drain(app_with_client, tmp_path):
+    app, _ = app_with_client
+    enable_spool(app, tmp_path)
+    add_application_status_for_user_1(app)
+
+    with app.app_context():
+        with patch.object(submission_spool, 'start'):
+            rejected = spool_application_record(1)
+            stored = spool_application_record(2)
+
+        assert submission_spool.drain() == 2
+        assert submission_spool.drain() == 0
+
+        assert get_spooled_application_status(1, rejected) == 'Rejected'
+        assert get_spooled_application_status(2, stored) == 'Stored'
+        assert ApplicationStatus.query.count() == 2
+        assert Availability.query.filter_by(person_id=2).count() == 1
+
+    submission_spool.stop()
+    remove_application_components_from_db(app)
+
+
+def test_drain_reclaimed_after_store(app_with_client, tmp_path):
+    app, _ = app_with_client
+    enable_spool(app, tmp_path)
+
+    with app.app_context():
+        with patch.object(submission_spool, 'start'):
+            tracking_id = spool_application_record(2)
+        insert_applications_in_db([generate_application_record(2)])
+
+        assert submission_spool.drain() == 1
+        assert get_spooled_application_status(2, tracking_id) == 'Stored'
+
+        submission_spool.retention = -1
+        assert submission_spool.prune() == 1
+        assert get_spooled_application_status(2, tracking_id) is None
+
+    submission_spool.stop()
+    remove_application_components_from_db(app)
+
+
+def test_spool_requires_absolute_path(app_with_client):
+    app, _ = app_with_client
+    app.config.update({'SUBMISSION_SPOOL_ENABLED': True,
+                       'SUBMISSION_SPOOL_PATH': 'spool/submissions.db'})
+
+    with pytest.raises(RuntimeError):
+        submission_spool.init_app(app)
+
+    app.config['SUBMISSION_SPOOL_ENABLED'] = False
+    submission_spool.init_app(app)
+
+
+def test_drain_failure_releases_batch(app_with_client, tmp_path):
+    app, _ = app_with_client
+    enable_spool(app, tmp_path)
+
+    with app.app_context():
+        with patch.object(submission_spool, 'start'):
+            tracking_id = spool_application_record(2)
+
+        with patch('app.services.spool_service.insert_applications_in_db',
+                   side_effect=SQLAlchemyError):
+            assert submission_spool.drain() == 0
+
+        assert get_spooled_application_status(2, tracking_id) == 'Queued'
+
+    submission_spool.stop()
+
+
+def test_drainer_thread(app_with_client, tmp_path):
+    app, _ = app_with_client
+    enable_spool(app, tmp_path)
+
+    with app.app_context():
+        tracking_id = spool_application_record(2)
+        submission_spool.stop()
+        submission_spool.drain()
+
+        assert get_spooled_application_status(2, tracking_id) == 'Stored'
+
+    remove_application_components_from_db(app)
+
+
+def test_get_status_of_other_person(app_with_client, tmp_path):
+    app, _ = app_with_client
+    enable_spool(app, tmp_path)
+
+    with app.app_context():
+        with patch.object(submission_spool, 'start'):
+            tracking_id = spool_application_record(2)
+
+        assert get_spooled_application_status(3, tracking_id) is None
+
+    submission_spool.stop()
+
+
+def test_spool_disabled(app_with_client):
+    app, _ = app_with_client
+
+    with app.app_context():
+        assert get_spooled_application_status(2, 'unknown') is None
@@ -0,0 +1,75 @@
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.repositories.application_repository import insert_applications_in_db
+from app.services.statistics_service import fetch_application_statistics, \
+    rebuild_application_statistics
+from tests.repositories.test_statistics_repository import \
+    generate_application
+from tests.utilities.test_utilities import \
+    remove_application_components_from_db
+
+
+def test_fetch_application_statistics(app_with_client):
+    app, _ = app_with_client
+
+    with app.app_context():
+        insert_applications_in_db([
+            generate_application(1, Decimal('0.5'), Decimal('12')),
+            generate_application(2, Decimal('0.75')),
+            generate_application(3, Decimal('3'))])
+
+        statistics = fetch_application_statistics()
+
+    assert statistics == {
+        'applications': {'Pending': 3},
+        'years_of_experience_buckets': [0, 1, 2, 3, 5, 10, 20],
+        'competences': [
+            {'competence_id': 1, 'applicants': 3,
+             'years_of_experience': [2, 0, 0, 1, 0, 0, 0]},
+            {'competence_id': 2, 'applicants': 1,
+             'years_of_experience': [0, 0, 0, 0, 0, 1, 0]}]
+    }
+
+    remove_application_components_from_db(app)
+
+
+def test_fetch_application_statistics_empty(app_with_client):
+    app, _ = app_with_client
+
+    with app.app_context():
+        assert fetch_application_statistics() == {
+            'applications': {},
+            'years_of_experience_buckets': [0, 1, 2, 3, 5, 10, 20],
+            'competences': []
+        }
+
+
+def test_rebuild_application_statistics(app_with_client):
+    app, _ = app_with_client
+
+    with app.app_context():
+        insert_applications_in_db([generate_application(1, Decimal('4'))])
+        before = fetch_application_statistics()
+
+        report = rebuild_application_statistics()
+
+        assert report['counters'] == 3
+        assert fetch_application_statistics() == before
+
+    remove_application_components_from_db(app)
+
+
+def test_fetch_application_statistics_sqlalchemy_error(app_with_client):
+    app, _ = app_with_client
+
+    with app.app_context():
+        with patch('app.extensions.database.session.execute',
+                   side_effect=SQLAlchemyError):
+            with pytest.raises(SQLAlchemyError) as exception_info:
+                fetch_application_statistics()
+
+    assert exception_info.value.args[0] == {'error': 'DATABASE_ERROR'}
@@ -0,0 +1,229 @@
+from datetime import date
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.models.records import AvailabilityRecord, CompetenceRecord, \
+    JobProfile, JobRequirement
+from app.services.validation_service import canonicalize_availabilities, \
+    validate_application, validate_job_profile
+from tests.utilities.test_utilities import remove_competences_from_db, \
+    setup_competences_in_db
+
+
+def test_validate_application_success(app_with_client):
+    app, _ = app_with_client
+    setup_competences_in_db(app)
+
+    with app.app_context():
+        result = validate_application(1, {
+            'competences': [
+                {'competence_id': 1, 'years_of_experience': '5'},
+                {'competence_id': 2, 'years_of_experience': 2.345}],
+            'availabilities': [
+                {'from_date': '2024-02-29', 'to_date': '2024-03-01'}]})
+
+    assert result.errors == []
+    assert result.competences == [
+        CompetenceRecord(1, 1, Decimal('5.00')),
+        CompetenceRecord(1, 2, Decimal('2.35'))]
+    assert result.availabilities == [
+        AvailabilityRecord(1, date(2024, 2, 29), date(2024, 3, 1))]
+
+    remove_competences_from_db(app)
+
+
+def test_validate_application_reports_all_errors(app_with_client):
+    app, _ = app_with_client
+    setup_competences_in_db(app)
+
+    with app.app_context():
+        result = validate_application(1, {
+            'competences': [
+                {'competence_id': 999, 'years_of_experience': '-1'},
+                {'years_of_experience': '1'},
+                'invalid'],
+            'availabilities': [
+                {'from_date': '2023-02-29', 'to_date': '2023-03-01'},
+                {'from_date': '2023-03-02', 'to_date': '2023-03-01'}]})
+
+    assert result.errors == [
+        {'field': 'competences[0].competence_id',
+         'error': 'INVALID_COMPETENCE_ID'},
+        {'field': 'competences[0].years_of_experience',
+         'error': 'INVALID_YEARS_OF_EXPERIENCE'},
+        {'field': 'competences[1].competence_id',
+         'error': 'MISSING_COMPETENCE_ID'},
+        {'field': 'competences[2]', 'error': 'INVALID_COMPETENCE'},
+        {'field': 'availabilities[0].from_date',
+         'error': 'INVALID_DATE_FORMAT'},
+        {'field': 'availabilities[1]', 'error': 'INVALID_DATE_RANGE'}]
+    assert result.competences == []
+    assert result.availabilities == []
+
+    remove_competences_from_db(app)
+
+
+@pytest.mark.parametrize('years_of_experience', [
+    '100', 100, 'abc', '1e1', float('nan'), True, None, [1]])
+def test_validate_application_invalid_years_of_experience(
+        app_with_client, years_of_experience):
+    app, _ = app_with_client
+    setup_competences_in_db(app)
+
+    with app.app_context():
+        result = validate_application(1, {
+            'competences': [{'competence_id': 1,
+                             'years_of_experience': years_of_experience}],
+            'availabilities': [
+                {'from_date': '2024-01-01', 'to_date': '2024-01-02'}]})
+
+    assert [error['error'] for error in result.errors] == [
+        'INVALID_YEARS_OF_EXPERIENCE']
+
+    remove_competences_from_db(app)
+
+
+@pytest.mark.parametrize('from_date', [
+    '2024-1-01', '2024-13-01', '2023-02-29', '0000-01-01', '202\u00b2-01-01',
+    '\uff12\uff10\uff12\uff14-01-01', 20240101])
+def test_validate_application_invalid_date(app_with_client, from_date):
+    app, _ = app_with_client
+    setup_competences_in_db(app)
+
+    with app.app_context():
+        result = validate_application(1, {
+            'competences': [{'competence_id': 1,
+                             'years_of_experience': '1'}],
+            'availabilities': [
+                {'from_date': from_date, 'to_date': '2024-01-02'}]})
+
+    assert result.errors == [{'field': 'availabilities[0].from_date',
+                              'error': 'INVALID_DATE_FORMAT'}]
+
+    remove_competences_from_db(app)
+
+
+def test_validate_application_invalid_payload(app_with_client):
+    app, _ = app_with_client
+
+    with app.app_context():
+        result = validate_application(1, ['not', 'an', 'object'])
+
+    assert result.errors == [{'field': '',
+                              'error': 'INVALID_PAYLOAD_STRUCTURE'}]
+
+
+def test_validate_application_without_competences_skips_catalog(
+        app_with_client):
+    app, _ = app_with_client
+
+    with app.app_context():
+        with patch('app.services.validation_service.'
+                   'fetch_competence_catalog') as mock_fetch:
+            result = validate_application(1, {'availabilities': [
+                {'from_date': '2024-01-01', 'to_date': '2024-01-02'}]})
+            mock_fetch.assert_not_called()
+
+    assert result.errors == []
+
+
+def test_validate_application_sqlalchemy_error(app_with_client):
+    app, _ = app_with_client
+
+    with app.app_context():
+        with patch('app.services.validation_service.'
+                   'fetch_competence_catalog',
+                   side_effect=SQLAlchemyError('DATABASE ERROR')):
+            with pytest.raises(SQLAlchemyError) as exception:
+                validate_application(1, {
+                    'competences': [{'competence_id': 1,
+                                     'years_of_experience': 1}],
+                    'availabilities': [{'from_date': '2024-01-01',
+                                        'to_date': '2024-01-02'}]})
+
+    assert exception.value.args[0] == {'error': 'DATABASE_ERROR'}
+
+
+def test_canonicalize_availabilities():
+    availabilities = [
+        AvailabilityRecord(1, date(2024, 3, 1), date(2024, 3, 5)),
+        AvailabilityRecord(1, date(2024, 1, 1), date(2024, 1, 10)),
+        AvailabilityRecord(1, date(2024, 1, 5), date(2024, 1, 7)),
+        AvailabilityRecord(1, date(2024, 1, 11), date(2024, 1, 20)),
+        AvailabilityRecord(1, date(2024, 3, 7), date(2024, 3, 8)),
+        AvailabilityRecord(1, date(2024, 3, 1), date(2024, 3, 5))]
+
+    assert canonicalize_availabilities(availabilities) == [
+        AvailabilityRecord(1, date(2024, 1, 1), date(2024, 1, 20)),
+        AvailabilityRecord(1, date(2024, 3, 1), date(2024, 3, 5)),
+        AvailabilityRecord(1, date(2024, 3, 7), date(2024, 3, 8))]
+
+
+def test_validate_application_too_many_availabilities(app_with_client):
+    app, _ = app_with_client
+    app.config['MAX_AVAILABILITIES'] = 2
+
+    with app.app_context():
+        result = validate_application(1, {'availabilities': [
+            {'from_date': '2024-01-01', 'to_date': '2024-01-02'}] * 3})
+
+    assert result.errors == [{'field': 'availabilities',
+                              'error': 'TOO_MANY_AVAILABILITIES'}]
+
+
+def test_validate_job_profile_success(app_with_client):
+    app, _ = app_with_client
+    setup_competences_in_db(app)
+
+    with app.app_context():
+        profile, errors = validate_job_profile(1, {
+            'competences': [
+                {'competence_id': 1, 'min_years': '1.5', 'weight': 2},
+                {'competence_id': 2, 'min_years': 0, 'weight': 0.5}],
+            'window': {'from_date': '2024-06-01', 'to_date': '2024-08-31'}})
+
+    assert errors == []
+    assert profile == JobProfile(
+            [JobRequirement(1, Decimal('1.50'), 2.0),
+             JobRequirement(2, Decimal('0.00'), 0.5)],
+            date(2024, 6, 1), date(2024, 8, 31))
+
+    remove_competences_from_db(app)
+
+
+def test_validate_job_profile_reports_all_errors(app_with_client):
+    app, _ = app_with_client
+    setup_competences_in_db(app)
+
+    with app.app_context():
+        profile, errors = validate_job_profile(1, {
+            'competences': [
+                {'competence_id': 1, 'min_years': '1', 'weight': 0},
+                {'competence_id': 1, 'min_years': '1', 'weight': True},
+                {'competence_id': 2, 'weight': 1}],
+            'window': {'from_date': '2024-08-31', 'to_date': '2024-06-01'}})
+
+    assert profile is None
+    assert errors == [
+        {'field': 'competences[0].weight', 'error': 'INVALID_WEIGHT'},
+        {'field': 'competences[1].competence_id',
+         'error': 'DUPLICATE_COMPETENCE_ID'},
+        {'field': 'competences[1].weight', 'error': 'INVALID_WEIGHT'},
+        {'field': 'competences[2].min_years', 'error': 'MISSING_MIN_YEARS'},
+        {'field': 'window', 'error': 'INVALID_DATE_RANGE'}]
+
+    remove_competences_from_db(app)
+
+
+def test_validate_job_profile_invalid_payload(app_with_client):
+    app, _ = app_with_client
+
+    with app.app_context():
+        assert validate_job_profile(1, []) == (None, [
+            {'field': '', 'error': 'INVALID_PAYLOAD_STRUCTURE'}])
+        assert validate_job_profile(1, {'competences': []}) == (None, [
+            {'field': 'competences', 'error': 'MISSING_COMPETENCES'},
+            {'field': 'window', 'error': 'INVALID_WINDOW'}])
@@ -1,5 +1,12 @@
 import os
 
+from app.app import setup_worker
+from app.extensions import database
+from app.services.competences_service import competence_catalog
+from app.services.pool_metrics_service import pool_metrics
+from tests.utilities.test_utilities import remove_competences_from_db, \
+    setup_competences_in_db
+
 
 def test_app_initialization(app_with_client):
     app, _ = app_with_client
@@ -25,3 +32,22 @@ def test_blueprint_registration(app_with_client):
     blueprints = [bp.name for bp in app.blueprints.values()]
     assert 'competences' in blueprints
     assert 'applicant_competences'
+
+
+def test_setup_worker(app_with_client):
+    app, _ = app_with_client
+    setup_competences_in_db(app)
+    with app.app_context():
+        inherited = database.engine.pool
+
+    setup_worker(app)
+
+    with app.app_context():
+        pool = database.engine.pool
+        assert pool is not inherited
+        assert pool.checkedin() == app.config['DATABASE_POOL_SIZE']
+    assert pool_metrics.snapshot()['connects'] == \
+        app.config['DATABASE_POOL_SIZE']
+    assert competence_catalog._snapshot is not None
+
+    remove_competences_from_db(app)
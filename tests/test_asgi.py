@@ -0,0 +1,186 @@
+import datetime as dt
+
+import pytest
+from flask_jwt_extended import create_access_token, create_refresh_token
+from starlette.testclient import TestClient
+
+from app.asgi import create_asgi_app
+from tests.utilities.test_status_codes import StatusCodes
+from tests.utilities.test_utilities import generate_token_for_person_id_1, \
+    generate_token_for_recruiter, remove_application_components_from_db, \
+    remove_competences_from_db, setup_competences_in_db
+
+PAYLOAD = {
+    'competences': [{'competence_id': 1, 'years_of_experience': '5.00'}],
+    'availabilities': [{'from_date': '2021-01-01', 'to_date': '2021-01-02'}]
+}
+
+
+@pytest.fixture(scope='function')
+def asgi_client(app_with_client):
+    app, _ = app_with_client
+    setup_competences_in_db(app)
+    asgi_app = create_asgi_app({'JWT_SECRET_KEY': 'your-test-secret-key'})
+
+    with TestClient(asgi_app) as client:
+        yield app, client
+
+    remove_application_components_from_db(app)
+    remove_competences_from_db(app)
+
+
+def test_submit_application(asgi_client):
+    app, client = asgi_client
+    token = generate_token_for_person_id_1(app)
+
+    response = client.post('/api/application-form/submit/', json=PAYLOAD,
+                           headers={'Authorization': f'Bearer {token}'})
+
+    assert response.status_code == StatusCodes.CREATED
+    assert response.json() == {
+        'status': 'Pending',
+        'competences': [{'competence_id': 1, 'years_of_experience': '5.00'}],
+        'availabilities': PAYLOAD['availabilities']}
+
+    response = client.post('/api/application-form/submit/', json=PAYLOAD,
+                           headers={'Authorization': f'Bearer {token}'})
+
+    assert response.status_code == StatusCodes.CONFLICT
+    assert response.json()['error'] == 'ALREADY_APPLIED_BEFORE'
+
+
+def test_submit_application_invalid(asgi_client):
+    app, client = asgi_client
+    token = generate_token_for_person_id_1(app)
+
+    response = client.post(
+            '/api/application-form/submit/',
+            json={'competences': [{'competence_id': 3,
+                                   'years_of_experience': '1'}],
+                  'availabilities': []},
+            headers={'Authorization': f'Bearer {token}'})
+
+    assert response.status_code == StatusCodes.BAD_REQUEST
+    assert response.json()['error'] == response.json()['errors'][0]['error']
+
+    response = client.post('/api/application-form/submit/', content='[',
+                           headers={'Authorization': f'Bearer {token}',
+                                    'Content-Type': 'application/json'})
+
+    assert response.status_code == StatusCodes.BAD_REQUEST
+    assert response.json()['error'] == 'INVALID_JSON_PAYLOAD'
+
+
+def test_submit_application_idempotent(asgi_client):
+    app, client = asgi_client
+    token = generate_token_for_person_id_1(app)
+    headers = {'Authorization': f'Bearer {token}',
+               'Idempotency-Key': 'retry-1'}
+
+    first = client.post('/api/application-form/submit/', json=PAYLOAD,
+                        headers=headers)
+    second = client.post('/api/application-form/submit/', json=PAYLOAD,
+                         headers=headers)
+
+    assert first.status_code == second.status_code == StatusCodes.CREATED
+    assert second.json() == first.json()
+    assert second.headers['Idempotent-Replayed'] == 'true'
+
+
+def test_get_application(asgi_client):
+    app, client = asgi_client
+    headers = {'Authorization':
+               f'Bearer {generate_token_for_person_id_1(app)}'}
+
+    response = client.get('/api/application-form/submit/', headers=headers)
+    assert response.status_code == StatusCodes.NOT_FOUND
+    assert response.json()['error'] == 'APPLICATION_NOT_FOUND'
+
+    submitted = client.post('/api/application-form/submit/', json=PAYLOAD,
+                            headers=headers).json()
+
+    response = client.get('/api/application-form/submit/', headers=headers)
+    assert response.status_code == StatusCodes.OK
+    assert response.json() == submitted
+
+    response = client.get('/api/application-form/submit/status',
+                          headers=headers)
+    assert response.status_code == StatusCodes.OK
+    assert response.json() == {'status': 'Pending'}
+
+
+def test_get_application_unauthorized(asgi_client):
+    app, client = asgi_client
+    token = generate_token_for_recruiter(app)
+
+    response = client.get('/api/application-form/submit/',
+                          headers={'Authorization': f'Bearer {token}'})
+    assert response.status_code == StatusCodes.UNAUTHORIZED
+    assert response.json()['error'] == 'UNAUTHORIZED_ROLE'
+
+    response = client.get('/api/application-form/submit/')
+    assert response.status_code == StatusCodes.UNAUTHORIZED
+    assert response.json()['error'] == 'UNAUTHORIZED'
+
+    response = client.get('/api/application-form/submit/',
+                          headers={'Authorization': 'Bearer invalid'})
+    assert response.status_code == StatusCodes.UNAUTHORIZED
+    assert response.json()['error'] == 'INVALID_TOKEN'
+
+
+def test_get_application_wrong_token(asgi_client):
+    app, client = asgi_client
+    with app.app_context():
+        tokens = [
+            create_refresh_token(identity=None,
+                                 additional_claims={'id': 1, 'role': 2}),
+            create_access_token(identity=None,
+                                additional_claims={'role': 2},
+                                expires_delta=dt.timedelta(days=1)),
+            create_access_token(identity=None,
+                                additional_claims={'id': 1},
+                                expires_delta=dt.timedelta(days=1))]
+
+    for token in tokens:
+        response = client.get('/api/application-form/submit/',
+                              headers={'Authorization': f'Bearer {token}'})
+        assert response.status_code == StatusCodes.UNAUTHORIZED
+        assert response.json() == {'error': 'INVALID_TOKEN'}
+
+
+def test_get_competences(asgi_client):
+    app, client = asgi_client
+    headers = {'Authorization':
+               f'Bearer {generate_token_for_person_id_1(app)}',
+               'Accept-Encoding': 'identity'}
+
+    response = client.get('/api/application-form/competences/',
+                          headers=headers)
+
+    assert response.status_code == StatusCodes.OK
+    assert response.json() == [{'competence_id': 1, 'i18n_key': 'tester'},
+                               {'competence_id': 2, 'i18n_key': 'developer'}]
+    assert response.headers['Cache-Control'] == 'private, max-age=300'
+    assert response.headers['Vary'] == 'Accept-Encoding'
+
+    response = client.get(
+            '/api/application-form/competences/',
+            headers={**headers, 'If-None-Match': response.headers['ETag']})
+
+    assert response.status_code == StatusCodes.NOT_MODIFIED
+    assert response.content == b''
+
+
+def test_get_competences_gzip(asgi_client):
+    app, client = asgi_client
+    headers = {'Authorization':
+               f'Bearer {generate_token_for_person_id_1(app)}',
+               'Accept-Encoding': 'gzip'}
+
+    response = client.get('/api/application-form/competences/',
+                          headers=headers)
+
+    assert response.status_code == StatusCodes.OK
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.headers['ETag'].endswith('-gzip"')
+    assert len(response.json()) == 2
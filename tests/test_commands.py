@@ -0,0 +1,65 @@
+import gzip
+import json
+
+from app.models.application import ApplicationStatus
+from tests.services.test_import_service import generate_ndjson_line
+from tests.utilities.test_utilities import \
+    remove_application_components_from_db, remove_competences_from_db, \
+    setup_competences_in_db
+
+
+def test_import_applications_command(app_with_client, tmp_path):
+    app, _ = app_with_client
+    setup_competences_in_db(app)
+    file = tmp_path / 'applications.ndjson'
+    file.write_bytes(b''.join(generate_ndjson_line(person_id)
+                              for person_id in range(1, 6)))
+
+    result = app.test_cli_runner().invoke(
+            args=['import-applications', str(file), '--chunk-size', '2'])
+
+    assert result.exit_code == 0
+    assert json.loads(result.output) == {'imported': 5, 'failed': 0,
+                                         'errors': []}
+    with app.app_context():
+        assert ApplicationStatus.query.count() == 5
+
+    remove_competences_from_db(app)
+    remove_application_components_from_db(app)
+
+
+def test_export_applications_command(app_with_client, tmp_path):
+    app, _ = app_with_client
+    setup_competences_in_db(app)
+    file = tmp_path / 'applications.ndjson'
+    file.write_bytes(b''.join(generate_ndjson_line(person_id)
+                              for person_id in range(1, 4)))
+    app.test_cli_runner().invoke(args=['import-applications', str(file)])
+    export = tmp_path / 'export.ndjson.gz'
+
+    result = app.test_cli_runner().invoke(
+            args=['export-applications', str(export), '--gzip'])
+
+    assert result.exit_code == 0
+    assert [json.loads(line)['person_id'] for line
+            in gzip.decompress(export.read_bytes()).splitlines()] == [1, 2, 3]
+
+    remove_competences_from_db(app)
+    remove_application_components_from_db(app)
+
+
+def test_rebuild_statistics_command(app_with_client, tmp_path):
+    app, _ = app_with_client
+    setup_competences_in_db(app)
+    file = tmp_path / 'applications.ndjson'
+    file.write_bytes(b''.join(generate_ndjson_line(person_id)
+                              for person_id in range(1, 4)))
+    app.test_cli_runner().invoke(args=['import-applications', str(file)])
+
+    result = app.test_cli_runner().invoke(args=['rebuild-statistics'])
+
+    assert result.exit_code == 0
+    assert json.loads(result.output)['counters'] == 3
+
+    remove_competences_from_db(app)
+    remove_application_components_from_db(app)
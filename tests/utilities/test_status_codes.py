@@ -1,6 +1,8 @@
 class StatusCodes:
     OK = 200
     CREATED = 201
+    ACCEPTED = 202
+    NOT_MODIFIED = 304
     BAD_REQUEST = 400
     UNAUTHORIZED = 401
     NOT_FOUND = 404